@@ -1,15 +1,23 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from app.config import get_settings
 from app.models.database import get_db
 from app.repositories.property_repo import get_property_by_id, get_properties_by_ids
+from app.repositories.neighbor_repo import get_neighbors
+from app.core.cache import get_data_version_cache
+from app.core.geo_search import bbox_search, bbox_clusters, nearby_search
+from app.core.similarity import similar_properties, precomputed_similar_properties
+from app.core.geo import NearPoint
+from app.core.exceptions import ValidationError
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
+settings = get_settings()
 
 
 class PropertyResponse(BaseModel):
@@ -34,6 +42,122 @@ class CompareResponse(BaseModel):
     properties: list[PropertyResponse]
 
 
+class ClusterResponse(BaseModel):
+    latitude: float  # Centroid of the clustered properties
+    longitude: float
+    count: int
+    min_price: float | None
+    max_price: float | None
+
+
+class BBoxResponse(BaseModel):
+    properties: list[PropertyResponse]
+    clusters: list[ClusterResponse] = []  # Set instead of properties below map_cluster_max_zoom
+    total: int  # Properties returned, or properties in all clusters
+    truncated: bool  # More properties (or clusters) match than the row cap; zoom in to see them all
+
+
+class NearbyPropertyResponse(PropertyResponse):
+    distance_km: float
+
+
+class NearbyResponse(BaseModel):
+    properties: list[NearbyPropertyResponse]  # Nearest first
+    total: int
+
+
+@router.get("/properties/nearby", response_model=NearbyResponse)
+@limiter.limit("60/minute")
+async def get_nearby_properties(
+    request: Request,
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(2.0, gt=0),
+    city: str = Query("", max_length=50),
+    bhk: int | None = Query(None, ge=1, le=10),
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    area: str | None = Query(None, max_length=100),
+    min_sqft: int | None = Query(None, ge=0),
+    max_sqft: int | None = Query(None, ge=0),
+    amenities: list[str] | None = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the properties nearest to a point within ``radius_km``, with optional filters."""
+    if radius_km > settings.nearby_max_radius_km:
+        raise ValidationError(f"radius_km must not exceed {settings.nearby_max_radius_km}")
+
+    ranked = await nearby_search(
+        db, NearPoint(latitude, longitude, radius_km),
+        city=city, bhk=bhk, min_price=min_price, max_price=max_price, area=area,
+        min_sqft=min_sqft, max_sqft=max_sqft, amenities=amenities, limit=limit,
+    )
+    return NearbyResponse(
+        properties=[
+            NearbyPropertyResponse(**prop.to_dict(), distance_km=round(distance, 3))
+            for prop, distance in ranked
+        ],
+        total=len(ranked),
+    )
+
+
+@router.get("/properties/bbox", response_model=BBoxResponse)
+@limiter.limit("120/minute")
+async def get_properties_in_bbox(
+    request: Request,
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lat: float = Query(..., ge=-90, le=90),
+    min_lng: float = Query(..., ge=-180, le=180),
+    max_lng: float = Query(..., ge=-180, le=180),
+    city: str = Query("", max_length=50),
+    bhk: int | None = Query(None, ge=1, le=10),
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    area: str | None = Query(None, max_length=100),
+    min_sqft: int | None = Query(None, ge=0),
+    max_sqft: int | None = Query(None, ge=0),
+    amenities: list[str] | None = Query(None),
+    order_by: str = Query("price", pattern="^(price|price_per_sqft)$"),
+    limit: int | None = Query(None, ge=1),
+    zoom: int | None = Query(None, ge=0, le=22),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get properties inside the visible map viewport, with optional filters.
+
+    With a ``zoom`` below ``map_cluster_max_zoom`` the matches are aggregated
+    into grid clusters (count, centroid, price range) instead.
+    """
+    if min_lat > max_lat or min_lng > max_lng:
+        raise ValidationError("min_lat/min_lng must not exceed max_lat/max_lng")
+
+    filters = dict(
+        city=city, bhk=bhk, min_price=min_price, max_price=max_price, area=area,
+        min_sqft=min_sqft, max_sqft=max_sqft, amenities=amenities,
+    )
+    limit = min(limit or settings.bbox_max_results, settings.bbox_max_results)
+
+    if zoom is not None and zoom < settings.map_cluster_max_zoom:
+        clusters = await bbox_clusters(
+            db, min_lat, max_lat, min_lng, max_lng, zoom, **filters, limit=limit + 1,
+        )
+        return BBoxResponse(
+            properties=[],
+            clusters=[ClusterResponse(**c) for c in clusters[:limit]],
+            total=sum(c["count"] for c in clusters[:limit]),
+            truncated=len(clusters) > limit,
+        )
+
+    properties, truncated = await bbox_search(
+        db, min_lat, max_lat, min_lng, max_lng, **filters, order_by=order_by, limit=limit,
+    )
+    return BBoxResponse(
+        properties=[PropertyResponse(**p.to_dict()) for p in properties],
+        total=len(properties),
+        truncated=truncated,
+    )
+
+
 @router.get("/properties/{property_id}", response_model=PropertyResponse)
 @limiter.limit("60/minute")
 async def get_property(
@@ -48,6 +172,58 @@ async def get_property(
     return PropertyResponse(**property_obj.to_dict())
 
 
+class SimilarResponse(BaseModel):
+    property_id: str
+    properties: list[PropertyResponse]  # Most similar first
+
+
+async def _current_neighbor_ids(db: AsyncSession, property_id: UUID) -> list[UUID] | None:
+    """Return precomputed neighbour ids unless the city's data changed since they were built."""
+    neighbors = await get_neighbors(db, property_id)
+    if neighbors is None:
+        return None
+    if await get_data_version_cache().get(db, neighbors.city) != neighbors.data_version:
+        return None
+    return neighbors.neighbor_ids
+
+
+@router.get("/properties/{property_id}/similar", response_model=SimilarResponse)
+@limiter.limit("60/minute")
+async def get_similar_properties(
+    request: Request,
+    property_id: UUID,
+    limit: int = Query(10, ge=1, le=50),
+    same_city: bool = True,
+    same_bhk: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get properties similar to a property, ranked by its stored embedding.
+
+    No embedding is generated: same-city requests for up to ``neighbors_k``
+    results are served from the precomputed neighbours table when the
+    property has a row there from a build of the city's current data version,
+    otherwise the property's own vector is the query.
+    """
+    neighbor_ids = None
+    if same_city and not same_bhk and limit <= settings.neighbors_k:
+        neighbor_ids = await _current_neighbor_ids(db, property_id)
+
+    property_obj = await get_property_by_id(db, property_id, with_embedding=neighbor_ids is None)
+    if not property_obj:
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    if neighbor_ids is not None:
+        similar = await precomputed_similar_properties(db, property_obj, neighbor_ids, limit)
+    else:
+        similar = await similar_properties(
+            db, property_obj, limit=limit, same_city=same_city, same_bhk=same_bhk,
+        )
+    return SimilarResponse(
+        property_id=str(property_id),
+        properties=[PropertyResponse(**p.to_dict()) for p in similar],
+    )
+
+
 @router.post("/compare", response_model=CompareResponse)
 @limiter.limit("30/minute")
 async def compare_properties(
@@ -1,25 +1,61 @@
+import asyncio
+import json
 import logging
+import time
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from app.models.database import get_db
-from app.core.query_parser import parse_query
-from app.core.search_engine import hybrid_search
-from app.core.exceptions import DatabaseError
+from app.config import get_settings
+from app.models.database import get_db, async_session
+from app.core.query_parser import parse_query, parser_stats, ParsedQuery
+from app.core.embeddings import generate_query_embedding, vector_search_enabled, get_query_embedding_cache
+from app.core.search_engine import hybrid_search, search_after, SearchResult
+from app.core.facets import facet_counts
+from app.core.pagination import SearchCursor, next_search_cursor
+from app.core.amenities import normalize_amenities
+from app.core.parse_cache import get_parse_cache
+from app.core.cache import TTLCache, get_data_version_cache, normalize_query_text
+from app.core.exceptions import CribInfoException, DatabaseError, ValidationError
+from app.core.geo import NearPoint
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 limiter = Limiter(key_func=get_remote_address)
+settings = get_settings()
+
+# Per-process cache of hybrid_search results, keyed by _search_cache_key
+search_cache = TTLCache(
+    maxsize=settings.search_cache_size,
+    ttl=settings.search_cache_ttl_seconds,
+    stale_ttl=settings.search_cache_stale_seconds,
+)
+# Per-process cache of facet_counts results, keyed by _facets_cache_key
+facets_cache = TTLCache(maxsize=settings.facets_cache_size, ttl=settings.facets_cache_ttl_seconds)
+
+
+class NearRequest(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    radius_km: float = Field(default=2.0, gt=0)
+
+    def to_point(self) -> NearPoint:
+        if self.radius_km > settings.nearby_max_radius_km:
+            raise ValidationError(f"radius_km must not exceed {settings.nearby_max_radius_km}")
+        return NearPoint(self.latitude, self.longitude, self.radius_km)
 
 
 class SearchRequest(BaseModel):
     query: str = Field(..., min_length=1, max_length=500)
     city: str = Field(default="", max_length=50)
     limit: int = Field(default=10, ge=1, le=50)
+    cursor: str | None = Field(default=None, max_length=4096)  # next_cursor of the previous page
+    facets: bool = False  # Include facet counts for the parsed filters
+    near: NearRequest | None = None  # Only search within this radius, nearest first (no cursor paging)
 
 
 class PropertyResponse(BaseModel):
@@ -36,12 +72,39 @@ class PropertyResponse(BaseModel):
     longitude: float | None
 
 
+class FacetValue(BaseModel):
+    value: str | int
+    count: int
+
+
+class PriceFacet(BaseModel):
+    min_price: float | None  # Inclusive lower bound in lakhs; None = open
+    max_price: float | None  # Exclusive upper bound in lakhs; None = open
+    count: int
+
+
+class FacetsResponse(BaseModel):
+    total: int  # Properties matching every parsed filter
+    # BHK, price and area counts ignore their own filter so they list the alternatives
+    bhk: list[FacetValue]
+    price: list[PriceFacet]
+    area: list[FacetValue]
+    amenities: list[FacetValue]
+
+
 class SearchResponse(BaseModel):
     results: list[PropertyResponse]
     parsed_filters: dict
-    total: int
+    total: int  # Number of unique results returned (duplicate listings removed)
     match_type: str  # "exact", "partial", "similar"
     relaxed_filters: list[str]  # Filters that were relaxed to find results
+    next_cursor: str | None = None  # Pass back as "cursor" for the next page; None on the last page
+    facets: FacetsResponse | None = None  # Only when requested with "facets": true
+
+
+class FacetsRequest(BaseModel):
+    query: str = Field(..., min_length=1, max_length=500)
+    city: str = Field(default="", max_length=50)
 
 
 class ErrorResponse(BaseModel):
@@ -50,6 +113,108 @@ class ErrorResponse(BaseModel):
     type: str
 
 
+async def _parse_and_embed(query: str) -> tuple[ParsedQuery, list[float] | None]:
+    """Parse the query and generate its embedding concurrently.
+
+    The embedding only depends on the raw query text, so it does not need to
+    wait for the LLM parse. If either side fails its error (LLMError or
+    EmbeddingError) is raised and the other side is cancelled. No embedding
+    is generated when vector search is disabled.
+    """
+    if not vector_search_enabled():
+        return await parse_query(query), None
+
+    parse_task = asyncio.create_task(parse_query(query))
+    embed_task = asyncio.create_task(generate_query_embedding(query))
+    try:
+        parsed, query_embedding = await asyncio.gather(parse_task, embed_task)
+    finally:
+        parse_task.cancel()
+        embed_task.cancel()
+    return parsed, query_embedding
+
+
+def _filter_signature(parsed: ParsedQuery) -> str:
+    """Serialize the parsed filters so equivalent ones (amenity synonyms and order, area case) match."""
+    filters = parsed.model_dump(exclude={"raw_query"})
+    filters["amenities"] = sorted(normalize_amenities(filters["amenities"]))
+    if filters["area"]:
+        filters["area"] = filters["area"].strip().lower()
+    return json.dumps(filters, sort_keys=True)
+
+
+def _search_cache_key(
+    parsed: ParsedQuery, city: str, limit: int, data_version, near: NearPoint | None = None
+) -> tuple:
+    """Build the result cache key for a search.
+
+    Equivalent filters share a key. With vector search enabled the ranking
+    depends on the query text, so the whitespace/case-normalized raw query is
+    part of the key as well (except for distance-ranked searches).
+    """
+    text = normalize_query_text(parsed.raw_query) if vector_search_enabled() and near is None else ""
+    return (city, limit, data_version, text, _filter_signature(parsed), near)
+
+
+async def _cached_hybrid_search(
+    db: AsyncSession,
+    parsed: ParsedQuery,
+    city: str,
+    limit: int,
+    query_embedding: list[float] | None,
+    near: NearPoint | None = None,
+) -> SearchResult:
+    """Run hybrid_search through the result cache.
+
+    Keys include the effective city's data version, so reloading data or
+    embeddings for a city invalidates its entries.
+    """
+    if not search_cache.enabled:
+        return await hybrid_search(db, parsed, city, limit, query_embedding=query_embedding, near=near)
+
+    data_version = await get_data_version_cache().get(db, city or parsed.inferred_city or "")
+    if data_version is None:
+        return await hybrid_search(db, parsed, city, limit, query_embedding=query_embedding, near=near)
+    key = _search_cache_key(parsed, city, limit, data_version, near)
+
+    async def refresh():
+        # Background refreshes outlive the request, so use their own session
+        async with async_session() as session:
+            return await hybrid_search(session, parsed, city, limit, query_embedding=query_embedding, near=near)
+
+    return await search_cache.get_or_set(
+        key,
+        lambda: hybrid_search(db, parsed, city, limit, query_embedding=query_embedding, near=near),
+        refresh,
+    )
+
+
+def _near_point(search_request: SearchRequest) -> NearPoint | None:
+    """Validate the request's ``near`` block; keyset cursors cannot page distance-ranked results."""
+    if search_request.near is None:
+        return None
+    if search_request.cursor:
+        raise ValidationError("cursor cannot be combined with near")
+    return search_request.near.to_point()
+
+
+async def _cached_facets(db: AsyncSession, parsed: ParsedQuery, city: str) -> FacetsResponse:
+    """Compute facet counts through the facets cache (invalidated by data version)."""
+    effective_city = city or parsed.inferred_city or ""
+
+    async def compute():
+        return FacetsResponse(**await facet_counts(db, parsed, effective_city))
+
+    if not facets_cache.enabled:
+        return await compute()
+
+    data_version = await get_data_version_cache().get(db, effective_city)
+    if data_version is None:
+        return await compute()
+    key = (effective_city, data_version, _filter_signature(parsed))
+    return await facets_cache.get_or_set(key, compute)
+
+
 @router.post("/search", response_model=SearchResponse, responses={
     400: {"model": ErrorResponse, "description": "Invalid input"},
     429: {"model": ErrorResponse, "description": "Rate limit exceeded"},
@@ -67,16 +232,42 @@ async def search_properties(
     - Parses the query using AI to extract filters (BHK, price, area, amenities)
     - Performs hybrid search combining vector similarity with SQL filters
     - Returns results with match quality information
+    - With ``cursor`` returns the next page of an earlier search; the query
+      is not parsed again and only the tier that matched is continued
+    - With ``near`` only searches within the radius, nearest first
     """
     logger.info(f"Search request: city='{search_request.city}', limit={search_request.limit}")
 
-    # Parse the query
-    parsed = await parse_query(search_request.query)
+    near = _near_point(search_request)
+    cursor = SearchCursor.decode(search_request.cursor) if search_request.cursor else None
+    if cursor:
+        parsed, city = cursor.parsed_query, cursor.city
+        query_embedding = None
+        if vector_search_enabled():
+            # Served from the query embedding cache for recent searches
+            query_embedding = await generate_query_embedding(parsed.raw_query)
+    elif near:
+        # Distance-ranked searches do not use the embedding
+        city = search_request.city
+        parsed, query_embedding = await parse_query(search_request.query), None
+    else:
+        city = search_request.city
+        # Parse the query while its embedding is generated
+        parsed, query_embedding = await _parse_and_embed(search_request.query)
     logger.debug(f"Parsed query: {parsed.model_dump()}")
 
     # Perform search
     try:
-        search_result = await hybrid_search(db, parsed, search_request.city, search_request.limit)
+        if cursor:
+            search_result = await search_after(
+                db, parsed, city, cursor.tier, cursor.after_id, search_request.limit,
+                query_embedding=query_embedding, position=cursor.position,
+            )
+        else:
+            search_result = await _cached_hybrid_search(
+                db, parsed, city, search_request.limit, query_embedding, near,
+            )
+        facets = await _cached_facets(db, parsed, city) if search_request.facets else None
     except SQLAlchemyError as e:
         logger.error(f"Database error during search: {e}")
         raise DatabaseError("Database error occurred. Please try again later.")
@@ -89,4 +280,154 @@ async def search_properties(
         total=len(search_result.properties),
         match_type=search_result.match_type,
         relaxed_filters=search_result.relaxed_filters,
+        next_cursor=None if near else next_search_cursor(
+            parsed, city, search_result, search_request.limit, cursor.position if cursor else 0,
+        ),
+        facets=facets,
     )
+
+
+@router.post("/search/facets", response_model=FacetsResponse, responses={
+    400: {"model": ErrorResponse, "description": "Invalid input"},
+    429: {"model": ErrorResponse, "description": "Rate limit exceeded"},
+    503: {"model": ErrorResponse, "description": "Service unavailable"},
+    500: {"model": ErrorResponse, "description": "Internal server error"},
+})
+@limiter.limit("30/minute")
+async def search_facets(
+    request: Request,
+    facets_request: FacetsRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """Count properties per BHK, price bucket, area and amenity for a query's filters.
+
+    Computed with one aggregate query and cached per city and filter set
+    until the city's data is reloaded.
+    """
+    parsed = await parse_query(facets_request.query)
+    try:
+        return await _cached_facets(db, parsed, facets_request.city)
+    except SQLAlchemyError as e:
+        logger.error(f"Database error during facet counts: {e}")
+        raise DatabaseError("Database error occurred. Please try again later.")
+
+
+def _ndjson(frame: dict) -> bytes:
+    return (json.dumps(frame) + "\n").encode()
+
+
+def _elapsed_ms(since: float) -> float:
+    return round((time.perf_counter() - since) * 1000, 1)
+
+
+async def _search_stream(
+    search_request: SearchRequest, cursor: SearchCursor | None, near: NearPoint | None = None
+):
+    """Yield NDJSON frames for a search as its stages complete.
+
+    Frames: ``parsed`` (as soon as the query is parsed), ``facets`` when
+    requested, one ``result`` per property, then ``done`` with the match
+    info and stage timings. Errors
+    after the response has started are sent as a final ``error`` frame.
+    """
+    started = time.perf_counter()
+    timings = {}
+    embed_task = None
+    try:
+        if cursor:
+            parsed, city = cursor.parsed_query, cursor.city
+            if vector_search_enabled():
+                embed_task = asyncio.create_task(generate_query_embedding(parsed.raw_query))
+        else:
+            city = search_request.city
+            # The embedding only needs the raw text, so it is generated while parsing
+            if vector_search_enabled() and near is None:
+                embed_task = asyncio.create_task(generate_query_embedding(search_request.query))
+            parsed = await parse_query(search_request.query)
+        timings["parse_ms"] = _elapsed_ms(started)
+        yield _ndjson({"type": "parsed", "parsed_filters": parsed.model_dump(exclude={"raw_query"})})
+
+        stage = time.perf_counter()
+        query_embedding = await embed_task if embed_task else None
+        timings["embed_wait_ms"] = _elapsed_ms(stage)
+
+        stage = time.perf_counter()
+        # The request-scoped session may be closed before a streamed body ends
+        async with async_session() as db:
+            if cursor:
+                search_result = await search_after(
+                    db, parsed, city, cursor.tier, cursor.after_id, search_request.limit,
+                    query_embedding=query_embedding, position=cursor.position,
+                )
+            else:
+                search_result = await _cached_hybrid_search(
+                    db, parsed, city, search_request.limit, query_embedding, near,
+                )
+            timings["search_ms"] = _elapsed_ms(stage)
+
+            if search_request.facets:
+                stage = time.perf_counter()
+                facets = await _cached_facets(db, parsed, city)
+                timings["facets_ms"] = _elapsed_ms(stage)
+                yield _ndjson({"type": "facets", "facets": facets.model_dump()})
+
+        for prop in search_result.properties:
+            yield _ndjson({"type": "result", "property": PropertyResponse(**prop.to_dict()).model_dump()})
+
+        timings["total_ms"] = _elapsed_ms(started)
+        yield _ndjson({
+            "type": "done",
+            "total": len(search_result.properties),
+            "match_type": search_result.match_type,
+            "relaxed_filters": search_result.relaxed_filters,
+            "next_cursor": None if near else next_search_cursor(
+                parsed, city, search_result, search_request.limit, cursor.position if cursor else 0,
+            ),
+            "timings": timings,
+        })
+    except SQLAlchemyError as e:
+        logger.error(f"Database error during streamed search: {e}")
+        error = DatabaseError("Database error occurred. Please try again later.")
+        yield _ndjson({"type": "error", "error": {"message": error.message, "type": "DatabaseError"}})
+    except CribInfoException as e:
+        yield _ndjson({"type": "error", "error": {"message": e.message, "type": type(e).__name__}})
+    finally:
+        if embed_task:
+            embed_task.cancel()
+
+
+@router.post("/search/stream", responses={
+    200: {"content": {"application/x-ndjson": {}}, "description": "Newline-delimited JSON frames"},
+    400: {"model": ErrorResponse, "description": "Invalid input"},
+    429: {"model": ErrorResponse, "description": "Rate limit exceeded"},
+})
+@limiter.limit("30/minute")
+async def search_properties_stream(
+    request: Request,
+    search_request: SearchRequest,
+):
+    """Streaming variant of /search that emits NDJSON frames as stages finish.
+
+    The parsed filters are sent as soon as parsing completes, followed by the
+    result rows and a final frame with ``match_type``, ``relaxed_filters``,
+    ``next_cursor`` and stage timings in milliseconds.
+    """
+    logger.info(f"Streamed search request: city='{search_request.city}', limit={search_request.limit}")
+
+    # Reject bad cursors and radii with a 400 before the stream starts
+    near = _near_point(search_request)
+    cursor = SearchCursor.decode(search_request.cursor) if search_request.cursor else None
+    return StreamingResponse(_search_stream(search_request, cursor, near), media_type="application/x-ndjson")
+
+
+@router.get("/search/stats")
+async def search_stats():
+    """Hit/miss counters of the search caches in this worker, for sizing them."""
+    parse_cache = get_parse_cache()
+    return {
+        "search_cache": search_cache.stats(),
+        "facets_cache": facets_cache.stats(),
+        "embedding_cache": get_query_embedding_cache().stats(),
+        "parse_cache": parse_cache.stats() if parse_cache else None,
+        "query_parser": parser_stats(),
+    }
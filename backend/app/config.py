@@ -56,6 +56,52 @@ class Settings(BaseSettings):
     # Jina AI settings (production embeddings)
     jina_api_key: str = ""
 
+    # Search execution
+    search_ladder_mode: str = "sequential"  # "sequential", "single" (one statement), "parallel" or "candidates"
+    search_candidate_pool: int = 500  # Rows fetched once and re-ranked in NumPy in "candidates" mode
+    search_max_connections: int = 3  # Pool connections one "parallel" search may hold at once
+    # ANN index query parameters, applied per search transaction (None = server default)
+    hnsw_ef_search: int | None = None
+    # Keeps scanning until filtered tiers fill up instead of post-filtering only ef_search rows;
+    # "strict_order", "relaxed_order" or "" to disable (needs pgvector >= 0.8)
+    hnsw_iterative_scan: str | None = "relaxed_order"
+    ivfflat_probes: int | None = None
+    # Vector ranking precision: "vector" (float32), "halfvec" (half-precision casts, served by a
+    # halfvec index from scripts/manage_indexes.py; halves the index size) or "binary" (Hamming
+    # distance over 96-byte sign-bit codes picks candidates, re-ranked at full precision)
+    vector_precision: str = "vector"
+    vector_rerank_candidates: int = 100  # halfvec candidates re-ranked at full precision (0 = no re-rank)
+    vector_binary_candidates: int = 400  # Hamming-distance candidates re-ranked in "binary" precision
+    # Area matching: "ilike" (substring) or "trigram" (substring or word similarity, typo tolerant)
+    area_match_mode: str = "ilike"
+    area_similarity_threshold: float = 0.5  # pg_trgm word_similarity threshold in "trigram" mode
+    sql_search_order: str = "price"  # SQL-only ordering when embedding_provider="none": "price" or "price_per_sqft"
+    # Search backend: "postgres" (SQL + pgvector) or "memory" (in-process NumPy snapshot per city)
+    search_backend: str = "postgres"
+    # Search result cache (LRU + TTL with stale-while-revalidate); size 0 disables it
+    search_cache_size: int = 1024
+    search_cache_ttl_seconds: float = 300.0
+    search_cache_stale_seconds: float = 600.0  # Extra window where stale results are served while refreshing
+    # Facet counts cache (LRU + TTL), keyed by city, filters and data version; size 0 disables it
+    facets_cache_size: int = 512
+    facets_cache_ttl_seconds: float = 600.0
+    # Query embedding cache (float16 LRU); a path persists it across restarts
+    embedding_cache_size: int = 4096  # 0 disables it
+    embedding_cache_path: str = ""  # e.g. "/tmp/cribinfo-query-embeddings.npz"
+    # Rule-based query parsing; queries it fully understands skip the LLM
+    rule_parser_enabled: bool = True
+    # LLM parse cache shared by all workers on a host (SQLite file; empty path = temp dir)
+    parse_cache_enabled: bool = True
+    parse_cache_path: str = ""
+    parse_cache_ttl_seconds: float = 7 * 24 * 3600.0
+    parse_cache_negative_ttl_seconds: float = 30.0  # How long failed parses are remembered
+    data_version_refresh_seconds: float = 30.0  # How often caches re-read the data_versions table
+    bbox_max_results: int = 500  # Row cap of /properties/bbox (map viewport) responses
+    map_cluster_max_zoom: int = 14  # Below this zoom /properties/bbox returns clusters, not properties
+    map_cluster_cells_per_tile: int = 8  # Cluster grid cells per map tile side
+    nearby_max_radius_km: float = 25.0  # Largest radius accepted by distance-ranked searches
+    neighbors_k: int = 20  # Neighbours per property stored by scripts/build_neighbors.py
+
     # CORS and defaults
     cors_origins: str = '["http://localhost:5173", "http://localhost:5174", "http://localhost:5175"]'
     default_city: str = "bangalore"
@@ -0,0 +1,132 @@
+"""Canonical amenity vocabulary.
+
+Amenities are normalized to one canonical spelling both when listings are
+loaded and when queries are parsed, so amenity filters can be exact array
+containment checks (``amenities @> ARRAY[...]``) backed by a GIN index.
+"""
+import re
+
+# Canonical amenity names (as stored in properties.amenities)
+CANONICAL_AMENITIES = [
+    "parking",
+    "security",
+    "power backup",
+    "lift",
+    "gym",
+    "swimming pool",
+    "garden",
+    "clubhouse",
+    "children play area",
+    "rainwater harvesting",
+    "fire safety",
+    "cctv",
+    "intercom",
+    "visitor parking",
+    "jogging track",
+    "tennis court",
+    "indoor games",
+    "meditation room",
+    "party hall",
+    "concierge",
+    "ev charging",
+    "solar panels",
+    "pet friendly",
+    "gated community",
+    "vastu compliant",
+]
+
+# Alternative spellings mapped to their canonical name
+AMENITY_SYNONYMS = {
+    "car parking": "parking",
+    "covered parking": "parking",
+    "garage": "parking",
+    "24x7 security": "security",
+    "security guard": "security",
+    "power back up": "power backup",
+    "powerbackup": "power backup",
+    "generator": "power backup",
+    "elevator": "lift",
+    "gymnasium": "gym",
+    "fitness center": "gym",
+    "fitness centre": "gym",
+    "pool": "swimming pool",
+    "swimming": "swimming pool",
+    "swimmingpool": "swimming pool",
+    "lawn": "garden",
+    "park": "garden",
+    "club house": "clubhouse",
+    "club": "clubhouse",
+    "playground": "children play area",
+    "play area": "children play area",
+    "kids play area": "children play area",
+    "rain water harvesting": "rainwater harvesting",
+    "fire safety system": "fire safety",
+    "fire alarm": "fire safety",
+    "cctv camera": "cctv",
+    "surveillance": "cctv",
+    "jogging": "jogging track",
+    "running track": "jogging track",
+    "tennis": "tennis court",
+    "games room": "indoor games",
+    "meditation": "meditation room",
+    "yoga room": "meditation room",
+    "banquet hall": "party hall",
+    "community hall": "party hall",
+    "ev charger": "ev charging",
+    "electric vehicle charging": "ev charging",
+    "solar": "solar panels",
+    "solar panel": "solar panels",
+    "pets allowed": "pet friendly",
+    "pet-friendly": "pet friendly",
+    "gated": "gated community",
+    "gated society": "gated community",
+    "vastu": "vastu compliant",
+}
+
+# Single-word synonyms specific enough to read as an amenity in free text.
+# Others ("park", "club", "solar", "swimming") are only trusted when
+# normalizing listing data, where the field is known to hold an amenity
+_UNAMBIGUOUS_SYNONYMS = {"pool", "elevator", "gymnasium", "swimmingpool", "powerbackup", "playground"}
+
+# Terms the query parser recognizes as amenities: canonical names plus
+# multi-word and unambiguous synonyms
+QUERY_AMENITY_TERMS = CANONICAL_AMENITIES + [
+    term for term in AMENITY_SYNONYMS
+    if " " in term or "-" in term or term in _UNAMBIGUOUS_SYNONYMS
+]
+
+_CANONICAL = set(CANONICAL_AMENITIES)
+
+
+def normalize_amenity(amenity: str) -> str:
+    """Return the canonical name for an amenity.
+
+    Unknown amenities are returned lowercased with collapsed whitespace.
+    """
+    cleaned = re.sub(r"[\s_-]+", " ", amenity.lower()).strip()
+    if cleaned in _CANONICAL:
+        return cleaned
+    if cleaned in AMENITY_SYNONYMS:
+        return AMENITY_SYNONYMS[cleaned]
+
+    # Simple plurals ("gyms", "lifts", "cctv cameras")
+    if cleaned.endswith("s"):
+        singular = cleaned[:-1]
+        if singular in _CANONICAL:
+            return singular
+        if singular in AMENITY_SYNONYMS:
+            return AMENITY_SYNONYMS[singular]
+
+    return cleaned
+
+
+def normalize_amenities(amenities: list[str] | None) -> list[str]:
+    """Normalize a list of amenities, dropping blanks and duplicates."""
+    normalized = []
+    for amenity in amenities or []:
+        if not isinstance(amenity, str):
+            continue
+        name = normalize_amenity(amenity)
+        if name and name not in normalized:
+            normalized.append(name)
+    return normalized
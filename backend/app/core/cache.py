@@ -0,0 +1,289 @@
+"""In-process caches shared by the search path."""
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+import numpy as np
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.repositories.data_version_repo import get_data_versions
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+def normalize_query_text(text: str) -> str:
+    """Case- and whitespace-normalize query text for use as a cache key."""
+    return " ".join(text.lower().split())
+
+
+class TTLCache:
+    """Bounded LRU cache with a time-to-live and stale-while-revalidate.
+
+    Entries younger than ``ttl`` seconds are fresh. Entries up to
+    ``ttl + stale_ttl`` seconds old are served as-is while a single
+    background refresh replaces them. ``maxsize=0`` disables the cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._refreshing: set[Hashable] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get(self, key: Hashable) -> tuple[Any, bool] | None:
+        """Return ``(value, is_fresh)`` for a live entry, or None.
+
+        Does not update the hit/miss counters; see ``get_or_set``.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        age = time.monotonic() - entry[0]
+        if age > self.ttl + self.stale_ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[1], age <= self.ttl
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_set(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        refresh: Callable[[], Awaitable[Any]] | None = None,
+    ) -> Any:
+        """Return the cached value for ``key``, computing it on a miss.
+
+        Stale entries are returned immediately and refreshed in the
+        background with ``refresh`` (default ``factory``), which must not
+        depend on request-scoped resources such as the request's DB session.
+        """
+        if not self.enabled:
+            return await factory()
+
+        cached = self.get(key)
+        if cached is not None:
+            value, fresh = cached
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._schedule_refresh(key, refresh or factory)
+            return value
+
+        self.misses += 1
+        value = await factory()
+        self.set(key, value)
+        return value
+
+    def _schedule_refresh(self, key: Hashable, refresh: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def run():
+            try:
+                self.set(key, await refresh())
+            except Exception as e:
+                logger.warning(f"Background cache refresh failed: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+class EmbeddingCache:
+    """LRU cache of query embeddings keyed by normalized query text.
+
+    Vectors are stored as float16 arrays (1.5 KB for 768 dimensions instead
+    of ~25 KB as a list of Python floats). With a ``path`` the cache can be
+    saved to and loaded from an ``.npz`` file so a restarted worker starts warm.
+    """
+
+    def __init__(self, maxsize: int, path: str | None = None):
+        self.maxsize = maxsize
+        self.path = path
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get(self, text: str) -> list[float] | None:
+        key = normalize_query_text(text)
+        vector = self._entries.get(key)
+        if vector is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return vector.astype(np.float32).tolist()
+
+    def set(self, text: str, embedding: list[float]) -> list[float]:
+        """Store an embedding and return it as ``get`` will (float16-rounded).
+
+        Callers should use the returned vector so a query ranks the same on
+        a miss as on later hits. Returned unchanged when the cache is disabled.
+        """
+        if not self.enabled:
+            return embedding
+        key = normalize_query_text(text)
+        vector = np.asarray(embedding, dtype=np.float16)
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return vector.astype(np.float32).tolist()
+
+    def load(self) -> int:
+        """Load entries from ``path`` (most recently used last); returns the count."""
+        if not self.path or not self.enabled or not os.path.exists(self.path):
+            return 0
+
+        with np.load(self.path, allow_pickle=False) as data:
+            keys, vectors = data["keys"], data["vectors"]
+        for key, vector in zip(keys[-self.maxsize:], vectors[-self.maxsize:]):
+            self._entries[str(key)] = vector.astype(np.float16)
+        return len(keys[-self.maxsize:])
+
+    def save(self) -> int:
+        """Atomically write the entries to ``path``; returns the count."""
+        if not self.path or not self._entries:
+            return 0
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                keys=np.array(list(self._entries)),
+                vectors=np.stack(list(self._entries.values())),
+            )
+        os.replace(tmp_path, self.path)
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class DataVersionCache:
+    """Throttled view of the ``data_versions`` table.
+
+    Caches in this process key on a city's data version so that
+    ``load_data.py``/``generate_embeddings.py`` runs (which bump it)
+    invalidate them; the table is re-read at most every ``refresh_seconds``.
+
+    Until ``scripts/setup_db.py`` has created the table, versions are
+    ``None`` and callers should not cache.
+    """
+
+    def __init__(self, refresh_seconds: float | None = None):
+        self.refresh_seconds = (
+            settings.data_version_refresh_seconds if refresh_seconds is None else refresh_seconds
+        )
+        self._versions: dict[str, int] | None = None
+        self._checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def get_all(self, db: AsyncSession) -> dict[str, int] | None:
+        if self._fresh():
+            return self._versions
+
+        async with self._lock:
+            if not self._fresh():
+                self._versions = await self._load(db)
+                self._checked_at = time.monotonic()
+            return self._versions
+
+    async def get(self, db: AsyncSession, city: str):
+        """Return the version of ``city``, or of every city when ``city`` is empty.
+
+        Returns None when the versions are unknown (``data_versions`` missing).
+        """
+        versions = await self.get_all(db)
+        if versions is None:
+            return None
+        if city:
+            return versions.get(city, 0)
+        return tuple(sorted(versions.items()))
+
+    async def _load(self, db: AsyncSession) -> dict[str, int] | None:
+        try:
+            return await get_data_versions(db)
+        except ProgrammingError as e:
+            # The failed statement aborts the transaction; roll back so the
+            # request can keep using the session
+            await db.rollback()
+            logger.warning(f"data_versions unavailable, caching disabled (run scripts/setup_db.py): {e}")
+            return None
+
+    def _fresh(self) -> bool:
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self.refresh_seconds
+
+
+_data_versions: DataVersionCache | None = None
+
+
+def get_data_version_cache() -> DataVersionCache:
+    """Get the process-wide data version cache (singleton)."""
+    global _data_versions
+
+    if _data_versions is None:
+        _data_versions = DataVersionCache()
+
+    return _data_versions
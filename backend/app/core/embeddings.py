@@ -2,11 +2,17 @@ import logging
 
 from app.config import get_settings
 from app.providers.embeddings import get_embedding_provider, EMBEDDING_DIMENSIONS
+from app.core.cache import EmbeddingCache
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
+def vector_search_enabled() -> bool:
+    """Return False when the no-op provider is configured (SQL-only search)."""
+    return settings.embedding_provider != "none"
+
+
 async def generate_embedding(text: str) -> list[float]:
     """Generate embedding using configured provider.
 
@@ -23,6 +29,56 @@ async def generate_embedding(text: str) -> list[float]:
     return await provider.embed(text)
 
 
+_query_cache: EmbeddingCache | None = None
+
+
+def get_query_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide query embedding cache (singleton).
+
+    Loads the persistence file (``settings.embedding_cache_path``) on first use.
+    """
+    global _query_cache
+
+    if _query_cache is None:
+        _query_cache = EmbeddingCache(settings.embedding_cache_size, settings.embedding_cache_path or None)
+        try:
+            loaded = _query_cache.load()
+            if loaded:
+                logger.info(f"Loaded {loaded} cached query embeddings from {settings.embedding_cache_path}")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load query embedding cache: {e}")
+
+    return _query_cache
+
+
+async def generate_query_embedding(query: str) -> list[float]:
+    """Generate the embedding of a search query, memoized per normalized query text.
+
+    Cached vectors are float16-rounded; a freshly generated one is rounded the
+    same way, so a query (and its cursor pages) always ranks with one vector.
+
+    Raises:
+        EmbeddingError: If embedding generation fails
+    """
+    cache = get_query_embedding_cache()
+    embedding = cache.get(query)
+    if embedding is None:
+        embedding = cache.set(query, await generate_embedding(query))
+    return embedding
+
+
+def save_query_embedding_cache() -> None:
+    """Persist the query embedding cache if it is configured with a path."""
+    if _query_cache is None:
+        return
+    try:
+        saved = _query_cache.save()
+        if saved:
+            logger.info(f"Saved {saved} cached query embeddings to {_query_cache.path}")
+    except OSError as e:
+        logger.warning(f"Could not save query embedding cache: {e}")
+
+
 def generate_property_text(property_data: dict) -> str:
     """Generate searchable text from property data for embedding."""
     parts = []
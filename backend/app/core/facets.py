@@ -0,0 +1,88 @@
+"""Facet counts (BHK, price bucket, area, amenity) for a parsed query."""
+from sqlalchemy import select, and_, func, literal_column, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.property import Property
+from app.core.query_parser import ParsedQuery
+from app.core.amenities import CANONICAL_AMENITIES
+from app.core.search_engine import _apply_search_params, _filter_conditions, _search_params
+
+# Bucket boundaries (lakhs) of the price facet; buckets are [lower, upper)
+PRICE_FACET_BOUNDS = (50, 100, 200, 500)
+
+
+async def facet_counts(db: AsyncSession, parsed_query: ParsedQuery, city: str) -> dict:
+    """Count properties per BHK, price bucket, area and amenity in one query.
+
+    GROUPING SETS produce the BHK, price bucket and area groups of the city
+    and FILTER clauses apply the parsed filters. Each of those three facets
+    ignores its own filter, so the counts show the alternatives (e.g. other
+    BHKs at the same price and area). ``total`` and the amenity counts apply
+    every filter.
+    """
+    await _apply_search_params(db, _search_params(None, None, None, parsed_query.area))
+
+    # Constant thresholds are rendered inline so the grouped expression is
+    # textually identical in SELECT and GROUP BY
+    bounds = ",".join(str(b) for b in PRICE_FACET_BOUNDS)
+    price_bucket = func.width_bucket(Property.price_lakhs, literal_column(f"ARRAY[{bounds}]::numeric[]"))
+
+    def count_where(**relax):
+        conditions = _filter_conditions(parsed_query, "", **relax)
+        return func.count().filter(and_(true(), *conditions))
+
+    matching = _filter_conditions(parsed_query, "")
+    amenity_counts = [
+        func.count().filter(and_(true(), *matching, Property.amenities.contains([amenity])))
+        for amenity in CANONICAL_AMENITIES
+    ]
+
+    stmt = select(
+        func.grouping(Property.bhk, Property.area, price_bucket).label("grouping"),
+        Property.bhk,
+        Property.area,
+        price_bucket.label("price_bucket"),
+        count_where().label("total"),
+        count_where(use_bhk=False).label("bhk_count"),
+        count_where(use_area=False).label("area_count"),
+        count_where(use_price=False).label("price_count"),
+        *amenity_counts,
+    )
+    shared = _filter_conditions(
+        parsed_query, city, use_bhk=False, use_area=False, use_price=False, use_amenities=False,
+    )
+    if shared:
+        stmt = stmt.where(and_(*shared))
+    stmt = stmt.group_by(func.grouping_sets(
+        tuple_(Property.bhk), tuple_(Property.area), tuple_(price_bucket), tuple_(),
+    ))
+
+    result = await db.execute(stmt)
+
+    facets = {"total": 0, "bhk": [], "price": [], "area": [], "amenities": []}
+    for row in result.all():
+        # grouping() sets a bit for every column the row is not grouped by
+        if row.grouping == 0b011 and row.bhk is not None and row.bhk_count:
+            facets["bhk"].append({"value": row.bhk, "count": row.bhk_count})
+        elif row.grouping == 0b101 and row.area is not None and row.area_count:
+            facets["area"].append({"value": row.area, "count": row.area_count})
+        elif row.grouping == 0b110 and row.price_bucket is not None and row.price_count:
+            i = row.price_bucket
+            facets["price"].append({
+                "min_price": PRICE_FACET_BOUNDS[i - 1] if i > 0 else None,
+                "max_price": PRICE_FACET_BOUNDS[i] if i < len(PRICE_FACET_BOUNDS) else None,
+                "count": row.price_count,
+            })
+        elif row.grouping == 0b111:
+            facets["total"] = row.total
+            counts = row[-len(CANONICAL_AMENITIES):]
+            facets["amenities"] = [
+                {"value": amenity, "count": count}
+                for amenity, count in zip(CANONICAL_AMENITIES, counts) if count
+            ]
+
+    facets["bhk"].sort(key=lambda f: f["value"])
+    facets["price"].sort(key=lambda f: f["min_price"] or 0)
+    facets["area"].sort(key=lambda f: (-f["count"], f["value"]))
+    facets["amenities"].sort(key=lambda f: -f["count"])
+    return facets
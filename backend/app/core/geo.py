@@ -0,0 +1,109 @@
+"""Geohash cells and great-circle distances for distance-ranked search.
+
+Each property stores the geohash of its coordinates. A radius search first
+prunes candidates to the (at most nine) geohash cells covering the circle,
+which a prefix match on the indexed column answers, and then ranks the
+candidates by exact haversine distance computed with NumPy.
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Precision of the stored geohash (~4.8m x 4.8m cells)
+GEOHASH_PRECISION = 9
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+
+@dataclass(frozen=True)
+class NearPoint:
+    """Centre and radius of a distance-ranked search."""
+
+    latitude: float
+    longitude: float
+    radius_km: float
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode a coordinate as a geohash of ``precision`` characters."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # Bits alternate longitude, latitude, starting with longitude
+
+    while len(chars) < precision:
+        target, interval = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if target >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def geohash_cell_degrees(precision: int) -> tuple[float, float]:
+    """Return the (latitude, longitude) size in degrees of a geohash cell."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def covering_geohashes(point: NearPoint) -> list[str]:
+    """Return geohash prefixes whose cells cover the circle around ``point``.
+
+    Uses the finest precision whose cells are at least the radius on each
+    side, so the cell containing the centre and its eight neighbours cover
+    the circle. Returns an empty list when the radius is too large to prune.
+    """
+    lat_scale = KM_PER_DEGREE
+    lng_scale = KM_PER_DEGREE * max(math.cos(math.radians(point.latitude)), 1e-6)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_deg, lng_deg = geohash_cell_degrees(precision)
+        if lat_deg * lat_scale >= point.radius_km and lng_deg * lng_scale >= point.radius_km:
+            cells = set()
+            for dlat in (-lat_deg, 0.0, lat_deg):
+                for dlng in (-lng_deg, 0.0, lng_deg):
+                    lat = min(max(point.latitude + dlat, -90.0), 90.0)
+                    lng = (point.longitude + dlng + 180.0) % 360.0 - 180.0
+                    cells.add(geohash_encode(lat, lng, precision))
+            return sorted(cells)
+
+    return []
+
+
+def bounding_box(point: NearPoint) -> tuple[float, float, float, float]:
+    """Return (min_lat, max_lat, min_lng, max_lng) of the square around the circle."""
+    dlat = point.radius_km / KM_PER_DEGREE
+    dlng = point.radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(point.latitude)), 1e-6))
+    return (
+        point.latitude - dlat,
+        point.latitude + dlat,
+        point.longitude - dlng,
+        point.longitude + dlng,
+    )
+
+
+def haversine_km(latitude: float, longitude: float, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Great-circle distances in km from one point to arrays of points."""
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlng = np.radians(longitudes) - math.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
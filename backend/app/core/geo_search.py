@@ -0,0 +1,249 @@
+"""Map and distance queries: bounding boxes, grid clusters and radius search.
+
+The geohash and haversine helpers these build on live in ``app.core.geo``.
+"""
+import numpy as np
+from sqlalchemy import select, and_, or_, func, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.property import Property
+from app.core.query_parser import ParsedQuery
+from app.core.geo import NearPoint, bounding_box, covering_geohashes, haversine_km
+from app.core.search_engine import (
+    SearchResult,
+    _Tier,
+    _apply_search_params,
+    _explicit_filter_conditions,
+    _fetch_unique,
+    _filter_conditions,
+    _overfetch_windows,
+    _search_params,
+    _sort_expression,
+    deduplicate_properties,
+)
+
+settings = get_settings()
+
+
+async def bbox_search(
+    db: AsyncSession,
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    city: str = "",
+    bhk: int | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    area: str | None = None,
+    min_sqft: int | None = None,
+    max_sqft: int | None = None,
+    amenities: list[str] | None = None,
+    order_by: str = "price",
+    limit: int = 200,
+) -> tuple[list[Property], bool]:
+    """Return properties inside a latitude/longitude box with ``filter_search`` filters.
+
+    The box is a range scan on idx_properties_lat_lng, whose included
+    columns let the city, BHK, price and sqft filters be checked before
+    visiting the table. Returns up to ``limit`` deduplicated properties in
+    ``order_by`` order and whether more matched (the viewport is truncated).
+    """
+    await _apply_search_params(db, _search_params(None, None, None, area))
+
+    conditions = _bbox_conditions(
+        min_lat, max_lat, min_lng, max_lng,
+        city, bhk, min_price, max_price, area, min_sqft, max_sqft, amenities,
+    )
+    sort_key = _sort_expression(order_by)
+    stmt = select(Property).where(and_(*conditions)).order_by(sort_key, Property.id)
+
+    # One extra row tells whether the cap cut the viewport short
+    properties = await _fetch_unique(db, stmt, limit + 1)
+    return properties[:limit], len(properties) > limit
+
+
+def _bbox_conditions(min_lat: float, max_lat: float, min_lng: float, max_lng: float, *filters) -> list:
+    """Box predicates (a range scan on idx_properties_lat_lng) plus explicit filters."""
+    return [
+        Property.latitude.between(min_lat, max_lat),
+        Property.longitude.between(min_lng, max_lng),
+        *_explicit_filter_conditions(*filters),
+    ]
+
+
+def cluster_cell_degrees(zoom: int) -> float:
+    """Grid cell size in degrees for a map zoom level.
+
+    A web map tile spans ``360 / 2**zoom`` degrees of longitude; each tile is
+    split into ``settings.map_cluster_cells_per_tile`` cells per side, so
+    the number of clusters on screen stays roughly constant at any zoom.
+    """
+    return 360.0 / (2 ** zoom) / settings.map_cluster_cells_per_tile
+
+
+async def bbox_clusters(
+    db: AsyncSession,
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    zoom: int,
+    city: str = "",
+    bhk: int | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    area: str | None = None,
+    min_sqft: int | None = None,
+    max_sqft: int | None = None,
+    amenities: list[str] | None = None,
+    limit: int = 500,
+) -> list[dict]:
+    """Aggregate the properties inside a box into grid clusters for ``zoom``.
+
+    One GROUP BY over grid cells (see ``cluster_cell_degrees``) returns each
+    cluster's count, centroid and price range, so the payload depends on the
+    viewport rather than on how many properties a city has. At most
+    ``limit`` clusters are returned, largest first.
+    """
+    await _apply_search_params(db, _search_params(None, None, None, area))
+
+    # The cell size is rendered inline so the grouped expressions are
+    # textually identical in SELECT and GROUP BY
+    cell = literal_column(repr(cluster_cell_degrees(zoom)))
+    cell_lat = func.floor(Property.latitude / cell)
+    cell_lng = func.floor(Property.longitude / cell)
+
+    conditions = _bbox_conditions(
+        min_lat, max_lat, min_lng, max_lng,
+        city, bhk, min_price, max_price, area, min_sqft, max_sqft, amenities,
+    )
+    count = func.count()
+    stmt = (
+        select(
+            count.label("count"),
+            func.avg(Property.latitude).label("latitude"),
+            func.avg(Property.longitude).label("longitude"),
+            func.min(Property.price_lakhs).label("min_price"),
+            func.max(Property.price_lakhs).label("max_price"),
+        )
+        .where(and_(*conditions))
+        .group_by(cell_lat, cell_lng)
+        .order_by(count.desc(), cell_lat, cell_lng)
+        .limit(limit)
+    )
+
+    result = await db.execute(stmt)
+    return [
+        {
+            "latitude": float(row.latitude),
+            "longitude": float(row.longitude),
+            "count": row.count,
+            "min_price": float(row.min_price) if row.min_price is not None else None,
+            "max_price": float(row.max_price) if row.max_price is not None else None,
+        }
+        for row in result.all()
+    ]
+
+
+async def _nearest(
+    db: AsyncSession, conditions: list, near: NearPoint, limit: int
+) -> list[tuple[Property, float]]:
+    """Return up to ``limit`` deduplicated (property, distance in km) pairs, nearest first.
+
+    Candidates matching ``conditions`` are pruned in SQL to the geohash cells
+    covering the circle (prefix ranges on idx_properties_geohash) and its
+    bounding box; only their ids and coordinates are fetched. Exact haversine
+    distances are then computed with NumPy and only the nearest rows inside
+    the radius are loaded in full. Ties are broken by id.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(near)
+    conditions = [
+        *conditions,
+        Property.latitude.between(min_lat, max_lat),
+        Property.longitude.between(min_lng, max_lng),
+    ]
+    cells = covering_geohashes(near)
+    if cells:
+        # "~" sorts after every geohash character in the column's "C" collation
+        conditions.append(or_(*(
+            and_(Property.geohash >= cell, Property.geohash < cell + "~") for cell in cells
+        )))
+
+    result = await db.execute(
+        select(Property.id, Property.latitude, Property.longitude).where(and_(*conditions))
+    )
+    candidates = sorted(result.all(), key=lambda row: row.id)
+    if not candidates:
+        return []
+
+    distances = haversine_km(
+        near.latitude,
+        near.longitude,
+        np.array([float(row.latitude) for row in candidates]),
+        np.array([float(row.longitude) for row in candidates]),
+    )
+    inside = np.flatnonzero(distances <= near.radius_km)
+    order = inside[np.argsort(distances[inside], kind="stable")]
+    if not len(order):
+        return []
+
+    for fetch in _overfetch_windows(limit):
+        ids = [candidates[i].id for i in order[:fetch]]
+        loaded = await db.execute(select(Property).where(Property.id.in_(ids)))
+        by_id = {prop.id: prop for prop in loaded.scalars().all()}
+        unique = deduplicate_properties([by_id[pid] for pid in ids if pid in by_id])
+        if len(unique) >= limit or fetch >= len(order):
+            break
+
+    distance_by_id = {candidates[i].id: float(distances[i]) for i in order[:fetch]}
+    return [(prop, distance_by_id[prop.id]) for prop in unique[:limit]]
+
+
+async def _search_ladder_nearby(
+    db: AsyncSession,
+    parsed_query: ParsedQuery,
+    city: str,
+    limit: int,
+    tiers: list[_Tier],
+    near: NearPoint,
+) -> SearchResult:
+    """Evaluate the relaxation ladder within a radius, ordering each tier by distance."""
+    await _apply_search_params(db, _search_params(None, None, None, parsed_query.area))
+
+    for tier in tiers:
+        conditions = _filter_conditions(
+            parsed_query, city, tier.use_bhk, tier.use_area, tier.use_price, tier.use_amenities,
+        )
+        ranked = await _nearest(db, conditions, near, limit)
+        if ranked:
+            return SearchResult([prop for prop, _ in ranked], tier.match_type, tier.relaxed_filters)
+
+    last = tiers[-1]
+    return SearchResult([], last.match_type, last.relaxed_filters)
+
+
+async def nearby_search(
+    db: AsyncSession,
+    near: NearPoint,
+    city: str = "",
+    bhk: int | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    area: str | None = None,
+    min_sqft: int | None = None,
+    max_sqft: int | None = None,
+    amenities: list[str] | None = None,
+    limit: int = 10,
+) -> list[tuple[Property, float]]:
+    """Find the properties nearest to a point within a radius, with ``filter_search`` filters.
+
+    Returns (property, distance in km) pairs, nearest first.
+    """
+    await _apply_search_params(db, _search_params(None, None, None, area))
+
+    conditions = _explicit_filter_conditions(
+        city, bhk, min_price, max_price, area, min_sqft, max_sqft, amenities,
+    )
+    return await _nearest(db, conditions, near, limit)
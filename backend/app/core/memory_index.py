@@ -0,0 +1,330 @@
+"""In-process exact vector search over columnar NumPy snapshots.
+
+Each city's properties are loaded once into a contiguous float32 embedding
+matrix (rows L2-normalized, so cosine similarity is a dot product) plus
+columnar filter arrays. Every relaxation tier is then a boolean mask and the
+ranking a masked matrix-vector product with ``argpartition`` top-k, so a
+search is bound by memory bandwidth instead of a round trip to Postgres.
+
+Snapshots are refreshed when the city's ``data_versions`` row changes; the
+version is checked at most every ``settings.data_version_refresh_seconds``.
+Without the ``data_versions`` table snapshots could never be invalidated, so
+searches then fall back to Postgres.
+"""
+import asyncio
+import logging
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.property import Property
+from app.core.amenities import normalize_amenities
+from app.core.query_parser import ParsedQuery
+from app.core.search_engine import DEDUP_OVERFETCH_FACTOR, SearchResult, deduplicate_properties
+from app.core.cache import DataVersionCache, get_data_version_cache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIMENSIONS = 768
+
+# Snapshots larger than this are searched in a worker thread so the
+# matrix-vector product does not block the event loop
+THREAD_OFFLOAD_ROWS = 20_000
+
+_RESPONSE_COLUMNS = (
+    Property.id,
+    Property.city,
+    Property.title,
+    Property.area,
+    Property.bhk,
+    Property.sqft,
+    Property.bathrooms,
+    Property.price_lakhs,
+    Property.amenities,
+    Property.latitude,
+    Property.longitude,
+)
+
+
+class PropertyColumns:
+    """Columnar view of a set of properties for vectorized filtering and ranking.
+
+    Rows are kept sorted by id so a stable sort on the rank reproduces the
+    ``ORDER BY rank, id`` tie-break used by the SQL search.
+    """
+
+    def __init__(self, properties: list[Property], embeddings: list | None = None):
+        order = sorted(range(len(properties)), key=lambda i: properties[i].id)
+        self.properties = [properties[i] for i in order]
+        n = len(self.properties)
+
+        self.bhk = np.array([p.bhk if p.bhk is not None else -1 for p in self.properties], dtype=np.int32)
+        self.price = np.array(
+            [float(p.price_lakhs) if p.price_lakhs is not None else np.nan for p in self.properties],
+            dtype=np.float64,
+        )
+        self.sqft = np.array(
+            [p.sqft if p.sqft is not None else np.nan for p in self.properties], dtype=np.float64
+        )
+
+        # Areas as ids into a lowercase vocabulary; missing areas point at a
+        # sentinel slot that never matches
+        self.area_names: list[str] = []
+        area_ids = {}
+        self.area_id = np.empty(n, dtype=np.int32)
+        for i, prop in enumerate(self.properties):
+            if not prop.area:
+                self.area_id[i] = -1
+                continue
+            name = prop.area.lower()
+            if name not in area_ids:
+                area_ids[name] = len(self.area_names)
+                self.area_names.append(name)
+            self.area_id[i] = area_ids[name]
+        self.area_id[self.area_id == -1] = len(self.area_names)
+
+        # Amenities as packed bitsets over the vocabulary seen in the data
+        self.amenity_bit: dict[str, int] = {}
+        for prop in self.properties:
+            for amenity in prop.amenities or []:
+                self.amenity_bit.setdefault(amenity, len(self.amenity_bit))
+        words = max(1, (len(self.amenity_bit) + 63) // 64)
+        self.amenity_bits = np.zeros((n, words), dtype=np.uint64)
+        for i, prop in enumerate(self.properties):
+            for amenity in prop.amenities or []:
+                bit = self.amenity_bit[amenity]
+                self.amenity_bits[i, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+
+        self.embeddings = None
+        self.has_embedding = np.zeros(n, dtype=bool)
+        if embeddings is not None:
+            matrix = np.zeros((n, EMBEDDING_DIMENSIONS), dtype=np.float32)
+            for row, i in enumerate(order):
+                if embeddings[i] is not None:
+                    matrix[row] = np.asarray(embeddings[i], dtype=np.float32)
+                    self.has_embedding[row] = True
+            norms = np.linalg.norm(matrix, axis=1)
+            norms[norms == 0] = 1.0
+            matrix /= norms[:, None]
+            self.embeddings = np.ascontiguousarray(matrix)
+
+    def __len__(self) -> int:
+        return len(self.properties)
+
+    def tier_mask(
+        self,
+        parsed_query: ParsedQuery,
+        use_bhk: bool = True,
+        use_area: bool = True,
+        use_price: bool = True,
+        use_amenities: bool = True,
+        area_match: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Boolean mask equivalent to the SQL filters of one relaxation tier.
+
+        NaN comparisons are False, matching SQL NULL semantics. ``area_match``
+        is a precomputed area predicate per row (e.g. evaluated in SQL) used
+        instead of the substring match.
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        if use_bhk and parsed_query.bhk:
+            mask &= self.bhk == parsed_query.bhk
+
+        if use_price:
+            if parsed_query.min_price:
+                mask &= self.price >= parsed_query.min_price
+            if parsed_query.max_price:
+                mask &= self.price <= parsed_query.max_price
+
+        if parsed_query.min_sqft:
+            mask &= self.sqft >= parsed_query.min_sqft
+        if parsed_query.max_sqft:
+            mask &= self.sqft <= parsed_query.max_sqft
+
+        if use_area and parsed_query.area and area_match is not None:
+            mask &= area_match
+        elif use_area and parsed_query.area:
+            # Substring match with the same sanitizing as the ILIKE predicate;
+            # the trigram (typo-tolerant) mode is only available in Postgres
+            needle = parsed_query.area.replace("%", "").replace("_", "")[:100].lower()
+            matching = np.array([needle in name for name in self.area_names] + [False], dtype=bool)
+            mask &= matching[self.area_id]
+
+        if use_amenities and parsed_query.amenities:
+            wanted = np.zeros(self.amenity_bits.shape[1], dtype=np.uint64)
+            for amenity in normalize_amenities(parsed_query.amenities):
+                if amenity not in self.amenity_bit:
+                    return np.zeros(len(self), dtype=bool)
+                bit = self.amenity_bit[amenity]
+                wanted[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+            mask &= ((self.amenity_bits & wanted) == wanted).all(axis=1)
+
+        return mask
+
+    def rank(self, query_embedding: list[float] | None, order_by: str = "price") -> np.ndarray:
+        """Return a rank per row where lower is better (NULLs last).
+
+        Cosine distance against the query embedding, or the SQL-only sort key
+        when there is no embedding.
+        """
+        if query_embedding is None or self.embeddings is None:
+            key = self.price
+            if order_by == "price_per_sqft":
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    key = np.where(self.sqft > 0, self.price / self.sqft, np.nan)
+            return np.where(np.isnan(key), np.inf, key)
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        distance = 1.0 - self.embeddings @ query
+        return np.where(self.has_embedding, distance, np.inf)
+
+    def top_unique(self, mask: np.ndarray, rank: np.ndarray, limit: int) -> list[Property]:
+        """Select up to ``limit`` deduplicated properties in rank order."""
+        candidates = np.flatnonzero(mask)
+        if not len(candidates):
+            return []
+
+        k = min(len(candidates), limit * DEDUP_OVERFETCH_FACTOR)
+        while True:
+            candidate_rank = rank[candidates]
+            if k < len(candidates):
+                chosen = candidates[np.argpartition(candidate_rank, k - 1)[:k]]
+            else:
+                chosen = candidates
+            # Sort by rank, breaking ties by row (i.e. id) order
+            chosen = chosen[np.lexsort((chosen, rank[chosen]))]
+            unique = deduplicate_properties([self.properties[i] for i in chosen])
+            if len(unique) >= limit or k >= len(candidates):
+                return unique[:limit]
+            k = min(len(candidates), k * 2)
+
+
+class CityIndex:
+    """A versioned PropertyColumns snapshot for one city (or all cities)."""
+
+    def __init__(self, columns: PropertyColumns, version):
+        self.columns = columns
+        self.version = version
+
+
+class InMemorySearchEngine:
+    """Answers hybrid_search tiers from per-city in-memory snapshots."""
+
+    def __init__(self, versions: DataVersionCache | None = None):
+        self.versions = versions or get_data_version_cache()
+        self._indexes: dict[str, CityIndex] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get_index(self, db: AsyncSession, city: str) -> CityIndex | None:
+        """Return the snapshot for ``city`` ("" for all cities), reloading on version change.
+
+        Returns None when data versions are unavailable.
+        """
+        version = await self.versions.get(db, city)
+        if version is None:
+            return None
+
+        index = self._indexes.get(city)
+        if index and index.version == version:
+            return index
+
+        lock = self._locks.setdefault(city, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(city)
+            if index and index.version == version:
+                return index
+
+            index = CityIndex(await self._load(db, city), version)
+            self._indexes[city] = index
+            logger.info(f"Loaded in-memory index for {city or 'all cities'}: {len(index.columns)} rows (version {version})")
+            return index
+
+    async def _load(self, db: AsyncSession, city: str) -> PropertyColumns:
+        stmt = select(*_RESPONSE_COLUMNS, Property.embedding)
+        if city:
+            stmt = stmt.where(Property.city == city)
+        result = await db.execute(stmt)
+        rows = result.all()
+
+        properties = [Property(**{col.key: row[i] for i, col in enumerate(_RESPONSE_COLUMNS)}) for row in rows]
+        embeddings = [row[-1] for row in rows]
+        return await asyncio.to_thread(PropertyColumns, properties, embeddings)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        parsed_query: ParsedQuery,
+        city: str,
+        limit: int,
+        query_embedding: list[float] | None,
+        tiers: list,
+    ):
+        """Evaluate the relaxation ladder against the in-memory snapshot.
+
+        Returns None when no snapshot can be used (see ``get_index``).
+        """
+        index = await self.get_index(db, city)
+        if index is None:
+            return None
+        columns = index.columns
+
+        if len(columns) > THREAD_OFFLOAD_ROWS:
+            return await asyncio.to_thread(
+                _search_columns, columns, parsed_query, limit, query_embedding, tiers
+            )
+        return _search_columns(columns, parsed_query, limit, query_embedding, tiers)
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+
+def _search_columns(
+    columns: PropertyColumns,
+    parsed_query: ParsedQuery,
+    limit: int,
+    query_embedding: list[float] | None,
+    tiers: list,
+):
+    rank = columns.rank(query_embedding, settings.sql_search_order)
+    return search_tiers(columns, parsed_query, limit, rank, tiers)
+
+
+def search_tiers(
+    columns: PropertyColumns,
+    parsed_query: ParsedQuery,
+    limit: int,
+    rank: np.ndarray,
+    tiers: list,
+    area_match: np.ndarray | None = None,
+):
+    """Return the top ``limit`` rows of the first tier with matches, in ``rank`` order."""
+    for tier in tiers:
+        mask = columns.tier_mask(
+            parsed_query, tier.use_bhk, tier.use_area, tier.use_price, tier.use_amenities,
+            area_match,
+        )
+        if mask.any():
+            return SearchResult(columns.top_unique(mask, rank, limit), tier.match_type, tier.relaxed_filters)
+
+    last = tiers[-1]
+    return SearchResult([], last.match_type, last.relaxed_filters)
+
+
+_engine: InMemorySearchEngine | None = None
+
+
+def get_memory_search_engine() -> InMemorySearchEngine:
+    """Get the process-wide in-memory search engine (singleton)."""
+    global _engine
+
+    if _engine is None:
+        _engine = InMemorySearchEngine()
+
+    return _engine
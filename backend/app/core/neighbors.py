@@ -0,0 +1,59 @@
+"""Offline k-nearest-neighbour computation over property embeddings.
+
+Used by ``scripts/build_neighbors.py`` to precompute similar properties per
+city, and as exact ground truth by ``scripts/benchmark_vector_recall.py``. Similarities are computed block by block so memory stays at
+``block_size x n`` floats however large the city is.
+"""
+import numpy as np
+
+# Rows per similarity block (256 x 50k float32 similarities is ~50 MB)
+DEFAULT_BLOCK_SIZE = 256
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """Return float32 rows scaled to unit length (zero rows stay zero)."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms)
+
+
+def top_k_neighbors(
+    embeddings: np.ndarray, k: int, block_size: int = DEFAULT_BLOCK_SIZE
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find each row's ``k`` nearest other rows by cosine distance.
+
+    Returns ``(indices, distances)``, both of shape ``(n, min(k, n - 1))`` and
+    ordered nearest first; a row is never its own neighbour. Ties are broken
+    by row index.
+    """
+    matrix = normalize_rows(embeddings)
+    n = len(matrix)
+    k = min(k, n - 1)
+    indices = np.empty((n, max(k, 0)), dtype=np.int64)
+    distances = np.empty((n, max(k, 0)), dtype=np.float32)
+    if k <= 0:
+        return indices, distances
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        similarity = matrix[start:stop] @ matrix.T
+        rows = np.arange(stop - start)
+        similarity[rows, rows + start] = -np.inf
+
+        candidates = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        candidate_similarity = np.take_along_axis(similarity, candidates, axis=1)
+        # Sort by similarity (descending), then by index
+        order = np.lexsort((candidates, -candidate_similarity), axis=1)
+        indices[start:stop] = np.take_along_axis(candidates, order, axis=1)
+        distances[start:stop] = 1.0 - np.take_along_axis(candidate_similarity, order, axis=1)
+
+    return indices, distances
+
+
+def recall_at_k(expected: list, actual: list, k: int) -> float:
+    """Fraction of the first ``k`` expected ids found in the first ``k`` actual ids."""
+    expected = list(expected)[:k]
+    if not expected:
+        return 1.0
+    return len(set(expected) & set(list(actual)[:k])) / len(expected)
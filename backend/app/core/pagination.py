@@ -0,0 +1,90 @@
+"""Opaque keyset cursors for paging through search results.
+
+A cursor carries everything needed to fetch the next page without parsing
+the query or re-running the relaxation ladder: the parsed filters (whose raw
+query text is also the key of the query embedding cache), the effective
+city, the tier that matched, the last property returned and how many
+results were returned so far (which sizes the re-rank candidate window).
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from uuid import UUID
+
+from pydantic import ValidationError as PydanticValidationError
+
+from app.core.exceptions import ValidationError
+from app.core.query_parser import ParsedQuery
+from app.core.search_engine import SearchResult, find_relaxation_tier
+
+CURSOR_VERSION = 1
+
+
+@dataclass
+class SearchCursor:
+    parsed_query: ParsedQuery
+    city: str
+    match_type: str
+    relaxed_filters: list[str]
+    after_id: UUID
+    position: int = 0
+
+    def encode(self) -> str:
+        payload = {
+            "v": CURSOR_VERSION,
+            "q": self.parsed_query.model_dump(),
+            "c": self.city,
+            "t": [self.match_type, self.relaxed_filters],
+            "a": str(self.after_id),
+            "p": self.position,
+        }
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "SearchCursor":
+        """Decode a cursor, raising ValidationError if it is malformed."""
+        try:
+            data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(data)
+            if payload["v"] != CURSOR_VERSION:
+                raise ValueError("unsupported cursor version")
+            match_type, relaxed_filters = payload["t"]
+            cursor = cls(
+                parsed_query=ParsedQuery(**payload["q"]),
+                city=str(payload["c"]),
+                match_type=match_type,
+                relaxed_filters=list(relaxed_filters),
+                after_id=UUID(payload["a"]),
+                position=max(0, int(payload.get("p", 0))),
+            )
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, PydanticValidationError):
+            raise ValidationError("Invalid pagination cursor")
+
+        if cursor.tier is None:
+            raise ValidationError("Invalid pagination cursor")
+        return cursor
+
+    @property
+    def tier(self):
+        return find_relaxation_tier(self.parsed_query, self.match_type, self.relaxed_filters)
+
+
+def next_search_cursor(
+    parsed_query: ParsedQuery, city: str, result: SearchResult, limit: int, position: int = 0
+) -> str | None:
+    """Return the cursor for the page after ``result``, or None if it was the last page.
+
+    ``position`` is the number of results returned before ``result``.
+    """
+    if not result.properties or len(result.properties) < limit:
+        return None
+    return SearchCursor(
+        parsed_query=parsed_query,
+        city=city,
+        match_type=result.match_type,
+        relaxed_filters=result.relaxed_filters,
+        after_id=result.properties[-1].id,
+        position=position + len(result.properties),
+    ).encode()
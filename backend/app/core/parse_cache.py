@@ -0,0 +1,182 @@
+"""Cross-worker cache of LLM query parses backed by a local SQLite file.
+
+Parses are deterministic (temperature 0), so every uvicorn worker on a host
+can share them. Keys are the normalized query text prefixed with the LLM
+provider, model and prompt, so changing any of those starts a fresh cache.
+Failed parses are cached for a short time as negative entries so a failing
+or rate-limited LLM is not hammered with the same query.
+
+SQLite calls block, so async callers use the ``aget``/``aset``/
+``aset_failure`` wrappers, which run them in a worker thread; a short busy
+timeout makes a locked database a cache miss instead of a wait.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from app.config import get_settings
+from app.core.cache import normalize_query_text
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Expired rows are purged once every this many writes
+PURGE_EVERY_WRITES = 500
+
+# How long a statement waits for another worker's write lock before the
+# lookup is treated as a miss (or the write skipped)
+BUSY_TIMEOUT_SECONDS = 0.005
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS parse_cache (
+    key TEXT PRIMARY KEY,
+    ok INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+class CachedParseFailure:
+    """A negative cache entry; ``message`` is None when the parse fell back to no filters."""
+
+    def __init__(self, message: str | None):
+        self.message = message
+
+
+class ParseCache:
+    """SQLite-backed parse cache shared by all processes using the same file."""
+
+    def __init__(self, path: str, namespace: str, ttl: float, negative_ttl: float):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._conn: sqlite3.Connection | None = None
+        # Calls arrive from worker threads; one at a time on the connection
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False,
+            )
+            # WAL lets workers read while another one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA_SQL)
+            self._conn = conn
+        return self._conn
+
+    def _key(self, query: str) -> str:
+        return f"{self.namespace}|{normalize_query_text(query)}"
+
+    def get(self, query: str) -> dict | CachedParseFailure | None:
+        """Return the cached parse fields, a CachedParseFailure, or None on a miss.
+
+        SQLite errors are logged and treated as misses.
+        """
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT ok, value FROM parse_cache WHERE key = ? AND expires_at > ?",
+                    (self._key(query), time.time()),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Parse cache read failed: {e}")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        ok, value = row
+        if ok:
+            self.hits += 1
+            return json.loads(value)
+
+        self.negative_hits += 1
+        return CachedParseFailure(json.loads(value).get("message"))
+
+    def set(self, query: str, fields: dict) -> None:
+        self._write(query, True, fields, self.ttl)
+
+    def set_failure(self, query: str, message: str | None) -> None:
+        self._write(query, False, {"message": message}, self.negative_ttl)
+
+    async def aget(self, query: str) -> dict | CachedParseFailure | None:
+        """``get`` without blocking the event loop."""
+        return await asyncio.to_thread(self.get, query)
+
+    async def aset(self, query: str, fields: dict) -> None:
+        """``set`` without blocking the event loop."""
+        await asyncio.to_thread(self.set, query, fields)
+
+    async def aset_failure(self, query: str, message: str | None) -> None:
+        """``set_failure`` without blocking the event loop."""
+        await asyncio.to_thread(self.set_failure, query, message)
+
+    def _write(self, query: str, ok: bool, value: dict, ttl: float) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO parse_cache (key, ok, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (self._key(query), int(ok), json.dumps(value), now + ttl),
+                )
+                self._writes += 1
+                if self._writes % PURGE_EVERY_WRITES == 0:
+                    conn.execute("DELETE FROM parse_cache WHERE expires_at <= ?", (now,))
+        except sqlite3.Error as e:
+            logger.warning(f"Parse cache write failed: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def parse_cache_namespace(system_prompt: str) -> str:
+    """Identify the LLM configuration whose parses are cached."""
+    model = settings.groq_model if settings.llm_provider == "groq" else settings.ollama_llm_model
+    prompt_hash = hashlib.sha256(system_prompt.encode()).hexdigest()[:12]
+    return f"{settings.llm_provider}:{model}:{prompt_hash}"
+
+
+_parse_cache: ParseCache | None = None
+
+
+def get_parse_cache() -> ParseCache | None:
+    """Get the process-wide parse cache, or None when it is disabled."""
+    global _parse_cache
+
+    from app.core.query_parser import SYSTEM_PROMPT
+
+    if not settings.parse_cache_enabled:
+        return None
+
+    if _parse_cache is None:
+        path = settings.parse_cache_path or os.path.join(tempfile.gettempdir(), "cribinfo_parse_cache.sqlite3")
+        _parse_cache = ParseCache(
+            path,
+            parse_cache_namespace(SYSTEM_PROMPT),
+            ttl=settings.parse_cache_ttl_seconds,
+            negative_ttl=settings.parse_cache_negative_ttl_seconds,
+        )
+
+    return _parse_cache
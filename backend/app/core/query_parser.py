@@ -5,6 +5,8 @@ from pydantic import BaseModel
 
 from app.config import get_settings
 from app.core.exceptions import LLMError
+from app.core.amenities import normalize_amenities, QUERY_AMENITY_TERMS
+from app.core.parse_cache import get_parse_cache, CachedParseFailure
 from app.providers.llm import get_llm_provider
 
 settings = get_settings()
@@ -86,6 +88,20 @@ AREA_CITY_MAP = {
 }
 
 
+# Display spellings of mapped areas whose names str.title() gets wrong
+_AREA_DISPLAY_OVERRIDES = {
+    "hsr layout": "HSR Layout",
+    "btm layout": "BTM Layout",
+    "mg road": "MG Road",
+    "jp nagar": "JP Nagar",
+    "gk": "GK",
+    "dlf": "DLF",
+    "dlf phase 5": "DLF Phase 5",
+    "cp": "CP",
+}
+AREA_DISPLAY_NAMES = {area: _AREA_DISPLAY_OVERRIDES.get(area, area.title()) for area in AREA_CITY_MAP}
+
+
 class ParsedQuery(BaseModel):
     bhk: int | None = None
     min_price: float | None = None
@@ -123,6 +139,157 @@ Query: "flat between 50L to 80L with parking"
 Return ONLY the JSON object, no other text."""
 
 
+# Rule-based fast path: queries fully covered by these patterns are parsed
+# without calling the LLM
+_NUMBER = r"(\d+(?:\.\d+)?)"
+_PRICE_UNIT = r"(crores?|crs?|lakhs?|lacs?|l)\b"
+_SQFT_NUMBER = r"(\d{1,3}(?:,\d{3})+|\d+)"
+_SQFT_UNIT = r"(?:sq\.?\s*ft\.?|sqft|sq\.?\s*feet|square\s*f(?:ee|oo)t|sft)(?!\w)"
+_MAX_WORDS = r"(?:under|below|less\s+than|up\s*to|within|max(?:imum)?|not\s+more\s+than|budget(?:\s+of)?)"
+_MIN_WORDS = r"(?:above|over|more\s+than|at\s*least|min(?:imum)?|starting(?:\s+(?:from|at))?)"
+_RANGE_WORDS = r"(?:-|to|and)"
+_CURRENCY = r"(?:rs\.?\s*|inr\s*|₹\s*)?"
+
+_PRICE_RANGE_RE = re.compile(
+    rf"(?:between\s+|from\s+)?{_CURRENCY}{_NUMBER}\s*(?:{_PRICE_UNIT})?\s*{_RANGE_WORDS}\s*{_CURRENCY}{_NUMBER}\s*{_PRICE_UNIT}"
+)
+_PRICE_MAX_RE = re.compile(rf"{_MAX_WORDS}\s+{_CURRENCY}{_NUMBER}\s*{_PRICE_UNIT}")
+_PRICE_MIN_RE = re.compile(rf"{_MIN_WORDS}\s+{_CURRENCY}{_NUMBER}\s*{_PRICE_UNIT}")
+_SQFT_RANGE_RE = re.compile(
+    rf"(?:between\s+|from\s+)?{_SQFT_NUMBER}\s*(?:{_SQFT_UNIT})?\s*{_RANGE_WORDS}\s*{_SQFT_NUMBER}\s*{_SQFT_UNIT}"
+)
+_SQFT_MAX_RE = re.compile(rf"{_MAX_WORDS}\s+{_SQFT_NUMBER}\s*{_SQFT_UNIT}")
+_SQFT_MIN_RE = re.compile(rf"(?:{_MIN_WORDS}\s+)?{_SQFT_NUMBER}\s*{_SQFT_UNIT}")
+_BHK_RE = re.compile(r"\b(\d+)\s*(?:bhk|bed(?:room)?s?|br)\b")
+
+
+def _lexicon_pattern(terms) -> re.Pattern:
+    # Longest terms first so "bandra west" wins over "bandra"
+    alternation = "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})s?\b")
+
+
+_AREA_RE = _lexicon_pattern(AREA_CITY_MAP)
+_AMENITY_RE = _lexicon_pattern(QUERY_AMENITY_TERMS)
+
+# Words that carry no filter and do not make a query ambiguous
+_FILLER_WORDS = {
+    "a", "an", "the", "in", "at", "near", "around", "with", "and", "or", "for", "of", "on",
+    "i", "me", "my", "we", "want", "need", "looking", "show", "find", "search", "buy", "sale",
+    "flat", "flats", "apartment", "apartments", "house", "houses", "home", "homes",
+    "property", "properties", "unit", "units", "having", "has", "price", "priced",
+}
+
+# Words that can invert a nearby filter ("without gym"); left for the LLM
+_NEGATION_WORDS = {"without", "no", "not", "except", "excluding", "non"}
+
+_UNIT_LAKHS = {"cr": 100, "crs": 100, "crore": 100, "crores": 100}
+
+
+def _lakhs(amount: str, unit: str) -> float:
+    return float(amount) * _UNIT_LAKHS.get(unit, 1)
+
+
+def _sqft(amount: str) -> int:
+    return int(amount.replace(",", ""))
+
+
+def rule_based_parse(query: str) -> tuple[ParsedQuery, bool]:
+    """Parse common query shapes with compiled patterns and lexicons.
+
+    Extracts BHK, price ranges (Cr/L/lakh converted to lakhs), sqft, areas
+    from ``AREA_CITY_MAP`` (in their ``AREA_DISPLAY_NAMES`` spelling) and
+    amenities. The query is fully parsed only when every word was either
+    extracted or is filler; not when nothing was extracted, the extracted
+    ranges are inconsistent, a negation word is left over or any other word
+    was not understood (e.g. "hsr" without "layout"), since a leftover word
+    can change what the query means.
+
+    Returns:
+        Tuple of (ParsedQuery, whether the query was fully parsed)
+    """
+    text = query.lower()
+    fields: dict = {}
+
+    def consume(match: re.Match) -> None:
+        nonlocal text
+        text = text[:match.start()] + " " * (match.end() - match.start()) + text[match.end():]
+
+    if match := _PRICE_RANGE_RE.search(text):
+        low, low_unit, high, high_unit = match.groups()
+        fields["min_price"] = _lakhs(low, low_unit or high_unit)
+        fields["max_price"] = _lakhs(high, high_unit)
+        consume(match)
+    if "max_price" not in fields and (match := _PRICE_MAX_RE.search(text)):
+        fields["max_price"] = _lakhs(*match.groups())
+        consume(match)
+    if "min_price" not in fields and (match := _PRICE_MIN_RE.search(text)):
+        fields["min_price"] = _lakhs(*match.groups())
+        consume(match)
+
+    if match := _SQFT_RANGE_RE.search(text):
+        fields["min_sqft"], fields["max_sqft"] = _sqft(match.group(1)), _sqft(match.group(2))
+        consume(match)
+    if "max_sqft" not in fields and (match := _SQFT_MAX_RE.search(text)):
+        fields["max_sqft"] = _sqft(match.group(1))
+        consume(match)
+    # A bare size ("1500 sqft") is read as a minimum
+    if "min_sqft" not in fields and (match := _SQFT_MIN_RE.search(text)):
+        fields["min_sqft"] = _sqft(match.group(1))
+        consume(match)
+
+    if match := _BHK_RE.search(text):
+        fields["bhk"] = int(match.group(1))
+        consume(match)
+
+    areas = list(_AREA_RE.finditer(text))
+    if len(areas) > 1:
+        # Several locations need interpretation
+        return ParsedQuery(raw_query=query), False
+    if areas:
+        matched = areas[0].group()
+        # The pattern also matches a plural "s"
+        area = matched if matched in AREA_CITY_MAP else matched[:-1]
+        fields["area"] = AREA_DISPLAY_NAMES[area]
+        fields["inferred_city"] = AREA_CITY_MAP[area]
+        consume(areas[0])
+
+    amenities = []
+    for match in list(_AMENITY_RE.finditer(text)):
+        amenities.append(match.group())
+        consume(match)
+    fields["amenities"] = normalize_amenities(amenities)
+
+    parsed = ParsedQuery(raw_query=query, **fields)
+    extracted = any(v for k, v in fields.items() if k != "inferred_city")
+    inconsistent = (
+        (parsed.min_price and parsed.max_price and parsed.min_price > parsed.max_price)
+        or (parsed.min_sqft and parsed.max_sqft and parsed.min_sqft > parsed.max_sqft)
+    )
+    if not extracted or inconsistent:
+        return parsed, False
+
+    leftover = re.findall(r"[a-z0-9₹]+", text)
+    if _NEGATION_WORDS.intersection(leftover):
+        return parsed, False
+    return parsed, all(w in _FILLER_WORDS for w in leftover)
+
+
+# How each parse_query call was answered; the LLM bypass rate is the share
+# answered by the rules or the parse cache
+_parse_counts = {"rules": 0, "cache": 0, "llm": 0}
+
+
+def parser_stats() -> dict:
+    """Return parse_query counters and the LLM bypass rate for this worker."""
+    total = sum(_parse_counts.values())
+    bypassed = _parse_counts["rules"] + _parse_counts["cache"]
+    return {
+        **_parse_counts,
+        "llm_bypass_rate": round(bypassed / total, 4) if total else 0.0,
+    }
+
+
 def extract_json(text: str) -> dict:
     """Extract JSON from LLM response, handling potential extra text."""
     # Try to find JSON in the response
@@ -162,6 +329,11 @@ def infer_city_from_area(area: str | None) -> str | None:
 async def parse_query(query: str) -> ParsedQuery:
     """Parse natural language query using LLM provider.
 
+    Queries the rule-based parser fully understands are answered without
+    the LLM.
+    LLM results are memoized in the cross-worker parse cache keyed on the
+    normalized query text; failures are cached briefly as negative entries.
+
     Args:
         query: Natural language search query
 
@@ -175,23 +347,50 @@ async def parse_query(query: str) -> ParsedQuery:
         logger.warning("Empty query provided")
         return ParsedQuery(raw_query="")
 
+    if settings.rule_parser_enabled:
+        parsed, complete = rule_based_parse(query)
+        if complete:
+            _parse_counts["rules"] += 1
+            logger.debug(f"Rule-based parse: {parsed.model_dump()}")
+            return parsed
+
+    cache = get_parse_cache()
+    cached = await cache.aget(query) if cache else None
+    if cached is not None:
+        _parse_counts["cache"] += 1
+    if isinstance(cached, CachedParseFailure):
+        if cached.message is not None:
+            raise LLMError(cached.message)
+        return ParsedQuery(raw_query=query)
+    if cached is not None:
+        return ParsedQuery(**cached, raw_query=query)
+
+    _parse_counts["llm"] += 1
     try:
         llm = get_llm_provider()
         response = await llm.chat(SYSTEM_PROMPT, f"Query: {query}")
 
         result = extract_json(response)
         result["raw_query"] = query
+        result["amenities"] = normalize_amenities(result.get("amenities"))
 
         # Infer city from area
         area = result.get("area")
         result["inferred_city"] = infer_city_from_area(area)
 
-        return ParsedQuery(**result)
+        parsed = ParsedQuery(**result)
+        if cache:
+            await cache.aset(query, parsed.model_dump(exclude={"raw_query"}))
+        return parsed
 
-    except LLMError:
+    except LLMError as e:
+        if cache:
+            await cache.aset_failure(query, e.message)
         raise
     except Exception as e:
         logger.exception(f"Unexpected query parsing error: {e}")
+        if cache:
+            await cache.aset_failure(query, None)
         # Return a basic parsed query on error instead of failing completely
         logger.info("Falling back to empty parsed query")
         return ParsedQuery(raw_query=query)
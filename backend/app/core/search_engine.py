@@ -1,10 +1,32 @@
-from sqlalchemy import select, and_, distinct
+import asyncio
+from dataclasses import dataclass
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import (
+    select, and_, or_, distinct, bindparam, cast, literal, union_all, func, true,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC, Vector
 
-from app.models.property import Property
+from app.config import get_settings
+from app.models.database import async_session
+from app.models.property import PRICE_PER_SQFT, Property
 from app.core.query_parser import ParsedQuery
-from app.core.embeddings import generate_embedding
+from app.core.amenities import normalize_amenities
+from app.core.embeddings import generate_query_embedding, vector_search_enabled
+from app.core.geo import NearPoint
+
+settings = get_settings()
+
+# Ranked queries fetch this many rows per requested result so a page still
+# fills up after duplicates are removed; the window doubles (up to the cap)
+# while duplicates keep the page short.
+DEDUP_OVERFETCH_FACTOR = 2
+DEDUP_MAX_FETCH = 500
+
+# Upper bound pgvector accepts for hnsw.ef_search
+HNSW_MAX_EF_SEARCH = 1000
 
 
 def deduplicate_properties(properties: list[Property]) -> list[Property]:
@@ -20,6 +42,52 @@ def deduplicate_properties(properties: list[Property]) -> list[Property]:
     return unique
 
 
+def _overfetch_windows(limit: int):
+    """Yield increasing fetch sizes for deduplicated ranked queries."""
+    fetch = limit * DEDUP_OVERFETCH_FACTOR
+    while True:
+        yield fetch
+        if fetch >= DEDUP_MAX_FETCH:
+            return
+        fetch = min(fetch * 2, DEDUP_MAX_FETCH)
+
+
+def _vector_window(stmt, rank, fetch: int):
+    """Select the ``fetch`` rows of ``stmt`` nearest by ``rank``, ordered by (rank, id).
+
+    A pgvector index can only serve an ORDER BY on the distance alone, so the
+    inner query orders by ``rank`` only and the id tie-break is applied by the
+    outer query to the limited rows.
+    """
+    window = (
+        stmt.with_only_columns(Property.id, rank.label("rank"))
+        .order_by(rank)
+        .limit(fetch)
+        .subquery("ranked")
+    )
+    return select(Property).join(window, Property.id == window.c.id).order_by(window.c.rank, window.c.id)
+
+
+async def _fetch_unique(db: AsyncSession, stmt, limit: int, vector_rank=None) -> list[Property]:
+    """Return up to ``limit`` deduplicated properties from an ordered statement.
+
+    With ``vector_rank`` the statement is left unordered and each window is
+    selected by ``_vector_window`` instead. Refetches with a larger window
+    only when duplicates left the page short and the previous window was
+    full (i.e. more rows may exist).
+    """
+    for fetch in _overfetch_windows(limit):
+        if vector_rank is not None:
+            result = await db.execute(_vector_window(stmt, vector_rank, fetch))
+        else:
+            result = await db.execute(stmt.limit(fetch))
+        properties = list(result.scalars().all())
+        unique = deduplicate_properties(properties)
+        if len(unique) >= limit or len(properties) < fetch:
+            break
+    return unique[:limit]
+
+
 class SearchResult:
     """Container for search results with match quality info."""
     def __init__(self, properties: list[Property], match_type: str, relaxed_filters: list[str]):
@@ -28,100 +96,274 @@ class SearchResult:
         self.relaxed_filters = relaxed_filters  # List of filters that were relaxed
 
 
+@dataclass(frozen=True)
+class _Tier:
+    """One step of the filter-relaxation ladder."""
+    use_bhk: bool
+    use_area: bool
+    use_price: bool
+    use_amenities: bool
+    match_type: str
+    relaxed_filters: list[str]
+
+
+def _relaxation_tiers(parsed_query: ParsedQuery) -> list[_Tier]:
+    """Build the relaxation ladder for a parsed query.
+
+    Tiers whose effective filters are identical to an earlier tier are
+    skipped, since they can only return what that tier already did not.
+    The final pure vector tier is always kept.
+    """
+    specified = {
+        "amenities": bool(parsed_query.amenities),
+        "bhk": bool(parsed_query.bhk),
+        "area": bool(parsed_query.area),
+        "price": bool(parsed_query.min_price or parsed_query.max_price),
+    }
+
+    # (use_bhk, use_area, use_price, use_amenities, match_type) in priority order
+    ladder = [
+        (True, True, True, True, "exact"),
+        (True, True, True, False, "partial"),    # Relax amenities, keep everything else
+        (False, True, True, False, "partial"),   # Relax BHK, keep area (prioritize location)
+        (True, False, True, False, "partial"),   # Relax area, keep BHK
+        (False, False, True, False, "partial"),  # Relax both BHK and area, keep price
+        (False, False, False, False, "similar"),  # Pure vector similarity with only city filter
+    ]
+
+    tiers = []
+    seen = set()
+    for i, (use_bhk, use_area, use_price, use_amenities, match_type) in enumerate(ladder):
+        used = {"amenities": use_amenities, "bhk": use_bhk, "area": use_area, "price": use_price}
+        effective = tuple(used[name] and specified[name] for name in specified)
+        is_last = i == len(ladder) - 1
+        if effective in seen and not is_last:
+            continue
+        seen.add(effective)
+        relaxed = [name for name in specified if specified[name] and not used[name]]
+        tiers.append(_Tier(use_bhk, use_area, use_price, use_amenities, match_type, relaxed))
+    return tiers
+
+
+def find_relaxation_tier(
+    parsed_query: ParsedQuery, match_type: str, relaxed_filters: list[str]
+) -> _Tier | None:
+    """Return the ladder tier that produced a result with these labels."""
+    for tier in _relaxation_tiers(parsed_query):
+        if tier.match_type == match_type and tier.relaxed_filters == relaxed_filters:
+            return tier
+    return None
+
+
 async def hybrid_search(
     db: AsyncSession,
     parsed_query: ParsedQuery,
     city: str,
     limit: int = 10,
+    ladder_mode: str | None = None,
+    query_embedding: list[float] | None = None,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    near: NearPoint | None = None,
 ) -> SearchResult:
     """Perform hybrid search combining vector similarity with SQL filters.
 
     Prioritizes location matches over other filters when relaxing.
     Relaxation order:
     1. All filters (exact match)
-    2. Relax BHK, keep area (prioritize location)
-    3. Relax area, keep BHK
-    4. Relax both BHK and area
-    5. Pure vector similarity
+    2. Relax amenities
+    3. Relax BHK, keep area (prioritize location)
+    4. Relax area, keep BHK
+    5. Relax both BHK and area
+    6. Pure vector similarity
+
+    ``ladder_mode`` (default ``settings.search_ladder_mode``) selects how the
+    ladder is executed: ``"sequential"`` issues one query per tier until one
+    returns rows, ``"single"`` evaluates every tier in one statement,
+    ``"parallel"`` runs the tiers concurrently on separate pooled sessions and
+    ``"candidates"`` fetches the top ``settings.search_candidate_pool`` rows
+    once and picks the tier in NumPy (approximate, see
+    ``_search_ladder_candidates``).
+
+    ``query_embedding`` may be passed in when the caller already generated it
+    (e.g. concurrently with query parsing); otherwise it is generated here.
+    When vector search is disabled (``embedding_provider="none"``) no
+    embedding is used and every tier is ordered by ``settings.sql_search_order``
+    instead, with the same index-backed sort as ``filter_search``.
+
+    ``ef_search``/``probes`` tune HNSW/IVFFlat index scans for this search
+    only (defaults: ``settings.hnsw_ef_search``/``settings.ivfflat_probes``).
+
+    With ``settings.search_backend="memory"`` the ladder is evaluated exactly
+    against an in-process NumPy snapshot of the city (see
+    ``app.core.memory_index``) instead of in Postgres, unless data versions
+    are unavailable.
+
+    With ``near`` only properties within its radius are searched and each
+    tier is ordered by distance instead (see ``app.core.geo_search``); no embedding is
+    needed and the ladder always runs sequentially in Postgres.
 
     Returns SearchResult with match quality information.
     """
 
-    # Generate embedding for the raw query
-    query_embedding = await generate_embedding(parsed_query.raw_query)
-
     # Use inferred city from area if no city explicitly selected
     effective_city = city or parsed_query.inferred_city or ""
 
-    # 1. Try with all filters first (exact match)
-    results = await _search_with_filters(
-        db, query_embedding, parsed_query, effective_city, limit,
-        use_bhk=True, use_area=True, use_price=True
-    )
-    if results:
-        return SearchResult(results, "exact", [])
+    tiers = _relaxation_tiers(parsed_query)
 
-    # 2. Relax BHK but KEEP area (prioritize location over bedroom count)
-    if parsed_query.area:
-        results = await _search_with_filters(
-            db, query_embedding, parsed_query, effective_city, limit,
-            use_bhk=False, use_area=True, use_price=True
+    if near is not None:
+        from app.core.geo_search import _search_ladder_nearby
+
+        return await _search_ladder_nearby(db, parsed_query, effective_city, limit, tiers, near)
+
+    # Generate embedding for the raw query
+    if query_embedding is None and vector_search_enabled():
+        query_embedding = await generate_query_embedding(parsed_query.raw_query)
+
+    if settings.search_backend == "memory":
+        from app.core.memory_index import get_memory_search_engine
+
+        result = await get_memory_search_engine().search(
+            db, parsed_query, effective_city, limit, query_embedding, tiers
+        )
+        if result is not None:
+            return result
+
+    mode = ladder_mode or settings.search_ladder_mode
+    search_params = _search_params(query_embedding, ef_search, probes, parsed_query.area)
+
+    if mode == "parallel":
+        return await _search_ladder_parallel(
+            query_embedding, parsed_query, effective_city, limit, tiers,
+            settings.search_max_connections, search_params,
+        )
+
+    if mode == "candidates":
+        pool = max(limit, settings.search_candidate_pool)
+        if query_embedding is not None:
+            ef_search = max(pool, int(search_params.get("hnsw.ef_search", 0)))
+            search_params["hnsw.ef_search"] = str(min(ef_search, HNSW_MAX_EF_SEARCH))
+        await _apply_search_params(db, search_params)
+        return await _search_ladder_candidates(
+            db, query_embedding, parsed_query, effective_city, limit, tiers, pool
         )
-        if results:
-            relaxed = ["bhk"] if parsed_query.bhk else []
-            return SearchResult(results, "partial", relaxed)
 
-    # 3. Relax area but keep BHK
-    if parsed_query.bhk:
+    await _apply_search_params(db, search_params)
+
+    if mode == "single":
+        return await _search_ladder_single_statement(
+            db, query_embedding, parsed_query, effective_city, limit, tiers
+        )
+
+    for tier in tiers:
         results = await _search_with_filters(
             db, query_embedding, parsed_query, effective_city, limit,
-            use_bhk=True, use_area=False, use_price=True
+            use_bhk=tier.use_bhk, use_area=tier.use_area, use_price=tier.use_price,
+            use_amenities=tier.use_amenities,
         )
         if results:
-            relaxed = ["area"] if parsed_query.area else []
-            return SearchResult(results, "partial", relaxed)
+            return SearchResult(results, tier.match_type, tier.relaxed_filters)
 
-    # 4. Relax both BHK and area, keep price
-    results = await _search_with_filters(
-        db, query_embedding, parsed_query, effective_city, limit,
-        use_bhk=False, use_area=False, use_price=True
-    )
-    if results:
-        relaxed = []
-        if parsed_query.bhk:
-            relaxed.append("bhk")
-        if parsed_query.area:
-            relaxed.append("area")
-        return SearchResult(results, "partial", relaxed)
+    last = tiers[-1]
+    return SearchResult([], last.match_type, last.relaxed_filters)
+
+
+async def search_after(
+    db: AsyncSession,
+    parsed_query: ParsedQuery,
+    city: str,
+    tier: _Tier,
+    after_id: UUID,
+    limit: int = 10,
+    query_embedding: list[float] | None = None,
+    position: int = 0,
+) -> SearchResult:
+    """Fetch the next page of a search within the tier that matched.
+
+    One keyset query continuing after ``after_id``; the ladder is not
+    re-evaluated. ``city`` is the city requested for the first page and
+    ``position`` the number of results returned before this page.
+    """
+    effective_city = city or parsed_query.inferred_city or ""
 
-    # 5. Fall back to pure vector similarity with only city filter
+    await _apply_search_params(db, _search_params(query_embedding, None, None, parsed_query.area))
     results = await _search_with_filters(
         db, query_embedding, parsed_query, effective_city, limit,
-        use_bhk=False, use_area=False, use_price=False
+        use_bhk=tier.use_bhk, use_area=tier.use_area, use_price=tier.use_price,
+        use_amenities=tier.use_amenities, after_id=after_id, skipped=position,
     )
+    return SearchResult(results, tier.match_type, tier.relaxed_filters)
 
-    relaxed = []
-    if parsed_query.bhk:
-        relaxed.append("bhk")
-    if parsed_query.area:
-        relaxed.append("area")
-    if parsed_query.max_price or parsed_query.min_price:
-        relaxed.append("price")
 
-    return SearchResult(results, "similar", relaxed)
+def _search_params(
+    query_embedding: list[float] | None,
+    ef_search: int | None,
+    probes: int | None,
+    area: str | None = None,
+) -> dict[str, str]:
+    """Collect the planner/index parameters to apply for one search.
 
+    ANN index scan parameters only matter when ordering by vector distance;
+    the trigram threshold only when matching an area in "trigram" mode.
+    """
+    params = {}
+    if area and settings.area_match_mode == "trigram":
+        params["pg_trgm.word_similarity_threshold"] = str(float(settings.area_similarity_threshold))
+
+    if query_embedding is None:
+        return params
+
+    ef_search = ef_search or settings.hnsw_ef_search
+    probes = probes or settings.ivfflat_probes
+    if ef_search:
+        params["hnsw.ef_search"] = str(int(ef_search))
+    if settings.hnsw_iterative_scan:
+        params["hnsw.iterative_scan"] = settings.hnsw_iterative_scan
+    if probes:
+        params["ivfflat.probes"] = str(int(probes))
+    if _rerank_candidates():
+        # An HNSW scan returns at most ef_search rows
+        ef_search = max(_rerank_candidates(), int(ef_search or 0))
+        params["hnsw.ef_search"] = str(min(ef_search, HNSW_MAX_EF_SEARCH))
+    return params
+
+
+async def _apply_search_params(db: AsyncSession, params: dict[str, str]) -> None:
+    """Apply search parameters to the current transaction (like SET LOCAL).
+
+    Issued as one ``SELECT set_config(...)`` so every tier query in the
+    transaction sees them at the cost of a single extra round trip.
+    """
+    if not params:
+        return
+    await db.execute(select(*(func.set_config(name, value, True) for name, value in params.items())))
 
-async def _search_with_filters(
-    db: AsyncSession,
-    query_embedding: list[float],
+
+def _area_condition(area: str):
+    """Build the area predicate; both forms can use idx_properties_area_trgm.
+
+    In "trigram" mode (``settings.area_match_mode``) misspelt areas such as
+    "koramangla" also match via word similarity, using the threshold set by
+    ``_search_params``.
+    """
+    # Sanitize area input - remove SQL wildcards and limit length
+    safe_area = area.replace("%", "").replace("_", "")[:100]
+    condition = Property.area.ilike(f"%{safe_area}%")
+    if settings.area_match_mode == "trigram":
+        # area %> :q is "q <% area": some word of area is similar to q
+        condition = or_(condition, Property.area.op("%>")(safe_area))
+    return condition
+
+
+def _filter_conditions(
     parsed_query: ParsedQuery,
     city: str,
-    limit: int,
     use_bhk: bool = True,
     use_area: bool = True,
     use_price: bool = True,
-) -> list[Property]:
-    """Execute search with specified filters."""
+    use_amenities: bool = True,
+) -> list:
+    """Build the SQL filter conditions for one relaxation tier."""
 
     conditions = []
 
@@ -145,34 +387,367 @@ async def _search_with_filters(
         conditions.append(Property.sqft <= parsed_query.max_sqft)
 
     if use_area and parsed_query.area:
-        # Sanitize area input - remove SQL wildcards and limit length
-        safe_area = parsed_query.area.replace("%", "").replace("_", "")[:100]
-        conditions.append(Property.area.ilike(f"%{safe_area}%"))
+        conditions.append(_area_condition(parsed_query.area))
+
+    if use_amenities and parsed_query.amenities:
+        # Containment check backed by the idx_properties_amenities GIN index
+        conditions.append(Property.amenities.contains(parsed_query.amenities))
+
+    return conditions
+
+
+def _sort_expression(order_by: str):
+    """Return the index-backed SQL sort key for SQL-only ordering.
+
+    "price" uses idx_properties_city_price and "price_per_sqft" uses the
+    expression index idx_properties_city_price_per_sqft.
+    """
+    if order_by == "price_per_sqft":
+        return PRICE_PER_SQFT
+    return Property.price_lakhs
+
+
+def _ranking_expression(query_embedding):
+    """Return the ORDER BY key: vector distance, or the SQL sort without an embedding.
+
+    With ``settings.vector_precision="halfvec"`` the distance is computed on
+    half-precision casts of both vectors, matching the halfvec expression
+    index created by ``scripts/manage_indexes.py create --precision halfvec``.
+    Binary codes are only used to pick candidates (``_vector_ranking``), so
+    "binary" precision ranks by the float32 distance here.
+    """
+    if query_embedding is None:
+        return _sort_expression(settings.sql_search_order)
+    if settings.vector_precision == "halfvec":
+        return _halfvec_distance(query_embedding)
+    return Property.embedding.cosine_distance(query_embedding)
+
+
+def _halfvec_distance(query_vector):
+    return cast(Property.embedding, HALFVEC(768)).cosine_distance(cast(query_vector, HALFVEC(768)))
+
+
+def _hamming_distance(query_vector):
+    """Hamming distance between the stored binary codes and the query's sign bits."""
+    return Property.embedding_bits.hamming_distance(func.binary_quantize(query_vector))
+
+
+def _rerank_candidates() -> int:
+    """Number of first-stage candidates re-ranked at full precision (0 = no re-rank stage).
+
+    Binary codes are always re-ranked: Hamming distances are too coarse to
+    order results by.
+    """
+    if settings.vector_precision == "halfvec":
+        return max(0, int(settings.vector_rerank_candidates))
+    if settings.vector_precision == "binary":
+        return max(1, int(settings.vector_binary_candidates))
+    return 0
+
+
+def _vector_ranking(conditions: list, query_vector, min_candidates: int = 0, skipped: int = 0) -> tuple:
+    """Return the (rank, conditions) of a query ranked by ``query_vector``.
+
+    When a re-rank stage is configured (``_rerank_candidates``), a quantized
+    distance (halfvec, or Hamming over ``embedding_bits`` in "binary"
+    precision) only picks that many candidates in an ``id IN`` subquery, and
+    the returned rank is the exact float32 distance, computed for the
+    candidates alone. Results are then limited to those candidates.
+
+    ``min_candidates`` raises the candidate count for callers that read more
+    rows at once; keyset continuations pass the rows already returned as
+    ``skipped`` so the candidate window extends past the cursor.
+    """
+    rank = _ranking_expression(query_vector)
+    candidates = _rerank_candidates()
+    if query_vector is None or not candidates:
+        return rank, conditions
+    candidates = max(candidates, min_candidates) + max(0, skipped)
+
+    if settings.vector_precision == "binary":
+        first_stage_rank = _hamming_distance(query_vector)
+    else:
+        first_stage_rank = _halfvec_distance(query_vector)
+
+    first_stage = select(Property.id)
+    if conditions:
+        first_stage = first_stage.where(and_(*conditions))
+    # Distance only, so the ANN index can serve the ordering
+    first_stage = first_stage.order_by(first_stage_rank).limit(candidates)
+    return (
+        Property.embedding.cosine_distance(query_vector),
+        [*conditions, Property.id.in_(first_stage.scalar_subquery())],
+    )
+
+
+def _after_anchor(stmt, rank, after_id: UUID):
+    """Restrict ``stmt`` to rows after the anchor property in ``ORDER BY rank, id`` order.
+
+    The anchor's rank is recomputed in a one-row subquery (a primary key
+    lookup) joined to the statement, so a cursor only needs the anchor id.
+    NULL ranks sort last, as in Postgres' default ascending order.
+    """
+    anchor = select(rank.label("rank")).where(Property.id == after_id).subquery("anchor")
+    return stmt.join(anchor, true()).where(or_(
+        and_(anchor.c.rank.is_(None), rank.is_(None), Property.id > after_id),
+        and_(
+            anchor.c.rank.is_not(None),
+            or_(
+                rank > anchor.c.rank,
+                and_(rank == anchor.c.rank, Property.id > after_id),
+                rank.is_(None),
+            ),
+        ),
+    ))
+
+
+async def _search_with_filters(
+    db: AsyncSession,
+    query_embedding: list[float] | None,
+    parsed_query: ParsedQuery,
+    city: str,
+    limit: int,
+    use_bhk: bool = True,
+    use_area: bool = True,
+    use_price: bool = True,
+    use_amenities: bool = True,
+    after_id: UUID | None = None,
+    skipped: int = 0,
+) -> list[Property]:
+    """Execute search with specified filters.
+
+    Orders by vector similarity, or by the SQL-only sort when
+    ``query_embedding`` is None. With ``after_id`` only rows ranked after
+    that property are returned (keyset pagination); ``skipped`` is how many
+    results earlier pages returned. See ``_vector_ranking`` for the optional
+    full-precision re-rank stage.
+    """
+
+    query_vector = None
+    if query_embedding is not None:
+        query_vector = bindparam("query_embedding", query_embedding, type_=Vector(768))
+
+    conditions = _filter_conditions(parsed_query, city, use_bhk, use_area, use_price, use_amenities)
+    rank, conditions = _vector_ranking(conditions, query_vector, skipped=skipped)
 
-    # Build query with vector similarity ordering
     stmt = select(Property)
 
     if conditions:
         stmt = stmt.where(and_(*conditions))
 
-    stmt = stmt.order_by(Property.embedding.cosine_distance(query_embedding)).limit(limit)
+    if after_id is not None:
+        stmt = _after_anchor(stmt, rank, after_id)
 
-    result = await db.execute(stmt)
-    properties = list(result.scalars().all())
-    return deduplicate_properties(properties)
+    if query_vector is not None:
+        return await _fetch_unique(db, stmt, limit, vector_rank=rank)
 
+    stmt = stmt.order_by(rank, Property.id)
+    return await _fetch_unique(db, stmt, limit)
 
-async def filter_search(
+
+async def _search_ladder_single_statement(
+    db: AsyncSession,
+    query_embedding: list[float] | None,
+    parsed_query: ParsedQuery,
+    city: str,
+    limit: int,
+    tiers: list[_Tier],
+) -> SearchResult:
+    """Evaluate every relaxation tier in one statement.
+
+    Each tier becomes a ``UNION ALL`` branch ranked by vector distance (or the
+    SQL-only sort) as in ``_search_with_filters``, including any re-rank
+    stage; the outer query keeps only the rows of the lowest-numbered
+    non-empty tier. The embedding is bound once and shared by all branches.
+    """
+
+    query_vector = None
+    if query_embedding is not None:
+        query_vector = bindparam("query_embedding", query_embedding, type_=Vector(768))
+
+    for fetch in _overfetch_windows(limit):
+        branches = []
+        for i, tier in enumerate(tiers):
+            conditions = _filter_conditions(
+                parsed_query, city, tier.use_bhk, tier.use_area, tier.use_price,
+                tier.use_amenities,
+            )
+            rank, conditions = _vector_ranking(conditions, query_vector)
+            branch = select(
+                Property.id.label("id"),
+                literal(i).label("tier"),
+                rank.label("rank"),
+            )
+            if conditions:
+                branch = branch.where(and_(*conditions))
+            # Vector branches order by distance only so the ANN index applies;
+            # the outer query breaks ties by id
+            order = (rank,) if query_vector is not None else (rank, Property.id)
+            branches.append(branch.order_by(*order).limit(fetch))
+
+        ranked = union_all(*branches).cte("ranked")
+        winning_tier = select(func.min(ranked.c.tier)).scalar_subquery()
+
+        stmt = (
+            select(Property, ranked.c.tier)
+            .join(ranked, Property.id == ranked.c.id)
+            .where(ranked.c.tier == winning_tier)
+            .order_by(ranked.c.rank, ranked.c.id)
+        )
+
+        result = await db.execute(stmt)
+        rows = result.all()
+        properties = deduplicate_properties([row[0] for row in rows])
+        # A short winning tier cannot grow with a larger window
+        if len(properties) >= limit or len(rows) < fetch:
+            break
+
+    if not rows:
+        last = tiers[-1]
+        return SearchResult([], last.match_type, last.relaxed_filters)
+
+    tier = tiers[rows[0].tier]
+    return SearchResult(properties[:limit], tier.match_type, tier.relaxed_filters)
+
+
+async def _search_ladder_candidates(
     db: AsyncSession,
+    query_embedding: list[float] | None,
+    parsed_query: ParsedQuery,
+    city: str,
+    limit: int,
+    tiers: list[_Tier],
+    pool: int,
+) -> SearchResult:
+    """Fetch the top ``pool`` candidates once and evaluate the ladder in NumPy.
+
+    Only the filters shared by every tier (city, sqft) are applied in SQL;
+    BHK, price and amenity matches become boolean vectors over the candidate
+    set, and the area predicate is returned by the query as a column so the
+    configured ``area_match_mode`` still applies. One query replaces up to
+    one per tier.
+
+    Approximate when the city has more than ``pool`` rows: a tier only sees
+    its rows within the overall top ``pool``, so a strict tier whose best
+    matches rank lower falls through to a relaxed one, and pages may be short.
+    A re-rank stage (``_vector_ranking``) picks at least ``pool`` candidates.
+    """
+    from app.core.memory_index import THREAD_OFFLOAD_ROWS, PropertyColumns, search_tiers
+
+    query_vector = None
+    if query_embedding is not None:
+        query_vector = bindparam("query_embedding", query_embedding, type_=Vector(768))
+
+    conditions = _filter_conditions(
+        parsed_query, city, use_bhk=False, use_area=False, use_price=False, use_amenities=False,
+    )
+    rank, conditions = _vector_ranking(conditions, query_vector, min_candidates=pool)
+
+    columns = [Property, rank.label("rank")]
+    if parsed_query.area:
+        columns.append(_area_condition(parsed_query.area).label("area_match"))
+
+    stmt = select(*columns)
+    if conditions:
+        stmt = stmt.where(and_(*conditions))
+    # Distance only so the ANN index applies; ties are broken by the id sort below
+    order = (rank,) if query_vector is not None else (rank, Property.id)
+    stmt = stmt.order_by(*order).limit(pool)
+
+    result = await db.execute(stmt)
+    # PropertyColumns keeps rows in id order; sort first so the rank and area
+    # columns line up with it
+    rows = sorted(result.all(), key=lambda row: row[0].id)
+    if not rows:
+        last = tiers[-1]
+        return SearchResult([], last.match_type, last.relaxed_filters)
+
+    def rerank() -> SearchResult:
+        candidates = PropertyColumns([row[0] for row in rows])
+        ranks = np.array([float(row.rank) if row.rank is not None else np.inf for row in rows])
+        area_match = None
+        if parsed_query.area:
+            area_match = np.array([bool(row.area_match) for row in rows], dtype=bool)
+        return search_tiers(candidates, parsed_query, limit, ranks, tiers, area_match)
+
+    if len(rows) > THREAD_OFFLOAD_ROWS:
+        return await asyncio.to_thread(rerank)
+    return rerank()
+
+
+async def _search_ladder_parallel(
+    query_embedding: list[float] | None,
+    parsed_query: ParsedQuery,
+    city: str,
+    limit: int,
+    tiers: list[_Tier],
+    max_connections: int,
+    search_params: dict[str, str] | None = None,
+) -> SearchResult:
+    """Evaluate relaxation tiers speculatively on concurrent sessions.
+
+    Each tier runs on its own session from ``async_session``, with at most
+    ``max_connections`` checked out at once so a single search cannot drain
+    the pool. As soon as a tier returns rows every lower-priority tier is
+    cancelled; the result is decided once all higher-priority tiers have
+    come back empty. A failing tier only fails the search when its result is
+    needed, and every task has finished (releasing its session) on return.
+    """
+
+    semaphore = asyncio.Semaphore(max(1, max_connections))
+
+    async def run_tier(tier: _Tier) -> list[Property]:
+        async with semaphore:
+            async with async_session() as session:
+                await _apply_search_params(session, search_params or {})
+                return await _search_with_filters(
+                    session, query_embedding, parsed_query, city, limit,
+                    use_bhk=tier.use_bhk, use_area=tier.use_area, use_price=tier.use_price,
+                    use_amenities=tier.use_amenities,
+                )
+
+    tasks = [asyncio.create_task(run_tier(tier)) for tier in tiers]
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                if not task.cancelled() and task.exception() is None and task.result():
+                    for later in tasks[tasks.index(task) + 1:]:
+                        later.cancel()
+
+            # The first tier in priority order that is not known to be empty wins
+            for tier, task in zip(tiers, tasks):
+                if not task.done():
+                    break
+                if task.cancelled():
+                    continue
+                if task.exception() is not None:
+                    raise task.exception()
+                if task.result():
+                    return SearchResult(task.result(), tier.match_type, tier.relaxed_filters)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Let cancelled tiers unwind their sessions; their errors are not needed
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    last = tiers[-1]
+    return SearchResult([], last.match_type, last.relaxed_filters)
+
+
+def _explicit_filter_conditions(
     city: str,
     bhk: int | None = None,
     min_price: float | None = None,
     max_price: float | None = None,
     area: str | None = None,
-    limit: int = 10,
-) -> list[Property]:
-    """Perform SQL-only filter search without vector similarity."""
-
+    min_sqft: int | None = None,
+    max_sqft: int | None = None,
+    amenities: list[str] | None = None,
+) -> list:
+    """Build the SQL conditions for explicitly given filters (``filter_search`` semantics)."""
     conditions = []
 
     # Only filter by city if specified
@@ -185,18 +760,54 @@ async def filter_search(
         conditions.append(Property.price_lakhs >= min_price)
     if max_price:
         conditions.append(Property.price_lakhs <= max_price)
+    if min_sqft:
+        conditions.append(Property.sqft >= min_sqft)
+    if max_sqft:
+        conditions.append(Property.sqft <= max_sqft)
     if area:
-        # Sanitize area input - remove SQL wildcards and limit length
-        safe_area = area.replace("%", "").replace("_", "")[:100]
-        conditions.append(Property.area.ilike(f"%{safe_area}%"))
+        conditions.append(_area_condition(area))
+    if amenities:
+        conditions.append(Property.amenities.contains(normalize_amenities(amenities)))
+
+    return conditions
+
+
+async def filter_search(
+    db: AsyncSession,
+    city: str,
+    bhk: int | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    area: str | None = None,
+    limit: int = 10,
+    min_sqft: int | None = None,
+    max_sqft: int | None = None,
+    order_by: str = "price",
+    amenities: list[str] | None = None,
+    after_id: UUID | None = None,
+) -> list[Property]:
+    """Perform SQL-only filter search without vector similarity.
+
+    ``order_by`` is "price" or "price_per_sqft"; both sorts are index-backed.
+    ``after_id`` continues after that property on (sort key, id).
+    """
+
+    await _apply_search_params(db, _search_params(None, None, None, area))
+
+    conditions = _explicit_filter_conditions(
+        city, bhk, min_price, max_price, area, min_sqft, max_sqft, amenities,
+    )
+
+    sort_key = _sort_expression(order_by)
 
     stmt = select(Property)
 
     if conditions:
         stmt = stmt.where(and_(*conditions))
 
-    stmt = stmt.order_by(Property.price_lakhs).limit(limit)
+    if after_id is not None:
+        stmt = _after_anchor(stmt, sort_key, after_id)
 
-    result = await db.execute(stmt)
-    properties = list(result.scalars().all())
-    return deduplicate_properties(properties)
+    stmt = stmt.order_by(sort_key, Property.id)
+
+    return await _fetch_unique(db, stmt, limit)
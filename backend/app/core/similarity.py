@@ -0,0 +1,89 @@
+"""Embedding-similarity queries: similar listings and exact top-k ids."""
+from uuid import UUID
+
+from sqlalchemy import select, and_, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from pgvector.sqlalchemy import Vector
+
+from app.models.property import Property
+from app.core.search_engine import (
+    _apply_search_params, _fetch_unique, _search_params, _vector_ranking, deduplicate_properties,
+)
+
+
+async def similar_properties(
+    db: AsyncSession,
+    source: Property,
+    limit: int = 10,
+    same_city: bool = True,
+    same_bhk: bool = False,
+) -> list[Property]:
+    """Rank properties by cosine distance to ``source``'s stored embedding.
+
+    ``source`` must be loaded with its embedding (``get_property_by_id(...,
+    with_embedding=True)``); the stored vector is the query, so no embedding
+    is generated. The source itself and listings duplicating it are
+    excluded. Returns [] when the source has no embedding yet.
+    """
+    if source.embedding is None:
+        return []
+
+    await _apply_search_params(db, _search_params(source.embedding, None, None))
+
+    query_vector = bindparam("query_embedding", source.embedding, type_=Vector(768))
+    conditions = [Property.id != source.id, Property.embedding.isnot(None)]
+    if same_city:
+        conditions.append(Property.city == source.city)
+    if same_bhk and source.bhk is not None:
+        conditions.append(Property.bhk == source.bhk)
+
+    rank, conditions = _vector_ranking(conditions, query_vector)
+
+    stmt = select(Property).where(and_(*conditions))
+    candidates = await _fetch_unique(db, stmt, limit + 1, vector_rank=rank)
+    # Deduplicating with the source first also drops copies of the source listing
+    return deduplicate_properties([source, *candidates])[1:limit + 1]
+
+
+async def precomputed_similar_properties(
+    db: AsyncSession,
+    source: Property,
+    neighbor_ids: list[UUID],
+    limit: int = 10,
+) -> list[Property]:
+    """Load precomputed neighbours (``scripts/build_neighbors.py``) in stored order.
+
+    Neighbours deleted since the build are skipped; duplicates are removed as
+    in ``similar_properties``.
+    """
+    if not neighbor_ids:
+        return []
+    result = await db.execute(select(Property).where(Property.id.in_(neighbor_ids)))
+    by_id = {prop.id: prop for prop in result.scalars().all()}
+    neighbors = [by_id[pid] for pid in neighbor_ids if pid in by_id]
+    return deduplicate_properties([source, *neighbors])[1:limit + 1]
+
+
+async def vector_top_k_ids(
+    db: AsyncSession,
+    query_embedding: list[float],
+    city: str,
+    k: int = 10,
+) -> list[UUID]:
+    """Return the ids of the ``k`` properties nearest to ``query_embedding`` in ``city``.
+
+    Ranked exactly as search tiers are under the configured
+    ``settings.vector_precision`` and re-rank stage, without filters or
+    deduplication; used by ``scripts/benchmark_vector_recall.py``.
+    """
+    await _apply_search_params(db, _search_params(query_embedding, None, None))
+
+    query_vector = bindparam("query_embedding", query_embedding, type_=Vector(768))
+    conditions = [Property.city == city, Property.embedding.isnot(None)]
+    rank, conditions = _vector_ranking(conditions, query_vector)
+
+    window = (
+        select(Property.id, rank.label("rank")).where(and_(*conditions)).order_by(rank).limit(k).subquery("ranked")
+    )
+    result = await db.execute(select(window.c.id).order_by(window.c.rank, window.c.id))
+    return list(result.scalars().all())
@@ -0,0 +1,208 @@
+"""ANN index management for Property.embedding.
+
+pgvector supports two approximate index types:
+- HNSW: better recall/latency trade-off, no training step, slower to build
+- IVFFlat: faster to build, but its ``lists`` centroids are trained on the
+  rows present at build time, so it must be rebuilt after bulk loads
+
+Either can index the float32 column directly ("vector" precision), a
+half-precision cast of it ("halfvec"), which halves the index size, or the
+binary codes in ``embedding_bits`` by Hamming distance ("binary"); each
+matches the ``settings.vector_precision`` of the same name.
+
+Indexes are created with CREATE INDEX CONCURRENTLY, which cannot run inside
+a transaction block; pass a connection opened with
+``isolation_level="AUTOCOMMIT"``.
+"""
+import logging
+import math
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+VECTOR_INDEX_METHODS = ("hnsw", "ivfflat")
+VECTOR_INDEX_PRECISIONS = ("vector", "halfvec", "binary")
+VECTOR_INDEX_PREFIX = "idx_properties_embedding"
+_REBUILD_SUFFIX = "__rebuild"  # Never parses as a city partition
+
+# Indexed expression and operator class per precision; the halfvec expression
+# must match the ORDER BY of search_engine._ranking_expression
+_INDEX_COLUMNS = {
+    "vector": "embedding vector_cosine_ops",
+    "halfvec": "(embedding::halfvec(768)) halfvec_cosine_ops",
+    "binary": "embedding_bits bit_hamming_ops",
+}
+_PRECISION_INFIXES = {"vector": "", "halfvec": "half_", "binary": "bits_"}
+
+_CITY_PATTERN = re.compile(r"^[a-z]+$")
+_INDEX_NAME_PATTERN = re.compile(rf"^{VECTOR_INDEX_PREFIX}_(half_|bits_)?(hnsw|ivfflat)(?:_([a-z]+))?$")
+
+
+def ivfflat_lists(row_count: int) -> int:
+    """Pick the IVFFlat ``lists`` parameter from the number of indexed rows.
+
+    Follows the pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) above.
+    """
+    if row_count <= 1_000_000:
+        return max(1, row_count // 1000)
+    return int(math.sqrt(row_count))
+
+
+def vector_index_name(method: str, city: str | None = None, precision: str = "vector") -> str:
+    """Return the managed index name for a method, optional city partition and precision."""
+    _validate(method, city, precision)
+    name = f"{VECTOR_INDEX_PREFIX}_{_PRECISION_INFIXES[precision]}{method}"
+    return f"{name}_{city}" if city else name
+
+
+def parse_vector_index_name(name: str) -> tuple[str, str | None] | None:
+    """Return (method, city) for a managed index name, or None if unmanaged."""
+    match = _INDEX_NAME_PATTERN.match(name)
+    if not match:
+        return None
+    return match.group(2), match.group(3)
+
+
+def vector_index_precision(name: str) -> str:
+    """Return the precision ("vector", "halfvec" or "binary") of a managed index name."""
+    match = _INDEX_NAME_PATTERN.match(name.removesuffix(_REBUILD_SUFFIX))
+    infix = (match.group(1) if match else None) or ""
+    return next(precision for precision, value in _PRECISION_INFIXES.items() if value == infix)
+
+
+def create_vector_index_sql(
+    method: str,
+    city: str | None = None,
+    lists: int | None = None,
+    m: int = 16,
+    ef_construction: int = 64,
+    name: str | None = None,
+    precision: str = "vector",
+) -> str:
+    """Build the CREATE INDEX CONCURRENTLY statement for a vector index."""
+    _validate(method, city, precision)
+    name = name or vector_index_name(method, city, precision)
+
+    if method == "hnsw":
+        options = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+    else:
+        options = f"lists = {int(lists or 1)}"
+
+    sql = (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON properties "
+        f"USING {method} ({_INDEX_COLUMNS[precision]}) WITH ({options})"
+    )
+    # City is validated against [a-z]+ so it is safe to inline
+    if city:
+        sql += f" WHERE city = '{city}'"
+    return sql
+
+
+async def count_embedded_rows(conn: AsyncConnection, city: str | None = None) -> int:
+    """Count rows that would be covered by a (partial) vector index."""
+    sql = "SELECT COUNT(*) FROM properties WHERE embedding IS NOT NULL"
+    params = {}
+    if city:
+        sql += " AND city = :city"
+        params["city"] = city
+    result = await conn.execute(text(sql), params)
+    return result.scalar() or 0
+
+
+async def create_vector_index(
+    conn: AsyncConnection,
+    method: str,
+    city: str | None = None,
+    lists: int | None = None,
+    m: int = 16,
+    ef_construction: int = 64,
+    name: str | None = None,
+    precision: str = "vector",
+) -> str:
+    """Create a vector index concurrently and return its name.
+
+    For IVFFlat, ``lists`` defaults to a value derived from the row count.
+    """
+    _validate(method, city, precision)
+    if method == "ivfflat" and lists is None:
+        lists = ivfflat_lists(await count_embedded_rows(conn, city))
+
+    name = name or vector_index_name(method, city, precision)
+    sql = create_vector_index_sql(method, city, lists, m, ef_construction, name, precision)
+    logger.info(f"Creating vector index: {sql}")
+    await conn.execute(text(sql))
+    return name
+
+
+async def drop_vector_index(conn: AsyncConnection, name: str) -> None:
+    """Drop a managed vector index concurrently."""
+    if parse_vector_index_name(name.removesuffix(_REBUILD_SUFFIX)) is None:
+        raise ValueError(f"Not a managed vector index: {name}")
+    await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+async def list_vector_indexes(conn: AsyncConnection) -> list[dict]:
+    """List managed vector indexes with their definitions and sizes."""
+    result = await conn.execute(text(
+        "SELECT indexname, indexdef, pg_relation_size(indexname::regclass) AS size_bytes "
+        "FROM pg_indexes WHERE tablename = 'properties' AND indexname LIKE :prefix "
+        "ORDER BY indexname"
+    ), {"prefix": f"{VECTOR_INDEX_PREFIX}_%"})
+
+    indexes = []
+    for row in result.all():
+        parsed = parse_vector_index_name(row.indexname)
+        if parsed is None:
+            continue
+        method, city = parsed
+        indexes.append({
+            "name": row.indexname,
+            "method": method,
+            "city": city,
+            "precision": vector_index_precision(row.indexname),
+            "definition": row.indexdef,
+            "size_bytes": row.size_bytes,
+        })
+    return indexes
+
+
+async def rebuild_vector_indexes(
+    conn: AsyncConnection, city: str | None = None, methods: tuple[str, ...] | None = None
+) -> list[str]:
+    """Rebuild managed vector indexes after a bulk load.
+
+    Each index is rebuilt under a temporary name and swapped in, so searches
+    keep an index while the new one builds. IVFFlat ``lists`` is recomputed
+    from the current row count. When ``city`` is given, only that city's
+    partial indexes and the unpartitioned ones are rebuilt; ``methods``
+    limits the rebuild to those index types.
+    """
+    rebuilt = []
+    for index in await list_vector_indexes(conn):
+        if city and index["city"] not in (None, city):
+            continue
+        if methods and index["method"] not in methods:
+            continue
+        name = index["name"]
+        temp_name = f"{name}{_REBUILD_SUFFIX}"
+        await drop_vector_index(conn, temp_name)
+        await create_vector_index(
+            conn, index["method"], index["city"], name=temp_name, precision=index["precision"],
+        )
+        await drop_vector_index(conn, name)
+        await conn.execute(text(f"ALTER INDEX {temp_name} RENAME TO {name}"))
+        rebuilt.append(name)
+        logger.info(f"Rebuilt vector index {name}")
+    return rebuilt
+
+
+def _validate(method: str, city: str | None, precision: str = "vector") -> None:
+    if method not in VECTOR_INDEX_METHODS:
+        raise ValueError(f"Unknown vector index method: {method}. Use one of {VECTOR_INDEX_METHODS}")
+    if precision not in VECTOR_INDEX_PRECISIONS:
+        raise ValueError(f"Unknown vector index precision: {precision}. Use one of {VECTOR_INDEX_PRECISIONS}")
+    if city is not None and not _CITY_PATTERN.match(city):
+        raise ValueError(f"Invalid city for partial index: {city}")
@@ -12,6 +12,7 @@ from app.config import get_settings
 from app.models.database import async_session
 from app.api.routes import search, properties, cities
 from app.core.exceptions import CribInfoException
+from app.core.embeddings import save_query_embedding_cache
 from app.core.error_handlers import (
     cribinfo_exception_handler,
     validation_exception_handler,
@@ -132,5 +133,6 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Log shutdown."""
+    """Persist warm caches and log shutdown."""
     logger.info("CribInfo API shutting down...")
+    save_query_embedding_cache()
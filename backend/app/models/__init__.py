@@ -1,3 +1,5 @@
 from app.models.property import Property, Base
+from app.models.data_version import DataVersion
+from app.models.property_neighbors import PropertyNeighbors, NeighborBuild
 
-__all__ = ["Property", "Base"]
+__all__ = ["Property", "Base", "DataVersion", "PropertyNeighbors", "NeighborBuild"]
@@ -0,0 +1,19 @@
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.property import Base
+
+
+class DataVersion(Base):
+    """Per-city data version, bumped whenever a city's properties change.
+
+    Caches and in-memory indexes compare versions to know when to refresh.
+    """
+    __tablename__ = "data_versions"
+
+    city: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -8,6 +8,8 @@ settings = get_settings()
 # - max_overflow: Additional connections allowed beyond pool_size
 # - pool_pre_ping: Verify connection is alive before using (handles Neon sleep)
 # - pool_recycle: Recycle connections every 5 min to handle Neon sleep cycles
+# Parallel ladder searches take up to search_max_connections sessions each,
+# so keep that well below pool_size + max_overflow.
 engine = create_async_engine(
     settings.async_database_url,
     echo=False,
@@ -1,8 +1,12 @@
 from uuid import UUID, uuid4
 from decimal import Decimal
-from sqlalchemy import String, Integer, DECIMAL, ARRAY, Text
+from sqlalchemy import String, Integer, DECIMAL, Text, Index, event, func, inspect, literal_column
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import BIT, Vector
+
+from app.core.geo import geohash_encode
+from app.core.quantization import BINARY_CODE_BITS, binary_quantize
 
 
 class Base(DeclarativeBase):
@@ -23,7 +27,16 @@ class Property(Base):
     amenities: Mapped[list[str]] = mapped_column(ARRAY(Text), nullable=True)
     latitude: Mapped[Decimal] = mapped_column(DECIMAL(10, 8), nullable=True)
     longitude: Mapped[Decimal] = mapped_column(DECIMAL(11, 8), nullable=True)
-    embedding = mapped_column(Vector(768), nullable=True)  # nomic-embed-text dimensions
+    # Geohash of latitude/longitude, kept in sync on insert/update; prunes radius
+    # searches. "C" collation so prefix ranges can use a plain btree index.
+    geohash: Mapped[str] = mapped_column(String(12, collation="C"), nullable=True)
+    # nomic-embed-text dimensions. Deferred (~3 KB per row): read paths only
+    # load it when asked to with undefer(Property.embedding), and touching it
+    # on an instance loaded without it raises instead of issuing a query.
+    embedding = mapped_column(Vector(768), nullable=True, deferred=True, deferred_raiseload=True)
+    # Sign-bit code of the embedding (96 bytes), kept in sync when the embedding
+    # is written; scanned by Hamming distance in "binary" vector precision
+    embedding_bits = mapped_column(BIT(BINARY_CODE_BITS), nullable=True, deferred=True, deferred_raiseload=True)
 
     def to_dict(self) -> dict:
         return {
@@ -39,3 +52,63 @@ class Property(Base):
             "latitude": float(self.latitude) if self.latitude else None,
             "longitude": float(self.longitude) if self.longitude else None,
         }
+
+
+@event.listens_for(Property, "before_insert")
+@event.listens_for(Property, "before_update")
+def _set_geohash(mapper, connection, target: Property) -> None:
+    if target.latitude is not None and target.longitude is not None:
+        target.geohash = geohash_encode(float(target.latitude), float(target.longitude))
+    else:
+        target.geohash = None
+
+
+@event.listens_for(Property, "before_insert")
+@event.listens_for(Property, "before_update")
+def _set_embedding_bits(mapper, connection, target: Property) -> None:
+    # Only when the embedding was assigned: reading an unloaded (deferred)
+    # embedding would raise
+    if not inspect(target).attrs.embedding.history.has_changes():
+        return
+    target.embedding_bits = binary_quantize(target.embedding) if target.embedding is not None else None
+
+
+# Default ANN index for vector search; see scripts/manage_indexes.py for
+# IVFFlat, per-city partial indexes and rebuilds
+Index(
+    "idx_properties_embedding_hnsw",
+    Property.embedding,
+    postgresql_using="hnsw",
+    postgresql_ops={"embedding": "vector_cosine_ops"},
+)
+
+# Substring/similarity area matching (ILIKE '%x%' cannot use a btree index)
+Index(
+    "idx_properties_area_trgm",
+    Property.area,
+    postgresql_using="gin",
+    postgresql_ops={"area": "gin_trgm_ops"},
+)
+
+# Amenity containment filters (amenities @> ARRAY[...])
+Index("idx_properties_amenities", Property.amenities, postgresql_using="gin")
+
+# Map viewport (bounding box) searches; the included columns let the common
+# filters be checked in the index before visiting the table
+Index(
+    "idx_properties_lat_lng",
+    Property.latitude,
+    Property.longitude,
+    postgresql_include=["city", "bhk", "price_lakhs", "sqft"],
+)
+
+# Geohash prefix ranges (geohash >= 'tdr1' AND geohash < 'tdr1~') for radius searches
+Index("idx_properties_geohash", Property.geohash)
+
+# Price per sqft sort key. The 0 is inlined: a bound parameter would not match
+# the index expression under generic (prepared statement) plans
+PRICE_PER_SQFT = Property.price_lakhs / func.nullif(Property.sqft, literal_column("0"))
+
+# Index-backed sorts for SQL-only search (embedding_provider="none")
+Index("idx_properties_city_price", Property.city, Property.price_lakhs, Property.id)
+Index("idx_properties_city_price_per_sqft", Property.city, PRICE_PER_SQFT, Property.id)
@@ -0,0 +1,34 @@
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import ARRAY, REAL, String, Integer, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.property import Base
+
+
+class PropertyNeighbors(Base):
+    """Precomputed nearest neighbours of a property within its city.
+
+    Written by ``scripts/build_neighbors.py``; ``neighbor_ids`` are ordered
+    most similar first with their cosine ``distances`` alongside. Rows go
+    away with their property (ON DELETE CASCADE), e.g. when a city is reloaded.
+    """
+    __tablename__ = "property_neighbors"
+
+    property_id: Mapped[UUID] = mapped_column(
+        ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True
+    )
+    neighbor_ids: Mapped[list[UUID]] = mapped_column(ARRAY(PG_UUID(as_uuid=True)), nullable=False)
+    distances: Mapped[list[float]] = mapped_column(ARRAY(REAL), nullable=False)
+
+
+class NeighborBuild(Base):
+    """Data version each city's neighbours were last computed from."""
+    __tablename__ = "neighbor_builds"
+
+    city: Mapped[str] = mapped_column(String(50), primary_key=True)
+    data_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    built_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
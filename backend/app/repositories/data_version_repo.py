@@ -0,0 +1,26 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.data_version import DataVersion
+
+
+async def get_data_versions(db: AsyncSession) -> dict[str, int]:
+    result = await db.execute(select(DataVersion.city, DataVersion.version))
+    return {row.city: row.version for row in result.all()}
+
+
+async def bump_data_version(db: AsyncSession, city: str) -> int:
+    stmt = (
+        insert(DataVersion)
+        .values(city=city, version=1)
+        .on_conflict_do_update(
+            index_elements=[DataVersion.city],
+            set_={"version": DataVersion.version + 1, "updated_at": func.now()},
+        )
+        .returning(DataVersion.version)
+    )
+    result = await db.execute(stmt)
+    version = result.scalar_one()
+    await db.commit()
+    return version
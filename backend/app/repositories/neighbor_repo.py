@@ -0,0 +1,58 @@
+from uuid import UUID
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.property import Property
+from app.models.property_neighbors import PropertyNeighbors, NeighborBuild
+
+# Rows per INSERT when writing a city's neighbours
+WRITE_BATCH_SIZE = 1000
+
+
+async def get_neighbors(db: AsyncSession, property_id: UUID):
+    """Return a property's precomputed neighbours, or None if there are none.
+
+    The row carries ``neighbor_ids`` plus the ``city`` and ``data_version``
+    of the build they came from.
+    """
+    result = await db.execute(
+        select(PropertyNeighbors.neighbor_ids, NeighborBuild.city, NeighborBuild.data_version)
+        .join(Property, Property.id == PropertyNeighbors.property_id)
+        .join(NeighborBuild, NeighborBuild.city == Property.city)
+        .where(PropertyNeighbors.property_id == property_id)
+    )
+    return result.one_or_none()
+
+
+async def get_neighbor_build_versions(db: AsyncSession) -> dict[str, int]:
+    result = await db.execute(select(NeighborBuild.city, NeighborBuild.data_version))
+    return {row.city: row.data_version for row in result.all()}
+
+
+async def replace_city_neighbors(
+    db: AsyncSession,
+    city: str,
+    data_version: int,
+    rows: list[dict],
+) -> None:
+    """Replace a city's neighbour rows and record the data version they were built from.
+
+    ``rows`` are ``{"property_id", "neighbor_ids", "distances"}`` dicts.
+    Everything is written in one transaction, so readers see either the old
+    or the new neighbours.
+    """
+    city_ids = select(Property.id).where(Property.city == city)
+    await db.execute(delete(PropertyNeighbors).where(PropertyNeighbors.property_id.in_(city_ids)))
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        await db.execute(insert(PropertyNeighbors), rows[start:start + WRITE_BATCH_SIZE])
+
+    await db.execute(
+        insert(NeighborBuild)
+        .values(city=city, data_version=data_version)
+        .on_conflict_do_update(
+            index_elements=[NeighborBuild.city],
+            set_={"data_version": data_version, "built_at": func.now()},
+        )
+    )
+    await db.commit()
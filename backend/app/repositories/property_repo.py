@@ -1,12 +1,22 @@
 from uuid import UUID
-from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, bindparam
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import undefer
+
+from pgvector.sqlalchemy import BIT
 
 from app.models.property import Property
+from app.core.geo import geohash_encode
+from app.core.quantization import BINARY_CODE_BITS, binary_quantize
 
 
-async def get_property_by_id(db: AsyncSession, property_id: UUID) -> Property | None:
-    result = await db.execute(select(Property).where(Property.id == property_id))
+async def get_property_by_id(
+    db: AsyncSession, property_id: UUID, with_embedding: bool = False
+) -> Property | None:
+    stmt = select(Property).where(Property.id == property_id)
+    if with_embedding:
+        stmt = stmt.options(undefer(Property.embedding))
+    result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
 
@@ -44,3 +54,60 @@ async def update_property_embedding(db: AsyncSession, property_id: UUID, embeddi
     if property_obj:
         property_obj.embedding = embedding
         await db.commit()
+
+
+async def backfill_geohashes(db: AsyncSession | AsyncConnection) -> int:
+    """Set the geohash of rows that have coordinates but none yet; returns the count.
+
+    The caller commits.
+    """
+    result = await db.execute(
+        select(Property.id, Property.latitude, Property.longitude)
+        .where(Property.geohash.is_(None))
+        .where(Property.latitude.isnot(None))
+        .where(Property.longitude.isnot(None))
+    )
+    rows = [
+        {"row_id": row.id, "row_geohash": geohash_encode(float(row.latitude), float(row.longitude))}
+        for row in result.all()
+    ]
+    if rows:
+        table = Property.__table__
+        await db.execute(
+            table.update().where(table.c.id == bindparam("row_id")).values(geohash=bindparam("row_geohash")),
+            rows,
+        )
+    return len(rows)
+
+
+async def backfill_embedding_bits(
+    db: AsyncSession | AsyncConnection, city: str | None = None, batch_size: int = 1000
+) -> int:
+    """Set the binary code of embedded rows (in ``city``, if given) that have none yet.
+
+    Reads embeddings ``batch_size`` rows at a time and returns the number of
+    rows updated. The caller commits.
+    """
+    table = Property.__table__
+    stmt = (
+        table.update()
+        .where(table.c.id == bindparam("row_id"))
+        .values(embedding_bits=bindparam("row_bits", type_=BIT(BINARY_CODE_BITS)))
+    )
+    pending = (
+        select(Property.id, Property.embedding)
+        .where(Property.embedding_bits.is_(None))
+        .where(Property.embedding.isnot(None))
+        .limit(batch_size)
+    )
+    if city:
+        pending = pending.where(Property.city == city)
+
+    updated = 0
+    while True:
+        result = await db.execute(pending)
+        rows = [{"row_id": row.id, "row_bits": binary_quantize(row.embedding)} for row in result.all()]
+        if not rows:
+            return updated
+        await db.execute(stmt, rows)
+        updated += len(rows)
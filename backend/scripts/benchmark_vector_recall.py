@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Measure recall@k and latency of vector ranking modes against exact search.
+
+Modes are "vector" (float32), "halfvec[:re-rank candidates]" and
+"binary[:Hamming candidates]" (see VECTOR_PRECISION in .env.example). Binary
+modes need the embedding_bits codes kept by scripts/generate_embeddings.py.
+
+Stored embeddings of randomly sampled properties are used as queries. Exact
+top-k neighbours are computed in NumPy from the city's float32 embeddings;
+each mode then answers the same queries in Postgres through the same
+ranking search tiers use.
+
+Usage:
+    python scripts/benchmark_vector_recall.py --city bangalore
+    python scripts/benchmark_vector_recall.py --city bangalore --modes halfvec:0,halfvec:200
+    python scripts/benchmark_vector_recall.py --city bangalore --modes binary:100,binary:400,binary:1000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from sqlalchemy import select
+from app.config import get_settings
+from app.models.database import async_session, engine
+from app.models.property import Property
+from app.core.neighbors import normalize_rows, recall_at_k
+from app.core.similarity import vector_top_k_ids
+from app.core.vector_index import list_vector_indexes
+
+settings = get_settings()
+
+# precision[:candidates]; halfvec candidates of 0 rank by the halfvec distance alone
+DEFAULT_MODES = "vector,halfvec:0,halfvec:100,binary:400"
+
+
+def apply_mode(mode: str, defaults: dict) -> None:
+    """Configure the search settings for a "precision[:candidates]" mode."""
+    precision, _, candidates = mode.partition(":")
+    settings.vector_precision = precision
+    settings.vector_rerank_candidates = defaults["vector_rerank_candidates"]
+    settings.vector_binary_candidates = defaults["vector_binary_candidates"]
+    if candidates and precision == "binary":
+        settings.vector_binary_candidates = int(candidates)
+    elif candidates:
+        settings.vector_rerank_candidates = int(candidates)
+
+
+async def load_city(city: str) -> tuple[list, np.ndarray]:
+    """Load a city's property ids and normalized embeddings, ordered by id."""
+    async with async_session() as db:
+        result = await db.execute(
+            select(Property.id, Property.embedding)
+            .where(Property.city == city)
+            .where(Property.embedding.isnot(None))
+            .order_by(Property.id)
+        )
+        rows = result.all()
+    ids = [row.id for row in rows]
+    matrix = normalize_rows(np.stack([np.asarray(row.embedding, dtype=np.float32) for row in rows]))
+    return ids, matrix
+
+
+async def run_mode(city: str, queries: np.ndarray, k: int) -> tuple[list[list], list[float]]:
+    """Answer every query with the current settings; return ids and latencies (ms)."""
+    answers = []
+    latencies = []
+    async with async_session() as db:
+        for query in queries:
+            started = time.perf_counter()
+            answers.append(await vector_top_k_ids(db, query.tolist(), city, k))
+            latencies.append((time.perf_counter() - started) * 1000)
+            # End the transaction so per-search parameters do not leak
+            await db.rollback()
+    return answers, latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector ranking recall against exact search")
+    parser.add_argument("--city", required=True, help="City name (e.g., bangalore)")
+    parser.add_argument("--queries", type=int, default=100, help="Number of sampled query properties")
+    parser.add_argument("--k", type=int, default=10, help="Results compared per query")
+    parser.add_argument("--modes", default=DEFAULT_MODES,
+                        help="Comma-separated precision[:candidates] modes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ids, matrix = await load_city(args.city)
+    if len(ids) <= args.k:
+        print(f"Not enough embedded properties in {args.city} ({len(ids)})")
+        return
+
+    rng = np.random.default_rng(args.seed)
+    sample = rng.choice(len(ids), size=min(args.queries, len(ids)), replace=False)
+    queries = matrix[sample]
+
+    # Exact ground truth: ORDER BY distance, id (rows are in id order)
+    similarity = queries @ matrix.T
+    exact = [[ids[j] for j in np.argsort(-row, kind="stable")[:args.k]] for row in similarity]
+
+    async with engine.connect() as conn:
+        for index in await list_vector_indexes(conn):
+            print(f"{index['name']}: {index['precision']}, {index['size_bytes'] / 1024:.0f} KB")
+
+    print(f"\n{len(queries)} queries over {len(ids)} properties in {args.city}, k={args.k}")
+    print(f"{'mode':<16} {'recall@k':>9} {'mean ms':>9} {'p95 ms':>9}")
+    defaults = {
+        "vector_rerank_candidates": settings.vector_rerank_candidates,
+        "vector_binary_candidates": settings.vector_binary_candidates,
+    }
+    for mode in args.modes.split(","):
+        apply_mode(mode, defaults)
+        answers, latencies = await run_mode(args.city, queries, args.k)
+        recall = np.mean([recall_at_k(e, a, args.k) for e, a in zip(exact, answers)])
+        print(f"{mode:<16} {recall:>9.3f} {np.mean(latencies):>9.1f} {np.percentile(latencies, 95):>9.1f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Precompute the nearest neighbours of every property for similar-property lookups.
+
+Only cities whose data version changed since their last build are recomputed
+(load_data.py and generate_embeddings.py bump it); use --force to rebuild anyway.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from sqlalchemy import select, distinct, text
+from app.config import get_settings
+from app.models.database import async_session, engine
+from app.models.property import Base, Property
+from app.models.property_neighbors import PropertyNeighbors, NeighborBuild  # noqa: F401 - registers the tables for create_all
+from app.core.neighbors import DEFAULT_BLOCK_SIZE, top_k_neighbors
+from app.repositories.data_version_repo import get_data_versions
+from app.repositories.neighbor_repo import get_neighbor_build_versions, replace_city_neighbors
+
+settings = get_settings()
+
+
+async def init_tables():
+    """Create the neighbour tables if they do not exist yet."""
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def build_city_neighbors(city: str, data_version: int, k: int, block_size: int) -> int:
+    """Compute and store the neighbours of every embedded property in a city."""
+    async with async_session() as db:
+        result = await db.execute(
+            select(Property.id, Property.embedding)
+            .where(Property.city == city)
+            .where(Property.embedding.isnot(None))
+            .order_by(Property.id)
+        )
+        rows = result.all()
+        if len(rows) < 2:
+            print(f"Skipping {city}: fewer than 2 properties with embeddings")
+            return 0
+
+        ids = [row.id for row in rows]
+        embeddings = np.stack([np.asarray(row.embedding, dtype=np.float32) for row in rows])
+
+        started = time.perf_counter()
+        indices, distances = await asyncio.to_thread(top_k_neighbors, embeddings, k, block_size)
+        print(f"Computed {indices.shape[1]} neighbours for {len(ids)} properties in {city} "
+              f"({time.perf_counter() - started:.1f}s)")
+
+        await replace_city_neighbors(db, city, data_version, [
+            {
+                "property_id": ids[i],
+                "neighbor_ids": [ids[j] for j in indices[i]],
+                "distances": [round(float(d), 6) for d in distances[i]],
+            }
+            for i in range(len(ids))
+        ])
+        return len(ids)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Precompute similar-property neighbours")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--city", help="City name (e.g., bangalore)")
+    group.add_argument("--all", action="store_true", help="Build neighbours for all cities")
+    parser.add_argument("--k", type=int, default=settings.neighbors_k,
+                        help="Neighbours stored per property")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE,
+                        help="Rows per similarity block (bounds memory use)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild even if the city's data has not changed")
+    args = parser.parse_args()
+
+    await init_tables()
+
+    async with async_session() as db:
+        data_versions = await get_data_versions(db)
+        built_versions = await get_neighbor_build_versions(db)
+        if args.all:
+            result = await db.execute(select(distinct(Property.city)))
+            cities = [row[0] for row in result.fetchall()]
+        else:
+            cities = [args.city]
+
+    built = 0
+    for city in cities:
+        version = data_versions.get(city, 0)
+        if not args.force and built_versions.get(city) == version:
+            print(f"Skipping {city}: neighbours are up to date (data version {version})")
+            continue
+        print(f"\nBuilding neighbours for {city} (data version {version})...")
+        built += await build_city_neighbors(city, version, args.k, args.block_size)
+
+    print(f"\nStored neighbours for {built} properties")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
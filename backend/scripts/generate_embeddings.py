@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-"""Generate embeddings for all properties that don't have them."""
+"""Generate embeddings for all properties that don't have them.
+
+Binary embedding codes (``embedding_bits``) are set with each embedding, and
+codes missing for embeddings written before they existed are backfilled.
+"""
 
 import argparse
 import asyncio
@@ -10,9 +14,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import select
-from app.models.database import async_session
+from app.models.database import async_session, engine
 from app.models.property import Property
 from app.core.embeddings import generate_embedding, generate_property_text
+from app.core.vector_index import rebuild_vector_indexes
+from app.repositories.data_version_repo import bump_data_version
+from app.repositories.property_repo import backfill_embedding_bits
 
 
 async def generate_embeddings_for_city(city: str, batch_size: int = 50):
@@ -41,6 +48,28 @@ async def generate_embeddings_for_city(city: str, batch_size: int = 50):
         await db.commit()
         print(f"Completed generating embeddings for {len(properties)} properties in {city}")
 
+        backfilled = await backfill_embedding_bits(db, city)
+        await db.commit()
+        if backfilled:
+            print(f"Computed binary embedding codes for {backfilled} existing embeddings")
+
+        if properties or backfilled:
+            await bump_data_version(db, city)
+        return len(properties)
+
+
+async def rebuild_indexes(city: str | None = None):
+    """Rebuild IVFFlat indexes so their centroids reflect the new embeddings.
+
+    HNSW indexes take new rows incrementally and are left alone; rebuild them
+    with scripts/manage_indexes.py if needed.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        rebuilt = await rebuild_vector_indexes(conn, city, methods=("ivfflat",))
+    if rebuilt:
+        print(f"Rebuilt vector indexes: {', '.join(rebuilt)}")
+
 
 async def main():
     parser = argparse.ArgumentParser(description="Generate embeddings for properties")
@@ -48,6 +77,8 @@ async def main():
     group.add_argument("--city", help="City name (e.g., bangalore)")
     group.add_argument("--all", action="store_true", help="Generate embeddings for all cities")
     parser.add_argument("--batch-size", type=int, default=50, help="Batch size for commits")
+    parser.add_argument("--no-reindex", action="store_true",
+                        help="Skip rebuilding IVFFlat indexes after generating embeddings")
     args = parser.parse_args()
 
     if args.all:
@@ -59,13 +90,18 @@ async def main():
             cities = [row[0] for row in result.fetchall()]
 
         print(f"Found cities: {cities}")
+        generated = 0
         for city in cities:
             print(f"\nGenerating embeddings for {city}...")
-            await generate_embeddings_for_city(city, args.batch_size)
+            generated += await generate_embeddings_for_city(city, args.batch_size)
         print(f"\nCompleted generating embeddings for all {len(cities)} cities")
+        if generated and not args.no_reindex:
+            await rebuild_indexes()
     else:
         print(f"Generating embeddings for {args.city}...")
-        await generate_embeddings_for_city(args.city, args.batch_size)
+        generated = await generate_embeddings_for_city(args.city, args.batch_size)
+        if generated and not args.no_reindex:
+            await rebuild_indexes(args.city)
 
 
 if __name__ == "__main__":
@@ -14,13 +14,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from sqlalchemy import text, delete
 from app.models.database import engine, async_session
 from app.models.property import Base, Property
+from app.models.data_version import DataVersion  # noqa: F401 - registers the table for create_all
+from app.repositories.data_version_repo import bump_data_version
+from app.core.amenities import normalize_amenities
 
 
 async def init_db():
-    """Initialize database tables and pgvector extension."""
+    """Initialize database tables and the pgvector/pg_trgm extensions."""
     async with engine.begin() as conn:
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
+        # create_all does not add columns to an existing table
+        await conn.execute(text('ALTER TABLE properties ADD COLUMN IF NOT EXISTS geohash VARCHAR(12) COLLATE "C"'))
+        await conn.execute(text("CREATE INDEX IF NOT EXISTS idx_properties_geohash ON properties(geohash)"))
+        await conn.execute(text("ALTER TABLE properties ADD COLUMN IF NOT EXISTS embedding_bits bit(768)"))
 
 
 async def load_csv(city: str, csv_path: Path):
@@ -52,7 +60,7 @@ async def load_csv(city: str, csv_path: Path):
                     "sqft": int(float(row["sqft"])) if row.get("sqft") else None,
                     "bathrooms": int(row["bathrooms"]) if row.get("bathrooms") else None,
                     "price_lakhs": float(row["price_lakhs"]) if row.get("price_lakhs") else None,
-                    "amenities": row.get("amenities", "").split("|") if row.get("amenities") else [],
+                    "amenities": normalize_amenities(row["amenities"].split("|")) if row.get("amenities") else [],
                     "latitude": float(row["latitude"]) if row.get("latitude") else None,
                     "longitude": float(row["longitude"]) if row.get("longitude") else None,
                 }
@@ -68,6 +76,9 @@ async def load_csv(city: str, csv_path: Path):
             await db.commit()
             print(f"Successfully loaded {count} properties for {city}")
 
+        version = await bump_data_version(db, city)
+        print(f"Data version for {city} is now {version}")
+
 
 async def main():
     parser = argparse.ArgumentParser(description="Load property data into database")
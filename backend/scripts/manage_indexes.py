@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Manage ANN (HNSW/IVFFlat) indexes on properties.embedding (and its binary codes).
+
+Usage:
+    python scripts/manage_indexes.py create --method hnsw
+    python scripts/manage_indexes.py create --method ivfflat --city bangalore
+    python scripts/manage_indexes.py create --method hnsw --precision halfvec
+    python scripts/manage_indexes.py rebuild [--city bangalore]
+    python scripts/manage_indexes.py drop --name idx_properties_embedding_hnsw
+    python scripts/manage_indexes.py status
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.database import engine
+from app.core.vector_index import (
+    VECTOR_INDEX_METHODS,
+    VECTOR_INDEX_PRECISIONS,
+    create_vector_index,
+    drop_vector_index,
+    list_vector_indexes,
+    rebuild_vector_indexes,
+)
+
+
+async def run(args):
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        if args.command == "create":
+            name = await create_vector_index(
+                conn, args.method, args.city, args.lists, args.m, args.ef_construction,
+                precision=args.precision,
+            )
+            print(f"Created vector index {name}")
+        elif args.command == "drop":
+            await drop_vector_index(conn, args.name)
+            print(f"Dropped vector index {args.name}")
+        elif args.command == "rebuild":
+            rebuilt = await rebuild_vector_indexes(conn, args.city)
+            print(f"Rebuilt {len(rebuilt)} vector index(es): {', '.join(rebuilt) or 'none'}")
+        else:
+            indexes = await list_vector_indexes(conn)
+            if not indexes:
+                print("No vector indexes found")
+            for index in indexes:
+                scope = index["city"] or "all cities"
+                print(f"{index['name']}: {index['method']} {index['precision']} ({scope}), "
+                      f"{index['size_bytes'] / 1024:.0f} KB")
+                print(f"  {index['definition']}")
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage vector indexes on properties.embedding")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create = subparsers.add_parser("create", help="Create a vector index concurrently")
+    create.add_argument("--method", choices=VECTOR_INDEX_METHODS, default="hnsw")
+    create.add_argument("--city", help="Create a partial index for one city")
+    create.add_argument("--precision", choices=VECTOR_INDEX_PRECISIONS, default="vector",
+                        help="Index float32 vectors, half-precision casts or binary codes (see VECTOR_PRECISION)")
+    create.add_argument("--lists", type=int, help="IVFFlat lists (default: derived from row count)")
+    create.add_argument("--m", type=int, default=16, help="HNSW max connections per layer")
+    create.add_argument("--ef-construction", type=int, default=64, help="HNSW build candidate list size")
+
+    drop = subparsers.add_parser("drop", help="Drop a vector index concurrently")
+    drop.add_argument("--name", required=True, help="Index name (see 'status')")
+
+    rebuild = subparsers.add_parser("rebuild", help="Rebuild vector indexes after a bulk load")
+    rebuild.add_argument("--city", help="Only rebuild indexes covering this city")
+
+    subparsers.add_parser("status", help="List vector indexes")
+
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import create_async_engine
 sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
 
 from app.config import get_settings
+from app.repositories.property_repo import backfill_embedding_bits, backfill_geohashes
 
 settings = get_settings()
 
@@ -15,6 +16,9 @@ SCHEMA_SQL = """
 -- Enable pgvector extension
 CREATE EXTENSION IF NOT EXISTS vector;
 
+-- Enable trigram matching for area search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create properties table
 CREATE TABLE IF NOT EXISTS properties (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -28,13 +32,60 @@ CREATE TABLE IF NOT EXISTS properties (
     amenities TEXT[],
     latitude DECIMAL(10, 8),
     longitude DECIMAL(11, 8),
-    embedding vector(768)
+    geohash VARCHAR(12) COLLATE "C",
+    embedding vector(768),
+    embedding_bits bit(768)
+);
+
+-- Added after the initial schema
+ALTER TABLE properties ADD COLUMN IF NOT EXISTS geohash VARCHAR(12) COLLATE "C";
+ALTER TABLE properties ADD COLUMN IF NOT EXISTS embedding_bits bit(768);
+
+-- Per-city data versions, bumped by the load/embedding scripts so caches
+-- and in-memory indexes know when to refresh
+CREATE TABLE IF NOT EXISTS data_versions (
+    city VARCHAR(50) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 1,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Precomputed similar properties (scripts/build_neighbors.py) and the data
+-- version each city's neighbours were built from
+CREATE TABLE IF NOT EXISTS property_neighbors (
+    property_id UUID PRIMARY KEY REFERENCES properties(id) ON DELETE CASCADE,
+    neighbor_ids UUID[] NOT NULL,
+    distances REAL[] NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS neighbor_builds (
+    city VARCHAR(50) PRIMARY KEY,
+    data_version INTEGER NOT NULL,
+    built_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
 -- Create indexes (IF NOT EXISTS for idempotency)
 CREATE INDEX IF NOT EXISTS idx_properties_city ON properties(city);
 CREATE INDEX IF NOT EXISTS idx_properties_area ON properties(area);
 CREATE INDEX IF NOT EXISTS idx_properties_bhk ON properties(bhk);
+
+-- Substring/similarity area matching (ILIKE '%x%' cannot use the btree index)
+CREATE INDEX IF NOT EXISTS idx_properties_area_trgm ON properties USING gin (area gin_trgm_ops);
+
+-- Amenity containment filters (amenities @> ARRAY[...])
+CREATE INDEX IF NOT EXISTS idx_properties_amenities ON properties USING gin (amenities);
+
+-- Default ANN index for vector search (manage with scripts/manage_indexes.py)
+CREATE INDEX IF NOT EXISTS idx_properties_embedding_hnsw ON properties USING hnsw (embedding vector_cosine_ops);
+
+-- Map viewport (bounding box) searches
+CREATE INDEX IF NOT EXISTS idx_properties_lat_lng ON properties(latitude, longitude) INCLUDE (city, bhk, price_lakhs, sqft);
+
+-- Geohash prefix ranges for radius searches
+CREATE INDEX IF NOT EXISTS idx_properties_geohash ON properties(geohash);
+
+-- Index-backed sorts for SQL-only search (EMBEDDING_PROVIDER=none)
+CREATE INDEX IF NOT EXISTS idx_properties_city_price ON properties(city, price_lakhs, id);
+CREATE INDEX IF NOT EXISTS idx_properties_city_price_per_sqft ON properties(city, (price_lakhs / CAST(nullif(sqft, 0) AS NUMERIC)), id);
 """
 
 SAMPLE_DATA_SQL = """
@@ -47,18 +98,29 @@ VALUES
     ('bangalore', '1BHK Studio in Electronic City', 'Electronic City', 1, 650, 1, 32, ARRAY['security', 'parking'], 12.8399, 77.6770),
     ('bangalore', '4BHK Luxury Penthouse in MG Road', 'MG Road', 4, 3500, 4, 350, ARRAY['gym', 'swimming pool', 'concierge', 'parking', 'rooftop'], 12.9757, 77.6062),
     ('bangalore', '2BHK Family Home in JP Nagar', 'JP Nagar', 2, 1300, 2, 72, ARRAY['parking', 'garden', 'security'], 12.9063, 77.5857),
-    ('bangalore', '3BHK Gated Community in Sarjapur', 'Sarjapur Road', 3, 1650, 2, 95, ARRAY['gym', 'clubhouse', 'parking', 'playground'], 12.8673, 77.7870),
+    ('bangalore', '3BHK Gated Community in Sarjapur', 'Sarjapur Road', 3, 1650, 2, 95, ARRAY['gym', 'clubhouse', 'parking', 'children play area'], 12.8673, 77.7870),
     ('bangalore', '2BHK Near Metro in Marathahalli', 'Marathahalli', 2, 1150, 2, 68, ARRAY['gym', 'parking'], 12.9591, 77.6971),
     ('bangalore', '3BHK Corner Unit in Hebbal', 'Hebbal', 3, 1900, 3, 125, ARRAY['swimming pool', 'gym', 'parking', 'security'], 13.0358, 77.5970),
     ('bangalore', '1BHK Compact Flat in BTM Layout', 'BTM Layout', 1, 600, 1, 38, ARRAY['security', 'parking'], 12.9166, 77.6101),
     ('bangalore', '2BHK with Garden in Bannerghatta', 'Bannerghatta Road', 2, 1250, 2, 65, ARRAY['garden', 'parking', 'security'], 12.8698, 77.5964),
     ('bangalore', '4BHK Duplex in Jayanagar', 'Jayanagar', 4, 2800, 4, 220, ARRAY['gym', 'garden', 'parking', 'servant quarters'], 12.9308, 77.5838),
-    ('bangalore', '2BHK New Launch in Yelahanka', 'Yelahanka', 2, 1100, 2, 48, ARRAY['gym', 'parking', 'playground'], 13.1007, 77.5963),
+    ('bangalore', '2BHK New Launch in Yelahanka', 'Yelahanka', 2, 1100, 2, 48, ARRAY['gym', 'parking', 'children play area'], 13.1007, 77.5963),
     ('bangalore', '3BHK Ready to Move in Malleshwaram', 'Malleshwaram', 3, 1700, 2, 135, ARRAY['parking', 'security'], 13.0035, 77.5647)
 ON CONFLICT DO NOTHING;
 """
 
 
+def split_sql(sql: str) -> list[str]:
+    """Split a SQL script into statements, dropping comment lines."""
+    statements = []
+    for statement in sql.split(';'):
+        lines = [line for line in statement.splitlines() if not line.strip().startswith('--')]
+        statement = "\n".join(lines).strip()
+        if statement:
+            statements.append(statement)
+    return statements
+
+
 async def setup_database():
     """Set up the database schema."""
     print(f"Connecting to database...")
@@ -68,10 +130,8 @@ async def setup_database():
 
     async with engine.begin() as conn:
         print("\n--- Creating schema ---")
-        for statement in SCHEMA_SQL.strip().split(';'):
-            statement = statement.strip()
-            if statement and not statement.startswith('--'):
-                await conn.execute(text(statement))
+        for statement in split_sql(SCHEMA_SQL):
+            await conn.execute(text(statement))
         print("Schema created successfully!")
 
         # Check if we should seed data
@@ -85,6 +145,16 @@ async def setup_database():
         else:
             print(f"\n--- Skipping seed (already have {count} properties) ---")
 
+        # Rows inserted with SQL (the seed, older loads) have no geohash yet
+        updated = await backfill_geohashes(conn)
+        if updated:
+            print(f"Computed geohashes for {updated} properties")
+
+        # Embeddings written before binary codes existed
+        updated = await backfill_embedding_bits(conn)
+        if updated:
+            print(f"Computed binary embedding codes for {updated} properties")
+
     await engine.dispose()
     print("\nDatabase setup complete!")
 
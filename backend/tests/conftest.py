@@ -70,6 +70,25 @@ def mock_ollama():
 @pytest.fixture
 def mock_embedding():
     """Mock embedding generation."""
-    with patch("app.core.embeddings.generate_embedding") as mock:
+    with patch("app.core.search_engine.generate_query_embedding") as mock, \
+         patch("app.api.routes.search.generate_query_embedding", new=mock):
         mock.return_value = [0.1] * 768  # 768-dim vector
         yield mock
+
+
+@pytest.fixture(autouse=True)
+def disable_search_cache():
+    """Keep route tests independent: no search results or facets cached across tests."""
+    from app.api.routes import search
+    from app.core.cache import TTLCache
+
+    with patch.object(search, "search_cache", TTLCache(maxsize=0, ttl=0)), \
+         patch.object(search, "facets_cache", TTLCache(maxsize=0, ttl=0)):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def disable_parse_cache():
+    """Keep parser tests independent of the on-disk parse cache."""
+    with patch("app.core.query_parser.get_parse_cache", return_value=None):
+        yield
@@ -0,0 +1,69 @@
+"""Tests for amenity normalization."""
+from app.core.amenities import (
+    QUERY_AMENITY_TERMS,
+    CANONICAL_AMENITIES,
+    AMENITY_SYNONYMS,
+    normalize_amenity,
+    normalize_amenities,
+)
+
+
+class TestNormalizeAmenity:
+    """Tests for normalize_amenity."""
+
+    def test_canonical_unchanged(self):
+        """Should keep canonical names as they are."""
+        for amenity in CANONICAL_AMENITIES:
+            assert normalize_amenity(amenity) == amenity
+
+    def test_case_and_whitespace(self):
+        """Should lowercase and collapse whitespace, hyphens and underscores."""
+        assert normalize_amenity("  Swimming   Pool ") == "swimming pool"
+        assert normalize_amenity("Power-Backup") == "power backup"
+        assert normalize_amenity("ev_charging") == "ev charging"
+
+    def test_synonyms(self):
+        """Should map synonyms to canonical names."""
+        assert normalize_amenity("pool") == "swimming pool"
+        assert normalize_amenity("Elevator") == "lift"
+        assert normalize_amenity("playground") == "children play area"
+
+    def test_plurals(self):
+        """Should map simple plurals."""
+        assert normalize_amenity("gyms") == "gym"
+        assert normalize_amenity("CCTV cameras") == "cctv"
+
+    def test_unknown_kept(self):
+        """Should keep unknown amenities in cleaned form."""
+        assert normalize_amenity("Rooftop  Deck") == "rooftop deck"
+
+    def test_synonyms_target_canonical(self):
+        """Should only map synonyms to canonical names."""
+        assert set(AMENITY_SYNONYMS.values()) <= set(CANONICAL_AMENITIES)
+
+
+class TestNormalizeAmenities:
+    """Tests for normalize_amenities."""
+
+    def test_deduplicates(self):
+        """Should drop duplicates after normalization, keeping order."""
+        assert normalize_amenities(["Pool", "gym", "swimming pool"]) == ["swimming pool", "gym"]
+
+    def test_none_and_blanks(self):
+        """Should handle None, blanks and non-strings."""
+        assert normalize_amenities(None) == []
+        assert normalize_amenities(["", "  ", None, 5, "gym"]) == ["gym"]
+
+
+class TestQueryAmenityTerms:
+    """Tests for the query parser's amenity lexicon."""
+
+    def test_excludes_loose_synonyms(self):
+        """Should leave generic words to ingest normalization only."""
+        for word in ("park", "club", "swimming", "solar"):
+            assert word not in QUERY_AMENITY_TERMS
+
+    def test_keeps_specific_terms(self):
+        """Should keep canonical names, multi-word and unambiguous synonyms."""
+        for term in ("gym", "swimming pool", "car parking", "pool", "elevator"):
+            assert term in QUERY_AMENITY_TERMS
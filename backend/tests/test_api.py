@@ -26,7 +26,7 @@ class TestSearchEndpoint:
     """Tests for search endpoint."""
 
     @pytest.mark.asyncio
-    async def test_search_success(self, mock_property):
+    async def test_search_success(self, mock_property, mock_embedding):
         """Should return search results successfully."""
         mock_parsed = ParsedQuery(
             bhk=2,
@@ -80,7 +80,7 @@ class TestSearchEndpoint:
         assert response.status_code == 422
 
     @pytest.mark.asyncio
-    async def test_search_all_cities(self, mock_property):
+    async def test_search_all_cities(self, mock_property, mock_embedding):
         """Should search across all cities when city is empty."""
         mock_parsed = ParsedQuery(
             bhk=2,
@@ -112,7 +112,7 @@ class TestSearchEndpoint:
         assert call_args[0][2] == ""  # city argument
 
     @pytest.mark.asyncio
-    async def test_search_with_partial_match(self, mock_property):
+    async def test_search_with_partial_match(self, mock_property, mock_embedding):
         """Should return partial match info."""
         mock_parsed = ParsedQuery(
             bhk=5,
@@ -162,7 +162,7 @@ class TestSearchResponse:
     """Tests for search response structure."""
 
     @pytest.mark.asyncio
-    async def test_response_includes_all_fields(self, mock_property):
+    async def test_response_includes_all_fields(self, mock_property, mock_embedding):
         """Should include all required fields in response."""
         mock_parsed = ParsedQuery(
             bhk=2,
@@ -207,7 +207,7 @@ class TestSearchResponse:
         assert "amenities" in filters
 
     @pytest.mark.asyncio
-    async def test_property_response_structure(self, mock_property):
+    async def test_property_response_structure(self, mock_property, mock_embedding):
         """Should return properly structured property objects."""
         mock_parsed = ParsedQuery(raw_query="test")
         mock_result = SearchResult(
@@ -250,7 +250,7 @@ class TestSearchDatabaseError:
     """Tests for database error handling in search endpoint."""
 
     @pytest.mark.asyncio
-    async def test_search_database_error(self):
+    async def test_search_database_error(self, mock_embedding):
         """Should handle database errors gracefully."""
         from sqlalchemy.exc import SQLAlchemyError
 
@@ -276,3 +276,445 @@ class TestSearchDatabaseError:
         data = response.json()
         assert "error" in data
         assert data["type"] == "DatabaseError"
+
+
+class TestParseAndEmbed:
+    """Tests for concurrent query parsing and embedding in the search endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_parse_and_embed_overlap(self):
+        """Should start the embedding before the parse finishes."""
+        import asyncio
+        from app.api.routes.search import _parse_and_embed
+
+        events = []
+
+        async def slow_parse(query):
+            events.append("parse_start")
+            await asyncio.sleep(0.01)
+            events.append("parse_end")
+            return ParsedQuery(raw_query=query)
+
+        async def slow_embed(text):
+            events.append("embed_start")
+            await asyncio.sleep(0.01)
+            events.append("embed_end")
+            return [0.1] * 768
+
+        with patch("app.api.routes.search.parse_query", side_effect=slow_parse), \
+             patch("app.api.routes.search.generate_query_embedding", side_effect=slow_embed):
+            parsed, embedding = await _parse_and_embed("2BHK")
+
+        assert parsed.raw_query == "2BHK"
+        assert len(embedding) == 768
+        assert events.index("embed_start") < events.index("parse_end")
+
+    @pytest.mark.asyncio
+    async def test_embedding_passed_to_search(self, mock_property, mock_embedding):
+        """Should hand the precomputed embedding to hybrid_search."""
+        mock_result = SearchResult(properties=[mock_property], match_type="exact", relaxed_filters=[])
+
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.hybrid_search", new_callable=AsyncMock) as mock_search:
+            mock_parse.return_value = ParsedQuery(raw_query="2BHK flat")
+            mock_search.return_value = mock_result
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/api/v1/search", json={"query": "2BHK flat"})
+
+        assert response.status_code == 200
+        assert mock_search.call_args.kwargs["query_embedding"] == [0.1] * 768
+
+    @pytest.mark.asyncio
+    async def test_llm_error_surfaces(self, mock_embedding):
+        """Should return LLMError when parsing fails."""
+        from app.core.exceptions import LLMError
+
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse:
+            mock_parse.side_effect = LLMError("LLM down")
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/api/v1/search", json={"query": "2BHK flat"})
+
+        assert response.status_code == 503
+        assert response.json()["type"] == "LLMError"
+
+    @pytest.mark.asyncio
+    async def test_embedding_error_surfaces(self):
+        """Should return EmbeddingError when embedding fails."""
+        from app.core.exceptions import EmbeddingError
+
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.generate_query_embedding", new_callable=AsyncMock) as mock_embed:
+            mock_parse.return_value = ParsedQuery(raw_query="2BHK flat")
+            mock_embed.side_effect = EmbeddingError("Embeddings down")
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/api/v1/search", json={"query": "2BHK flat"})
+
+        assert response.status_code == 503
+        assert response.json()["type"] == "EmbeddingError"
+
+    @pytest.mark.asyncio
+    async def test_no_embedding_when_vector_search_disabled(self, mock_embedding):
+        """Should skip embedding generation with the no-op provider."""
+        from app.api.routes.search import _parse_and_embed
+
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.vector_search_enabled", return_value=False):
+            mock_parse.return_value = ParsedQuery(raw_query="2BHK")
+
+            parsed, embedding = await _parse_and_embed("2BHK")
+
+        assert embedding is None
+        mock_embedding.assert_not_called()
+
+
+class TestSearchResultCache:
+    """Tests for the search result cache in front of hybrid_search."""
+
+    def test_equivalent_filters_share_key(self):
+        """Should normalize amenity synonyms/order and area case."""
+        from app.api.routes.search import _search_cache_key
+
+        a = ParsedQuery(bhk=2, area="Whitefield ", amenities=["pool", "gym"], raw_query="2BHK  whitefield")
+        b = ParsedQuery(bhk=2, area="whitefield", amenities=["gym", "swimming pool"], raw_query="2bhk whitefield")
+
+        assert _search_cache_key(a, "bangalore", 10, 1) == _search_cache_key(b, "bangalore", 10, 1)
+
+    def test_key_depends_on_version_and_limit(self):
+        """Should produce new keys when the data version or limit changes."""
+        from app.api.routes.search import _search_cache_key
+
+        parsed = ParsedQuery(bhk=2, raw_query="2bhk")
+
+        assert _search_cache_key(parsed, "bangalore", 10, 1) != _search_cache_key(parsed, "bangalore", 10, 2)
+        assert _search_cache_key(parsed, "bangalore", 10, 1) != _search_cache_key(parsed, "bangalore", 20, 1)
+
+    def test_sql_only_key_ignores_query_text(self):
+        """Should key on filters alone when the ranking ignores the text."""
+        from app.api.routes.search import _search_cache_key
+
+        a = ParsedQuery(bhk=2, raw_query="2bhk flat")
+        b = ParsedQuery(bhk=2, raw_query="two bedroom apartment")
+
+        with patch("app.api.routes.search.vector_search_enabled", return_value=False):
+            assert _search_cache_key(a, "bangalore", 10, 1) == _search_cache_key(b, "bangalore", 10, 1)
+
+    @pytest.mark.asyncio
+    async def test_repeated_search_served_from_cache(self, mock_property, mock_embedding):
+        """Should run hybrid_search once for repeated searches and count the hit."""
+        from app.api.routes import search
+        from app.core.cache import TTLCache
+
+        mock_parsed = ParsedQuery(bhk=2, raw_query="2BHK flat")
+        mock_result = SearchResult(properties=[mock_property], match_type="exact", relaxed_filters=[])
+        versions = MagicMock()
+        versions.get = AsyncMock(return_value=1)
+
+        with patch.object(search, "search_cache", TTLCache(maxsize=10, ttl=60)), \
+             patch("app.api.routes.search.get_data_version_cache", return_value=versions), \
+             patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.hybrid_search", new_callable=AsyncMock) as mock_search:
+            mock_parse.return_value = mock_parsed
+            mock_search.return_value = mock_result
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                for _ in range(2):
+                    response = await client.post(
+                        "/api/v1/search",
+                        json={"query": "2BHK flat", "city": "bangalore"}
+                    )
+                    assert response.status_code == 200
+                stats = (await client.get("/api/v1/search/stats")).json()
+
+        mock_search.assert_awaited_once()
+        assert versions.get.await_args.args[1] == "bangalore"
+        assert stats["search_cache"]["hits"] == 1
+        assert stats["search_cache"]["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_data_version_skips_cache(self, mock_property, mock_embedding):
+        """Should search every time without caching when data versions are unavailable."""
+        from app.api.routes import search
+        from app.core.cache import TTLCache
+
+        mock_parsed = ParsedQuery(bhk=2, raw_query="2BHK flat")
+        mock_result = SearchResult(properties=[mock_property], match_type="exact", relaxed_filters=[])
+        versions = MagicMock()
+        versions.get = AsyncMock(return_value=None)
+        cache = TTLCache(maxsize=10, ttl=60)
+
+        with patch.object(search, "search_cache", cache), \
+             patch("app.api.routes.search.get_data_version_cache", return_value=versions), \
+             patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.hybrid_search", new_callable=AsyncMock) as mock_search:
+            mock_parse.return_value = mock_parsed
+            mock_search.return_value = mock_result
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                for _ in range(2):
+                    response = await client.post(
+                        "/api/v1/search",
+                        json={"query": "2BHK flat", "city": "bangalore"}
+                    )
+                    assert response.status_code == 200
+
+        assert mock_search.await_count == 2
+        assert cache.misses == 0 and not cache._entries
+
+
+class TestSearchPagination:
+    """Tests for cursor pagination on the search endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_cursor_skips_parse_and_ladder(self, mock_property, mock_embedding):
+        """Should continue the matched tier without parsing the query again."""
+        from uuid import UUID
+        from app.core.pagination import SearchCursor
+
+        cursor = SearchCursor(
+            parsed_query=ParsedQuery(bhk=2, raw_query="2BHK flat"),
+            city="bangalore",
+            match_type="exact",
+            relaxed_filters=[],
+            after_id=UUID("12345678-1234-5678-1234-567812345678"),
+            position=5,
+        ).encode()
+        mock_property.id = UUID(int=7)
+        mock_result = SearchResult(properties=[mock_property], match_type="exact", relaxed_filters=[])
+
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.hybrid_search", new_callable=AsyncMock) as mock_search, \
+             patch("app.api.routes.search.search_after", new_callable=AsyncMock) as mock_after:
+            mock_after.return_value = mock_result
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post(
+                    "/api/v1/search",
+                    json={"query": "2BHK flat", "limit": 1, "cursor": cursor}
+                )
+
+        assert response.status_code == 200
+        mock_parse.assert_not_called()
+        mock_search.assert_not_called()
+        args = mock_after.call_args.args
+        assert args[2] == "bangalore"
+        assert args[4] == UUID("12345678-1234-5678-1234-567812345678")
+        assert mock_after.call_args.kwargs["position"] == 5
+        assert SearchCursor.decode(response.json()["next_cursor"]).position == 6
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self):
+        """Should return 400 for a malformed cursor."""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/v1/search",
+                json={"query": "2BHK flat", "cursor": "not-a-cursor"}
+            )
+
+        assert response.status_code == 400
+        assert response.json()["type"] == "ValidationError"
+
+
+class TestSearchStream:
+    """Tests for the NDJSON streaming search endpoint."""
+
+    def _session(self):
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=AsyncMock())
+        session.__aexit__ = AsyncMock(return_value=False)
+        return MagicMock(return_value=session)
+
+    async def _frames(self, body):
+        import json
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/v1/search/stream", json=body)
+        return response, [json.loads(line) for line in response.text.splitlines()]
+
+    @pytest.mark.asyncio
+    async def test_frames_in_order(self, mock_property, mock_embedding):
+        """Should emit parsed filters, result rows, then a done frame with timings."""
+        mock_result = SearchResult(properties=[mock_property], match_type="partial", relaxed_filters=["bhk"])
+
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.hybrid_search", new_callable=AsyncMock) as mock_search, \
+             patch("app.api.routes.search.async_session", self._session()):
+            mock_parse.return_value = ParsedQuery(bhk=2, raw_query="2BHK flat")
+            mock_search.return_value = mock_result
+
+            response, frames = await self._frames({"query": "2BHK flat", "city": "bangalore"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert [f["type"] for f in frames] == ["parsed", "result", "done"]
+        assert frames[0]["parsed_filters"]["bhk"] == 2
+        assert frames[1]["property"]["title"] == "Test Property"
+        assert frames[2]["match_type"] == "partial"
+        assert frames[2]["relaxed_filters"] == ["bhk"]
+        assert set(frames[2]["timings"]) == {"parse_ms", "embed_wait_ms", "search_ms", "total_ms"}
+        assert mock_search.call_args.kwargs["query_embedding"] == [0.1] * 768
+
+    @pytest.mark.asyncio
+    async def test_facets_frame_before_results(self, mock_property, mock_embedding):
+        """Should emit a facets frame ahead of the result rows when facets are requested."""
+        from app.api.routes.search import FacetsResponse
+
+        mock_result = SearchResult(properties=[mock_property], match_type="exact", relaxed_filters=[])
+        facets = FacetsResponse(total=1, bhk=[], price=[], area=[], amenities=[])
+
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.hybrid_search", new_callable=AsyncMock) as mock_search, \
+             patch("app.api.routes.search._cached_facets", new_callable=AsyncMock) as mock_facets, \
+             patch("app.api.routes.search.async_session", self._session()):
+            mock_parse.return_value = ParsedQuery(bhk=2, raw_query="2BHK flat")
+            mock_search.return_value = mock_result
+            mock_facets.return_value = facets
+
+            response, frames = await self._frames({"query": "2BHK flat", "city": "bangalore", "facets": True})
+
+        assert [f["type"] for f in frames] == ["parsed", "facets", "result", "done"]
+        assert frames[1]["facets"] == facets.model_dump()
+        assert mock_facets.call_args[0][2] == "bangalore"
+        assert "facets_ms" in frames[3]["timings"]
+
+    @pytest.mark.asyncio
+    async def test_error_after_parse_is_framed(self, mock_embedding):
+        """Should end the stream with an error frame when the search fails."""
+        from sqlalchemy.exc import SQLAlchemyError
+
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.hybrid_search", new_callable=AsyncMock) as mock_search, \
+             patch("app.api.routes.search.async_session", self._session()):
+            mock_parse.return_value = ParsedQuery(bhk=2, raw_query="2BHK flat")
+            mock_search.side_effect = SQLAlchemyError("connection lost")
+
+            response, frames = await self._frames({"query": "2BHK flat"})
+
+        assert [f["type"] for f in frames] == ["parsed", "error"]
+        assert frames[1]["error"]["type"] == "DatabaseError"
+
+    @pytest.mark.asyncio
+    async def test_parse_error_is_framed(self, mock_embedding):
+        """Should report LLM failures as an error frame."""
+        from app.core.exceptions import LLMError
+
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse:
+            mock_parse.side_effect = LLMError("LLM down")
+
+            response, frames = await self._frames({"query": "2BHK flat"})
+
+        assert frames == [{"type": "error", "error": {"message": "LLM down", "type": "LLMError"}}]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected_before_stream(self):
+        """Should return a 400 instead of a stream for malformed cursors."""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/v1/search/stream", json={"query": "2BHK", "cursor": "bad"})
+
+        assert response.status_code == 400
+
+
+class TestSearchFacets:
+    """Tests for facet counts."""
+
+    FACETS = {
+        "total": 3,
+        "bhk": [{"value": 2, "count": 3}],
+        "price": [{"min_price": 50, "max_price": 100, "count": 3}],
+        "area": [{"value": "Whitefield", "count": 3}],
+        "amenities": [{"value": "gym", "count": 1}],
+    }
+
+    @pytest.mark.asyncio
+    async def test_facets_endpoint_cached(self):
+        """Should compute facets once per city and filter set."""
+        from app.api.routes import search
+        from app.core.cache import TTLCache
+
+        versions = MagicMock()
+        versions.get = AsyncMock(return_value=1)
+
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.facet_counts", new_callable=AsyncMock) as mock_facets, \
+             patch("app.api.routes.search.get_data_version_cache", return_value=versions), \
+             patch.object(search, "facets_cache", TTLCache(maxsize=10, ttl=60)):
+            mock_parse.return_value = ParsedQuery(bhk=2, raw_query="2BHK")
+            mock_facets.return_value = self.FACETS
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                first = await client.post("/api/v1/search/facets", json={"query": "2BHK", "city": "bangalore"})
+                second = await client.post("/api/v1/search/facets", json={"query": "2 bhk", "city": "bangalore"})
+
+        assert first.status_code == 200
+        assert first.json() == self.FACETS
+        assert second.json() == self.FACETS
+        mock_facets.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_search_includes_facets_on_request(self, mock_property, mock_embedding):
+        """Should add facets to the search response only when asked."""
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.hybrid_search", new_callable=AsyncMock) as mock_search, \
+             patch("app.api.routes.search.facet_counts", new_callable=AsyncMock) as mock_facets:
+            mock_parse.return_value = ParsedQuery(bhk=2, raw_query="2BHK")
+            mock_search.return_value = SearchResult([mock_property], "exact", [])
+            mock_facets.return_value = self.FACETS
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                with_facets = await client.post("/api/v1/search", json={"query": "2BHK", "facets": True})
+                without = await client.post("/api/v1/search", json={"query": "2BHK"})
+
+        assert with_facets.json()["facets"] == self.FACETS
+        assert without.json()["facets"] is None
+        mock_facets.assert_awaited_once()
+
+
+class TestSearchNear:
+    """Tests for distance-ranked /search requests."""
+
+    @pytest.mark.asyncio
+    async def test_near_passed_to_search(self, mock_property, mock_embedding):
+        """Should search within the radius without an embedding or cursor."""
+        with patch("app.api.routes.search.parse_query", new_callable=AsyncMock) as mock_parse, \
+             patch("app.api.routes.search.hybrid_search", new_callable=AsyncMock) as mock_search:
+            mock_parse.return_value = ParsedQuery(bhk=2, raw_query="2BHK")
+            mock_search.return_value = SearchResult([mock_property], "exact", [])
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/api/v1/search", json={
+                    "query": "2BHK", "limit": 1,
+                    "near": {"latitude": 12.9756, "longitude": 77.6066, "radius_km": 1.5},
+                })
+
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] is None
+        kwargs = mock_search.call_args.kwargs
+        assert kwargs["near"].radius_km == 1.5
+        assert kwargs["query_embedding"] is None
+        mock_embedding.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_near_with_cursor_rejected(self):
+        """Should reject combining near with a pagination cursor."""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/v1/search", json={
+                "query": "2BHK", "cursor": "abc",
+                "near": {"latitude": 12.9756, "longitude": 77.6066},
+            })
+
+        assert response.status_code == 400
@@ -0,0 +1,171 @@
+"""Tests for in-process caches."""
+import asyncio
+import pytest
+import numpy as np
+from unittest.mock import AsyncMock, patch
+
+from app.core.cache import TTLCache, DataVersionCache, EmbeddingCache
+
+
+class TestTTLCache:
+    """Tests for the LRU/TTL cache."""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self):
+        """Should compute once and serve the cached value afterwards."""
+        cache = TTLCache(maxsize=10, ttl=60)
+        factory = AsyncMock(return_value="value")
+
+        assert await cache.get_or_set("k", factory) == "value"
+        assert await cache.get_or_set("k", factory) == "value"
+
+        factory.assert_awaited_once()
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        """Should evict the least recently used entry when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == (1, True)
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entry_dropped(self):
+        """Should drop entries past the TTL and stale window."""
+        cache = TTLCache(maxsize=10, ttl=60, stale_ttl=60)
+        cache.set("k", 1)
+
+        with patch("app.core.cache.time.monotonic", return_value=10**9):
+            assert cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        """Should serve a stale value and refresh it once in the background."""
+        cache = TTLCache(maxsize=10, ttl=60, stale_ttl=600)
+        cache.set("k", "old")
+        refresh = AsyncMock(return_value="new")
+        factory = AsyncMock(return_value="unused")
+
+        now = cache._entries["k"][0] + 120
+        with patch("app.core.cache.time.monotonic", return_value=now):
+            assert await cache.get_or_set("k", factory, refresh) == "old"
+            assert await cache.get_or_set("k", factory, refresh) == "old"
+            await asyncio.gather(*cache._tasks)
+
+        refresh.assert_awaited_once()
+        factory.assert_not_awaited()
+        assert cache.get("k") == ("new", True)
+        assert cache.stats()["stale_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_value(self):
+        """Should keep serving the stale entry when the refresh fails."""
+        cache = TTLCache(maxsize=10, ttl=60, stale_ttl=600)
+        cache.set("k", "old")
+        refresh = AsyncMock(side_effect=RuntimeError("db down"))
+
+        now = cache._entries["k"][0] + 120
+        with patch("app.core.cache.time.monotonic", return_value=now):
+            await cache.get_or_set("k", AsyncMock(), refresh)
+            await asyncio.gather(*cache._tasks)
+            assert cache.get("k") == ("old", False)
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache(self):
+        """Should always call the factory when maxsize is 0."""
+        cache = TTLCache(maxsize=0, ttl=60)
+        factory = AsyncMock(return_value="value")
+
+        await cache.get_or_set("k", factory)
+        await cache.get_or_set("k", factory)
+
+        assert factory.await_count == 2
+        assert cache.stats()["size"] == 0
+
+
+class TestEmbeddingCache:
+    """Tests for the float16 query embedding cache."""
+
+    def test_normalized_key_and_float16_storage(self):
+        """Should share entries across case/whitespace variants and store float16."""
+        cache = EmbeddingCache(maxsize=10)
+        cache.set("2BHK  in Whitefield", [0.5] * 768)
+
+        assert cache.get("2bhk in whitefield ") == [0.5] * 768
+        assert cache._entries["2bhk in whitefield"].dtype == np.float16
+        assert cache.stats()["hits"] == 1
+
+    def test_lru_eviction(self):
+        """Should evict the least recently used query."""
+        cache = EmbeddingCache(maxsize=2)
+        cache.set("a", [0.1])
+        cache.set("b", [0.2])
+        cache.get("a")
+        cache.set("c", [0.3])
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_save_and_load(self, tmp_path):
+        """Should restore saved entries into a new cache."""
+        path = str(tmp_path / "embeddings.npz")
+        cache = EmbeddingCache(maxsize=10, path=path)
+        cache.set("gym flats", [0.25] * 768)
+        cache.set("sea view", [0.75] * 768)
+        assert cache.save() == 2
+
+        restored = EmbeddingCache(maxsize=10, path=path)
+
+        assert restored.load() == 2
+        assert restored.get("sea view") == [0.75] * 768
+
+    def test_load_without_file(self, tmp_path):
+        """Should start empty when the persistence file does not exist."""
+        cache = EmbeddingCache(maxsize=10, path=str(tmp_path / "missing.npz"))
+
+        assert cache.load() == 0
+
+
+class TestDataVersionCache:
+    """Tests for the throttled data version lookup."""
+
+    @pytest.mark.asyncio
+    async def test_throttles_reads(self):
+        """Should read data_versions at most once per refresh interval."""
+        versions = DataVersionCache(refresh_seconds=3600)
+        mock_get = AsyncMock(return_value={"bangalore": 2, "mumbai": 1})
+
+        with patch("app.core.cache.get_data_versions", mock_get):
+            assert await versions.get(AsyncMock(), "bangalore") == 2
+            assert await versions.get(AsyncMock(), "delhi") == 0
+
+        mock_get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_all_cities_version(self):
+        """Should combine every city's version when no city is given."""
+        versions = DataVersionCache(refresh_seconds=0)
+
+        with patch("app.core.cache.get_data_versions", AsyncMock(return_value={"mumbai": 1, "bangalore": 2})):
+            assert await versions.get(AsyncMock(), "") == (("bangalore", 2), ("mumbai", 1))
+
+    @pytest.mark.asyncio
+    async def test_missing_table_disables_versions(self):
+        """Should return None and roll back when data_versions does not exist yet."""
+        from sqlalchemy.exc import ProgrammingError
+
+        versions = DataVersionCache(refresh_seconds=3600)
+        mock_db = AsyncMock()
+        mock_get = AsyncMock(side_effect=ProgrammingError("SELECT", {}, Exception("relation does not exist")))
+
+        with patch("app.core.cache.get_data_versions", mock_get):
+            assert await versions.get(mock_db, "bangalore") is None
+            assert await versions.get(mock_db, "") is None
+
+        mock_get.assert_awaited_once()
+        mock_db.rollback.assert_awaited_once()
@@ -199,3 +199,205 @@ class TestCompareEndpoint:
             )
 
         assert response.status_code == 400
+
+
+class TestBBoxEndpoint:
+    """Tests for the map viewport endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_bbox_with_filters(self, mock_property):
+        """Should pass the box and filters through and report truncation."""
+        with patch("app.api.routes.properties.bbox_search", new_callable=AsyncMock) as mock_bbox:
+            mock_bbox.return_value = ([mock_property], True)
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get(
+                    "/api/v1/properties/bbox",
+                    params={
+                        "min_lat": 12.9, "max_lat": 13.0, "min_lng": 77.5, "max_lng": 77.7,
+                        "city": "bangalore", "bhk": 2, "amenities": ["gym", "parking"], "limit": 10000,
+                    },
+                )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["truncated"] is True
+        args, kwargs = mock_bbox.call_args
+        assert args[1:] == (12.9, 13.0, 77.5, 77.7)
+        assert kwargs["bhk"] == 2
+        assert kwargs["amenities"] == ["gym", "parking"]
+        assert kwargs["limit"] == 500  # capped at bbox_max_results
+
+    @pytest.mark.asyncio
+    async def test_inverted_box_rejected(self):
+        """Should return 400 when the minimum corner exceeds the maximum."""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/api/v1/properties/bbox",
+                params={"min_lat": 13.0, "max_lat": 12.9, "min_lng": 77.5, "max_lng": 77.7},
+            )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_low_zoom_returns_clusters(self):
+        """Should return clusters instead of properties when zoomed out."""
+        cluster = {"latitude": 19.07, "longitude": 72.88, "count": 42, "min_price": 60.0, "max_price": 300.0}
+
+        with patch("app.api.routes.properties.bbox_clusters", new_callable=AsyncMock) as mock_clusters, \
+             patch("app.api.routes.properties.bbox_search", new_callable=AsyncMock) as mock_bbox:
+            mock_clusters.return_value = [cluster]
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get(
+                    "/api/v1/properties/bbox",
+                    params={"min_lat": 18.9, "max_lat": 19.3, "min_lng": 72.7, "max_lng": 73.0, "zoom": 11},
+                )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["properties"] == []
+        assert data["clusters"] == [cluster]
+        assert data["total"] == 42
+        assert mock_clusters.call_args[0][5] == 11
+        mock_bbox.assert_not_called()
+
+
+class TestNearbyEndpoint:
+    """Tests for the distance-ranked properties endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_nearby_returns_distances(self, mock_property):
+        """Should return properties nearest first with their distance."""
+        with patch("app.api.routes.properties.nearby_search", new_callable=AsyncMock) as mock_nearby:
+            mock_nearby.return_value = [(mock_property, 0.4567)]
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get(
+                    "/api/v1/properties/nearby",
+                    params={"latitude": 12.9756, "longitude": 77.6066, "radius_km": 3, "bhk": 2},
+                )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["properties"][0]["distance_km"] == 0.457
+        near = mock_nearby.call_args[0][1]
+        assert (near.latitude, near.longitude, near.radius_km) == (12.9756, 77.6066, 3)
+        assert mock_nearby.call_args.kwargs["bhk"] == 2
+
+    @pytest.mark.asyncio
+    async def test_radius_too_large(self):
+        """Should reject radii above nearby_max_radius_km."""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/api/v1/properties/nearby",
+                params={"latitude": 12.9756, "longitude": 77.6066, "radius_km": 500},
+            )
+
+        assert response.status_code == 400
+
+
+class TestSimilarEndpoint:
+    """Tests for the similar properties endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_similar_properties(self, mock_property):
+        """Should load the property with its embedding and return similar ones."""
+        source = MagicMock()
+        with patch("app.api.routes.properties.get_property_by_id", new_callable=AsyncMock) as mock_get, \
+             patch("app.api.routes.properties.get_neighbors", new_callable=AsyncMock) as mock_neighbors, \
+             patch("app.api.routes.properties.similar_properties", new_callable=AsyncMock) as mock_similar:
+            mock_get.return_value = source
+            mock_similar.return_value = [mock_property]
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get(
+                    "/api/v1/properties/12345678-1234-5678-1234-567812345678/similar",
+                    params={"same_bhk": "true", "limit": 3},
+                )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["property_id"] == "12345678-1234-5678-1234-567812345678"
+        assert len(data["properties"]) == 1
+        assert mock_get.call_args.kwargs["with_embedding"] is True
+        assert mock_similar.call_args[0][1] is source
+        assert mock_similar.call_args.kwargs == {"limit": 3, "same_city": True, "same_bhk": True}
+        mock_neighbors.assert_not_called()  # same_bhk is not precomputed
+
+    @staticmethod
+    def _versions(version):
+        versions = MagicMock()
+        versions.get = AsyncMock(return_value=version)
+        return versions
+
+    @pytest.mark.asyncio
+    async def test_similar_from_precomputed_neighbors(self, mock_property):
+        """Should serve from the neighbours table without loading the embedding."""
+        neighbor_ids = [UUID("87654321-4321-8765-4321-876543218765")]
+        versions = self._versions(3)
+        with patch("app.api.routes.properties.get_property_by_id", new_callable=AsyncMock) as mock_get, \
+             patch("app.api.routes.properties.get_neighbors", new_callable=AsyncMock) as mock_neighbors, \
+             patch("app.api.routes.properties.get_data_version_cache", return_value=versions), \
+             patch("app.api.routes.properties.precomputed_similar_properties",
+                   new_callable=AsyncMock) as mock_precomputed, \
+             patch("app.api.routes.properties.similar_properties", new_callable=AsyncMock) as mock_similar:
+            mock_get.return_value = MagicMock()
+            mock_neighbors.return_value = MagicMock(neighbor_ids=neighbor_ids, city="bangalore", data_version=3)
+            mock_precomputed.return_value = [mock_property]
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get("/api/v1/properties/12345678-1234-5678-1234-567812345678/similar")
+
+        assert response.status_code == 200
+        assert len(response.json()["properties"]) == 1
+        assert mock_get.call_args.kwargs["with_embedding"] is False
+        assert mock_precomputed.call_args[0][2] == neighbor_ids
+        mock_similar.assert_not_called()
+        assert versions.get.await_args.args[1] == "bangalore"
+
+    @pytest.mark.asyncio
+    async def test_stale_neighbors_use_live_query(self, mock_property):
+        """Should fall back to the live query when the build predates the city's data version."""
+        source = MagicMock()
+        with patch("app.api.routes.properties.get_property_by_id", new_callable=AsyncMock) as mock_get, \
+             patch("app.api.routes.properties.get_neighbors", new_callable=AsyncMock) as mock_neighbors, \
+             patch("app.api.routes.properties.get_data_version_cache", return_value=self._versions(4)), \
+             patch("app.api.routes.properties.precomputed_similar_properties",
+                   new_callable=AsyncMock) as mock_precomputed, \
+             patch("app.api.routes.properties.similar_properties", new_callable=AsyncMock) as mock_similar:
+            mock_get.return_value = source
+            mock_neighbors.return_value = MagicMock(neighbor_ids=[UUID(int=2)], city="bangalore", data_version=3)
+            mock_similar.return_value = [mock_property]
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get("/api/v1/properties/12345678-1234-5678-1234-567812345678/similar")
+
+        assert response.status_code == 200
+        assert mock_get.call_args.kwargs["with_embedding"] is True
+        assert mock_similar.call_args[0][1] is source
+        mock_precomputed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_similar_not_found(self):
+        """Should return 404 for an unknown property."""
+        with patch("app.api.routes.properties.get_property_by_id", new_callable=AsyncMock) as mock_get, \
+             patch("app.api.routes.properties.get_neighbors", new_callable=AsyncMock) as mock_neighbors:
+            mock_get.return_value = None
+            mock_neighbors.return_value = None
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get("/api/v1/properties/12345678-1234-5678-1234-567812345678/similar")
+
+        assert response.status_code == 404
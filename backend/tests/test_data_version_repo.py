@@ -0,0 +1,37 @@
+"""Tests for data version repository."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.repositories.data_version_repo import get_data_versions, bump_data_version
+
+
+class TestGetDataVersions:
+    """Tests for get_data_versions."""
+
+    @pytest.mark.asyncio
+    async def test_returns_mapping(self):
+        """Should map city to version."""
+        mock_db = AsyncMock()
+        row = MagicMock()
+        row.city = "bangalore"
+        row.version = 3
+        mock_result = MagicMock()
+        mock_result.all.return_value = [row]
+        mock_db.execute.return_value = mock_result
+
+        assert await get_data_versions(mock_db) == {"bangalore": 3}
+
+
+class TestBumpDataVersion:
+    """Tests for bump_data_version."""
+
+    @pytest.mark.asyncio
+    async def test_returns_new_version_and_commits(self):
+        """Should upsert the row, return the new version and commit."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalar_one.return_value = 2
+        mock_db.execute.return_value = mock_result
+
+        assert await bump_data_version(mock_db, "bangalore") == 2
+        mock_db.commit.assert_awaited_once()
@@ -2,7 +2,13 @@
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 
-from app.core.embeddings import generate_embedding, generate_property_text
+from app.core.embeddings import (
+    generate_embedding,
+    generate_query_embedding,
+    generate_property_text,
+    vector_search_enabled,
+)
+from app.core.cache import EmbeddingCache
 
 
 class TestGeneratePropertyText:
@@ -117,3 +123,51 @@ class TestGenerateEmbedding:
             await generate_embedding("hello world")
 
         mock_provider.embed.assert_called_once_with("hello world")
+
+
+class TestVectorSearchEnabled:
+    """Tests for vector_search_enabled."""
+
+    def test_disabled_for_noop_provider(self):
+        """Should be disabled when the no-op provider is configured."""
+        with patch("app.core.embeddings.settings") as mock_settings:
+            mock_settings.embedding_provider = "none"
+            assert vector_search_enabled() is False
+
+    def test_enabled_for_real_provider(self):
+        """Should be enabled for Jina and Ollama."""
+        with patch("app.core.embeddings.settings") as mock_settings:
+            mock_settings.embedding_provider = "jina"
+            assert vector_search_enabled() is True
+
+
+class TestGenerateQueryEmbedding:
+    """Tests for the cached query embedding."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_embedded_once(self):
+        """Should call the provider once for equivalent queries."""
+        mock_provider = MagicMock()
+        mock_provider.embed = AsyncMock(return_value=[0.5] * 768)
+
+        with patch("app.core.embeddings.get_embedding_provider", return_value=mock_provider), \
+             patch("app.core.embeddings.get_query_embedding_cache", return_value=EmbeddingCache(maxsize=10)):
+            first = await generate_query_embedding("2BHK in Whitefield")
+            second = await generate_query_embedding("2bhk in whitefield")
+
+        assert first == second == [0.5] * 768
+        mock_provider.embed.assert_awaited_once_with("2BHK in Whitefield")
+
+    @pytest.mark.asyncio
+    async def test_miss_returns_cached_precision(self):
+        """Should return the same float16-rounded vector on a miss as on later hits."""
+        mock_provider = MagicMock()
+        mock_provider.embed = AsyncMock(return_value=[0.1] * 768)
+
+        with patch("app.core.embeddings.get_embedding_provider", return_value=mock_provider), \
+             patch("app.core.embeddings.get_query_embedding_cache", return_value=EmbeddingCache(maxsize=10)):
+            first = await generate_query_embedding("2BHK in Whitefield")
+            second = await generate_query_embedding("2BHK in Whitefield")
+
+        assert first == second
+        assert first[0] != 0.1  # float16 rounding
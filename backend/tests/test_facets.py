@@ -0,0 +1,69 @@
+"""Tests for facet counts."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.facets import facet_counts
+from app.core.query_parser import ParsedQuery
+
+
+class TestFacetCounts:
+    """Tests for the single-query facet aggregate."""
+
+    def _row(self, grouping, bhk=None, area=None, price_bucket=None, total=0,
+             bhk_count=0, area_count=0, price_count=0, amenities=None):
+        from collections import namedtuple
+        from app.core.amenities import CANONICAL_AMENITIES
+
+        fields = ["grouping", "bhk", "area", "price_bucket", "total", "bhk_count", "area_count", "price_count"]
+        Row = namedtuple("Row", fields + [f"a{i}" for i in range(len(CANONICAL_AMENITIES))])
+        counts = [(amenities or {}).get(a, 0) for a in CANONICAL_AMENITIES]
+        return Row(grouping, bhk, area, price_bucket, total, bhk_count, area_count, price_count, *counts)
+
+    def _db(self, rows):
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = rows
+        mock_db.execute.return_value = mock_result
+        return mock_db
+
+    @pytest.mark.asyncio
+    async def test_one_grouping_sets_query(self):
+        """Should compute every facet with one GROUPING SETS/FILTER aggregate."""
+        mock_db = self._db([])
+        parsed = ParsedQuery(bhk=2, max_price=100, amenities=["gym"], raw_query="test")
+
+        await facet_counts(mock_db, parsed, "bangalore")
+
+        mock_db.execute.assert_called_once()
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "GROUPING SETS" in sql
+        assert "FILTER (WHERE" in sql
+        assert "properties.city =" in sql
+
+    @pytest.mark.asyncio
+    async def test_rows_mapped_to_facets(self):
+        """Should map grouping rows to sorted facets and skip empty or NULL groups."""
+        rows = [
+            self._row(0b011, bhk=3, bhk_count=4),
+            self._row(0b011, bhk=2, bhk_count=7),
+            self._row(0b011, bhk=None, bhk_count=1),
+            self._row(0b101, area="Whitefield", area_count=5),
+            self._row(0b101, area="Koramangala", area_count=0),
+            self._row(0b110, price_bucket=0, price_count=2),
+            self._row(0b110, price_bucket=4, price_count=1),
+            self._row(0b111, total=6, amenities={"gym": 3, "parking": 6}),
+        ]
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        facets = await facet_counts(self._db(rows), parsed, "bangalore")
+
+        assert facets["total"] == 6
+        assert facets["bhk"] == [{"value": 2, "count": 7}, {"value": 3, "count": 4}]
+        assert facets["area"] == [{"value": "Whitefield", "count": 5}]
+        assert facets["price"] == [
+            {"min_price": None, "max_price": 50, "count": 2},
+            {"min_price": 500, "max_price": None, "count": 1},
+        ]
+        assert facets["amenities"] == [{"value": "parking", "count": 6}, {"value": "gym", "count": 3}]
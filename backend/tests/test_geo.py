@@ -0,0 +1,70 @@
+"""Tests for geohash and distance helpers."""
+import numpy as np
+import pytest
+
+from app.core.geo import (
+    NearPoint,
+    bounding_box,
+    covering_geohashes,
+    geohash_encode,
+    haversine_km,
+)
+
+
+class TestGeohashEncode:
+    """Tests for geohash encoding."""
+
+    def test_known_value(self):
+        """Should match the reference geohash of a well-known coordinate."""
+        assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    def test_prefix_of_finer_precision(self):
+        """Should produce coarser hashes as prefixes of finer ones."""
+        assert geohash_encode(12.9716, 77.5946).startswith(geohash_encode(12.9716, 77.5946, 5))
+
+
+class TestCoveringGeohashes:
+    """Tests for the geohash cells covering a search circle."""
+
+    @pytest.mark.parametrize("radius_km", [0.5, 2.0, 10.0])
+    def test_cells_cover_circle(self, radius_km):
+        """Should include the cell of every point within the radius."""
+        point = NearPoint(12.9716, 77.5946, radius_km)
+        cells = covering_geohashes(point)
+        rng = np.random.default_rng(0)
+
+        for _ in range(500):
+            bearing = rng.uniform(0, 2 * np.pi)
+            distance = rng.uniform(0, radius_km)
+            lat = point.latitude + distance / 111.32 * np.cos(bearing)
+            lng = point.longitude + distance / (111.32 * np.cos(np.radians(point.latitude))) * np.sin(bearing)
+            assert any(geohash_encode(lat, lng).startswith(cell) for cell in cells)
+
+        assert len(cells) <= 9
+
+    def test_huge_radius_not_pruned(self):
+        """Should return no cells when the radius exceeds the coarsest cell."""
+        assert covering_geohashes(NearPoint(12.97, 77.59, 10_000)) == []
+
+
+class TestHaversine:
+    """Tests for vectorized great-circle distances."""
+
+    def test_one_degree_of_longitude_at_equator(self):
+        """Should be about 111.2 km per degree along the equator."""
+        distances = haversine_km(0.0, 0.0, np.array([0.0, 0.0]), np.array([0.0, 1.0]))
+
+        assert distances[0] == 0.0
+        assert distances[1] == pytest.approx(111.19, abs=0.01)
+
+    def test_bounding_box_contains_circle(self):
+        """Should produce a box whose edges are about the radius away from the centre."""
+        point = NearPoint(19.076, 72.8777, 5.0)
+        min_lat, max_lat, min_lng, max_lng = bounding_box(point)
+
+        edges = haversine_km(
+            point.latitude, point.longitude,
+            np.array([min_lat, max_lat, point.latitude, point.latitude]),
+            np.array([point.longitude, point.longitude, min_lng, max_lng]),
+        )
+        assert np.all(edges >= 4.99)
@@ -0,0 +1,142 @@
+"""Tests for bounding-box, cluster and radius search."""
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.geo import NearPoint
+from app.core.geo_search import bbox_search, bbox_clusters, cluster_cell_degrees, nearby_search
+from app.core.search_engine import hybrid_search
+from app.core.query_parser import ParsedQuery
+from app.models.property import Property
+
+
+class TestBBoxSearch:
+    """Tests for bounding-box search."""
+
+    @pytest.mark.asyncio
+    async def test_box_and_filters_in_query(self):
+        """Should filter by the box and the filter_search conditions."""
+        with patch("app.core.geo_search._fetch_unique", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = []
+
+            properties, truncated = await bbox_search(
+                AsyncMock(), 12.9, 13.0, 77.5, 77.7, city="bangalore", bhk=2, limit=50
+            )
+
+        stmt, limit = mock_fetch.call_args[0][1:]
+        sql = str(stmt.compile(dialect=asyncpg.dialect()))
+        assert "properties.latitude BETWEEN" in sql
+        assert "properties.longitude BETWEEN" in sql
+        assert "properties.bhk =" in sql
+        assert limit == 51
+        assert properties == []
+        assert truncated is False
+
+    @pytest.mark.asyncio
+    async def test_truncated_when_over_cap(self, mock_property):
+        """Should return at most limit rows and flag the extra one."""
+        with patch("app.core.geo_search._fetch_unique", new_callable=AsyncMock) as mock_fetch:
+            mock_fetch.return_value = [mock_property, mock_property]
+
+            properties, truncated = await bbox_search(AsyncMock(), 12.9, 13.0, 77.5, 77.7, limit=1)
+
+        assert len(properties) == 1
+        assert truncated is True
+
+
+class TestBBoxClusters:
+    """Tests for zoom-level grid clustering."""
+
+    def test_cell_size_halves_per_zoom_level(self):
+        """Should shrink grid cells by half for each zoom level."""
+        assert cluster_cell_degrees(11) == cluster_cell_degrees(10) / 2
+
+    @pytest.mark.asyncio
+    async def test_grouped_by_grid_cell(self):
+        """Should aggregate count, centroid and price range per grid cell."""
+        from collections import namedtuple
+        from decimal import Decimal
+
+        Row = namedtuple("Row", ["count", "latitude", "longitude", "min_price", "max_price"])
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = [Row(3, Decimal("19.07"), Decimal("72.88"), Decimal("60"), None)]
+        mock_db.execute.return_value = mock_result
+
+        clusters = await bbox_clusters(mock_db, 18.9, 19.3, 72.7, 73.0, 11, city="mumbai", bhk=2)
+
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        cell = repr(cluster_cell_degrees(11))
+        assert "GROUP BY floor(properties.latitude /" in sql
+        assert sql.count(cell) == 4  # Inlined (not bound) in GROUP BY and ORDER BY
+        assert "properties.bhk =" in sql
+        assert clusters == [
+            {"latitude": 19.07, "longitude": 72.88, "count": 3, "min_price": 60.0, "max_price": None}
+        ]
+
+
+class TestNearbySearch:
+    """Tests for distance-ranked search."""
+
+    def _db(self, candidates, properties):
+        from collections import namedtuple
+
+        Row = namedtuple("Row", ["id", "latitude", "longitude"])
+        candidate_result = MagicMock()
+        candidate_result.all.return_value = [Row(*c) for c in candidates]
+        property_result = MagicMock()
+        property_result.scalars.return_value.all.return_value = properties
+        mock_db = AsyncMock()
+        mock_db.execute.side_effect = [candidate_result, property_result]
+        return mock_db
+
+    @pytest.mark.asyncio
+    async def test_ranked_by_distance_within_radius(self):
+        """Should order by haversine distance and drop candidates outside the radius."""
+        near_id, far_id, outside_id = UUID(int=1), UUID(int=2), UUID(int=3)
+        props = [
+            Property(id=pid, title=f"Flat {i}", area="MG Road", bhk=2, price_lakhs=80)
+            for i, pid in enumerate((near_id, far_id, outside_id))
+        ]
+        mock_db = self._db(
+            [(far_id, 12.990, 77.600), (outside_id, 13.100, 77.600), (near_id, 12.976, 77.601)],
+            props[:2],
+        )
+
+        ranked = await nearby_search(mock_db, NearPoint(12.9756, 77.6066, 3.0), city="bangalore", bhk=2)
+
+        assert [prop.id for prop, _ in ranked] == [near_id, far_id]
+        assert ranked[0][1] < ranked[1][1] <= 3.0
+        sql = str(mock_db.execute.call_args_list[0][0][0].compile(dialect=asyncpg.dialect()))
+        assert "properties.geohash >=" in sql
+        assert "properties.latitude BETWEEN" in sql
+        assert "properties.bhk =" in sql
+
+    @pytest.mark.asyncio
+    async def test_no_rows_loaded_when_none_inside_radius(self):
+        """Should return early without an empty id lookup when every candidate is outside the radius."""
+        mock_db = self._db([(UUID(int=3), 13.100, 77.600)], [])
+
+        ranked = await nearby_search(mock_db, NearPoint(12.9756, 77.6066, 3.0), city="bangalore")
+
+        assert ranked == []
+        assert mock_db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_near_skips_embedding(self, mock_property):
+        """Should run the distance-ranked ladder without generating an embedding."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK near MG Road")
+
+        with patch("app.core.geo_search._nearest", new_callable=AsyncMock) as mock_nearest, \
+             patch("app.core.search_engine.generate_query_embedding", new_callable=AsyncMock) as mock_embed:
+            mock_nearest.side_effect = [[], [(mock_property, 1.2)]]
+
+            result = await hybrid_search(
+                AsyncMock(), parsed, "bangalore", 10, near=NearPoint(12.9756, 77.6066, 2.0)
+            )
+
+        assert result.properties == [mock_property]
+        assert result.relaxed_filters == ["bhk"]
+        mock_embed.assert_not_called()
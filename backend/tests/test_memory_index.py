@@ -0,0 +1,242 @@
+"""Tests for the in-memory search engine."""
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID
+
+import numpy as np
+
+from app.core.memory_index import PropertyColumns, InMemorySearchEngine
+from app.core.cache import DataVersionCache
+from app.core.search_engine import _relaxation_tiers
+from app.core.query_parser import ParsedQuery
+from app.models.property import Property
+
+
+def _uuid(n):
+    return UUID(int=n)
+
+
+def _property(n, title=None, area="Whitefield", bhk=2, price=80, sqft=1200, amenities=None):
+    return Property(
+        id=_uuid(n),
+        city="bangalore",
+        title=title or f"Listing {n}",
+        area=area,
+        bhk=bhk,
+        sqft=sqft,
+        price_lakhs=Decimal(price) if price is not None else None,
+        amenities=amenities or [],
+    )
+
+
+def _embedding(*values):
+    vec = np.zeros(768, dtype=np.float32)
+    vec[:len(values)] = values
+    return vec.tolist()
+
+
+class TestTierMask:
+    """Tests for PropertyColumns.tier_mask."""
+
+    def _columns(self):
+        return PropertyColumns([
+            _property(1, bhk=2, price=80, area="Whitefield", amenities=["gym", "swimming pool"]),
+            _property(2, bhk=3, price=120, area="Koramangala", amenities=["gym"]),
+            _property(3, bhk=2, price=None, area=None),
+        ])
+
+    def test_bhk_and_price(self):
+        """Should apply bhk and price filters like the SQL predicates."""
+        columns = self._columns()
+        mask = columns.tier_mask(ParsedQuery(bhk=2, max_price=100))
+
+        assert mask.tolist() == [True, False, False]
+
+    def test_relaxed_filters_ignored(self):
+        """Should skip filters disabled for the tier."""
+        columns = self._columns()
+        mask = columns.tier_mask(ParsedQuery(bhk=3, area="white"), use_bhk=False)
+
+        assert mask.tolist() == [True, False, False]
+
+    def test_area_substring_case_insensitive(self):
+        """Should match areas by case-insensitive substring."""
+        columns = self._columns()
+
+        assert columns.tier_mask(ParsedQuery(area="KORA")).tolist() == [False, True, False]
+
+    def test_amenities_require_all(self):
+        """Should require every requested amenity."""
+        columns = self._columns()
+
+        assert columns.tier_mask(ParsedQuery(amenities=["gym", "pool"])).tolist() == [True, False, False]
+
+    def test_unknown_amenity_matches_nothing(self):
+        """Should return an empty mask for amenities absent from the data."""
+        columns = self._columns()
+
+        assert not columns.tier_mask(ParsedQuery(amenities=["lift"])).any()
+
+
+class TestRankAndTopK:
+    """Tests for ranking and deduplicated top-k selection."""
+
+    def test_orders_by_cosine_distance(self):
+        """Should rank rows by cosine distance to the query."""
+        properties = [_property(1), _property(2), _property(3)]
+        embeddings = [_embedding(0, 1), _embedding(1, 0), _embedding(1, 1)]
+        columns = PropertyColumns(properties, embeddings)
+
+        rank = columns.rank(_embedding(2, 0))
+        result = columns.top_unique(np.ones(3, dtype=bool), rank, 3)
+
+        assert [p.id for p in result] == [_uuid(2), _uuid(3), _uuid(1)]
+
+    def test_missing_embeddings_ranked_last(self):
+        """Should place rows without embeddings after embedded rows."""
+        columns = PropertyColumns([_property(1), _property(2)], [None, _embedding(0, 1)])
+
+        result = columns.top_unique(np.ones(2, dtype=bool), columns.rank(_embedding(1, 0)), 2)
+
+        assert [p.id for p in result] == [_uuid(2), _uuid(1)]
+
+    def test_sql_order_without_embedding(self):
+        """Should order by price, NULLs last, with id as tiebreak."""
+        columns = PropertyColumns([
+            _property(3, price=50), _property(1, price=None), _property(2, price=50), _property(4, price=20),
+        ])
+
+        result = columns.top_unique(np.ones(4, dtype=bool), columns.rank(None), 4)
+
+        assert [p.id for p in result] == [_uuid(4), _uuid(2), _uuid(3), _uuid(1)]
+
+    def test_deduplicates_and_fills_page(self):
+        """Should widen the candidate window until the page is full of unique rows."""
+        properties = [_property(i, title="Same") for i in range(1, 6)]
+        properties.append(_property(6, title="Other", price=500))
+        columns = PropertyColumns(properties)
+
+        result = columns.top_unique(np.ones(6, dtype=bool), columns.rank(None), 2)
+
+        assert [p.title for p in result] == ["Same", "Other"]
+
+
+class TestInMemorySearchEngine:
+    """Tests for snapshot loading and ladder evaluation."""
+
+    def _engine(self, properties, embeddings=None):
+        engine = InMemorySearchEngine(DataVersionCache(refresh_seconds=0))
+        engine._load = AsyncMock(return_value=PropertyColumns(properties, embeddings))
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_returns_first_matching_tier(self):
+        """Should relax the ladder like the SQL search."""
+        engine = self._engine([_property(1, bhk=3, area="Whitefield")])
+        parsed = ParsedQuery(bhk=2, area="Whitefield", raw_query="2bhk whitefield")
+
+        with patch("app.core.cache.get_data_versions", AsyncMock(return_value={"bangalore": 1})):
+            result = await engine.search(AsyncMock(), parsed, "bangalore", 10, None, _relaxation_tiers(parsed))
+
+        assert result.match_type == "partial"
+        assert result.relaxed_filters == ["bhk"]
+        assert [p.id for p in result.properties] == [_uuid(1)]
+
+    @pytest.mark.asyncio
+    async def test_no_match_returns_last_tier(self):
+        """Should report the last tier when nothing matches."""
+        engine = self._engine([])
+        parsed = ParsedQuery(bhk=2, raw_query="2bhk")
+
+        with patch("app.core.cache.get_data_versions", AsyncMock(return_value={})):
+            result = await engine.search(AsyncMock(), parsed, "bangalore", 10, None, _relaxation_tiers(parsed))
+
+        assert result.properties == []
+        assert result.match_type == "similar"
+
+    @pytest.mark.asyncio
+    async def test_reloads_on_version_change(self):
+        """Should reload only when the city's data version changes."""
+        engine = self._engine([_property(1)])
+        versions = AsyncMock(side_effect=[{"bangalore": 1}, {"bangalore": 1}, {"bangalore": 2}])
+
+        with patch("app.core.cache.get_data_versions", versions):
+            await engine.get_index(AsyncMock(), "bangalore")
+            await engine.get_index(AsyncMock(), "bangalore")
+            index = await engine.get_index(AsyncMock(), "bangalore")
+
+        assert engine._load.await_count == 2
+        assert index.version == 2
+
+    @pytest.mark.asyncio
+    async def test_no_snapshot_without_data_versions(self):
+        """Should not load snapshots when data versions are unavailable."""
+        engine = self._engine([_property(1)])
+        parsed = ParsedQuery(bhk=2, raw_query="2bhk")
+        versions = MagicMock()
+        versions.get = AsyncMock(return_value=None)
+        engine.versions = versions
+
+        result = await engine.search(AsyncMock(), parsed, "bangalore", 10, None, _relaxation_tiers(parsed))
+
+        assert result is None
+        engine._load.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_load_builds_columns_from_rows(self):
+        """Should build transient properties and embeddings from the query rows."""
+        engine = InMemorySearchEngine(DataVersionCache(refresh_seconds=0))
+        row = (_uuid(1), "bangalore", "Flat", "Whitefield", 2, 1200, 2, Decimal(80), ["gym"], None, None, _embedding(1))
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = [row]
+        mock_db.execute.return_value = mock_result
+
+        columns = await engine._load(mock_db, "bangalore")
+
+        assert len(columns) == 1
+        assert columns.properties[0].title == "Flat"
+        assert columns.has_embedding.tolist() == [True]
+
+
+class TestHybridSearchMemoryBackend:
+    """Tests for the search_backend dispatch in hybrid_search."""
+
+    @pytest.mark.asyncio
+    async def test_dispatches_to_memory_engine(self, mock_embedding):
+        """Should answer from the in-memory engine without SQL ranking."""
+        from app.core.search_engine import hybrid_search
+
+        engine = MagicMock()
+        engine.search = AsyncMock(return_value="result")
+        parsed = ParsedQuery(bhk=2, raw_query="2bhk")
+
+        with patch("app.core.search_engine.settings") as mock_settings, \
+             patch("app.core.memory_index.get_memory_search_engine", return_value=engine):
+            mock_settings.search_backend = "memory"
+            result = await hybrid_search(AsyncMock(), parsed, "bangalore", query_embedding=[0.1] * 768)
+
+        assert result == "result"
+        args = engine.search.await_args.args
+        assert args[2] == "bangalore"
+        assert args[4] == [0.1] * 768
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_postgres_without_snapshot(self, mock_property, mock_embedding):
+        """Should run the Postgres ladder when the memory engine has no snapshot."""
+        from app.core.search_engine import hybrid_search
+
+        engine = MagicMock()
+        engine.search = AsyncMock(return_value=None)
+        parsed = ParsedQuery(bhk=2, raw_query="2bhk")
+
+        with patch("app.core.search_engine.settings.search_backend", "memory"), \
+             patch("app.core.search_engine._search_with_filters", new_callable=AsyncMock) as mock_search, \
+             patch("app.core.memory_index.get_memory_search_engine", return_value=engine):
+            mock_search.return_value = [mock_property]
+            result = await hybrid_search(AsyncMock(), parsed, "bangalore", query_embedding=[0.1] * 768)
+
+        engine.search.assert_awaited_once()
+        assert result.properties == [mock_property]
+        assert result.match_type == "exact"
@@ -1,9 +1,14 @@
 """Tests for model classes."""
 import pytest
 from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID, uuid4
 
-from app.models.property import Property
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+
+from app.models.property import Property, _set_embedding_bits, _set_geohash
+from app.repositories.property_repo import get_property_by_id
 
 
 class TestPropertyModel:
@@ -96,3 +101,65 @@ class TestPropertyModel:
         assert isinstance(result["latitude"], float)
         assert isinstance(result["longitude"], float)
         assert result["price_lakhs"] == 150.75
+
+
+class TestEmbeddingDeferred:
+    """Tests for the deferred embedding column."""
+
+    def test_select_excludes_embedding(self):
+        """Should not load the embedding for plain entity selects."""
+        assert "embedding" not in str(select(Property))
+
+    def test_undefer_includes_embedding(self):
+        """Should load the embedding only when explicitly undeferred."""
+        assert "properties.embedding" in str(select(Property).options(undefer(Property.embedding)))
+
+    @pytest.mark.asyncio
+    async def test_get_property_by_id_with_embedding(self):
+        """Should undefer the embedding when requested."""
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = MagicMock()
+
+        await get_property_by_id(mock_db, UUID("12345678-1234-5678-1234-567812345678"), with_embedding=True)
+
+        assert "properties.embedding" in str(mock_db.execute.call_args[0][0])
+
+
+class TestGeohashSync:
+    """Tests for keeping Property.geohash in sync with the coordinates."""
+
+    def test_set_from_coordinates(self):
+        """Should compute the geohash from latitude/longitude."""
+        prop = Property(city="bangalore", latitude=Decimal("12.9716"), longitude=Decimal("77.5946"))
+
+        _set_geohash(None, None, prop)
+
+        assert prop.geohash == "tdr1v9qtj"
+
+    def test_cleared_without_coordinates(self):
+        """Should clear the geohash when a coordinate is missing."""
+        prop = Property(city="bangalore", latitude=None, longitude=Decimal("77.5946"), geohash="tdr1v9qtj")
+
+        _set_geohash(None, None, prop)
+
+        assert prop.geohash is None
+
+
+class TestEmbeddingBits:
+    """Tests for keeping the binary embedding code in sync."""
+
+    def test_set_from_assigned_embedding(self):
+        """Should quantize a newly assigned embedding."""
+        prop = Property(city="bangalore", embedding=[0.5, -0.5] * 384)
+
+        _set_embedding_bits(None, None, prop)
+
+        assert prop.embedding_bits == "10" * 384
+
+    def test_untouched_without_embedding_change(self):
+        """Should leave the code alone when the embedding was not assigned."""
+        prop = Property(city="bangalore", embedding_bits="1" * 768)
+
+        _set_embedding_bits(None, None, prop)
+
+        assert prop.embedding_bits == "1" * 768
@@ -0,0 +1,43 @@
+"""Tests for neighbour repository."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID
+
+from app.repositories.neighbor_repo import get_neighbors, replace_city_neighbors
+
+
+class TestGetNeighbors:
+    """Tests for get_neighbors."""
+
+    @pytest.mark.asyncio
+    async def test_returns_row_with_build_version(self):
+        """Should return the stored ids with their build's city and version, or None without a row."""
+        row = MagicMock(neighbor_ids=[UUID(int=2), UUID(int=3)], city="bangalore", data_version=4)
+        mock_result = MagicMock()
+        mock_result.one_or_none.side_effect = [row, None]
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = mock_result
+
+        assert await get_neighbors(mock_db, UUID(int=1)) is row
+        assert await get_neighbors(mock_db, UUID(int=1)) is None
+        sql = str(mock_db.execute.call_args[0][0])
+        assert "JOIN neighbor_builds ON neighbor_builds.city = properties.city" in sql
+
+
+class TestReplaceCityNeighbors:
+    """Tests for replace_city_neighbors."""
+
+    @pytest.mark.asyncio
+    async def test_replaces_rows_and_records_version(self):
+        """Should delete, insert, record the build version and commit once."""
+        mock_db = AsyncMock()
+        rows = [{"property_id": UUID(int=1), "neighbor_ids": [UUID(int=2)], "distances": [0.1]}]
+
+        await replace_city_neighbors(mock_db, "bangalore", 4, rows)
+
+        statements = [str(call[0][0]) for call in mock_db.execute.call_args_list]
+        assert statements[0].startswith("DELETE FROM property_neighbors")
+        assert statements[1].startswith("INSERT INTO property_neighbors")
+        assert mock_db.execute.call_args_list[1][0][1] == rows
+        assert "neighbor_builds" in statements[2]
+        mock_db.commit.assert_awaited_once()
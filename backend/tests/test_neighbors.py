@@ -0,0 +1,52 @@
+"""Tests for offline nearest-neighbour computation."""
+import numpy as np
+
+from app.core.neighbors import normalize_rows, recall_at_k, top_k_neighbors
+
+
+class TestTopKNeighbors:
+    """Tests for blocked top-k neighbour search."""
+
+    def test_matches_brute_force(self):
+        """Should match a full similarity matrix regardless of block size."""
+        rng = np.random.default_rng(0)
+        embeddings = rng.normal(size=(50, 16)).astype(np.float32)
+
+        indices, distances = top_k_neighbors(embeddings, k=5, block_size=7)
+
+        matrix = normalize_rows(embeddings)
+        similarity = matrix @ matrix.T
+        np.fill_diagonal(similarity, -np.inf)
+        expected = np.argsort(-similarity, axis=1, kind="stable")[:, :5]
+        np.testing.assert_array_equal(indices, expected)
+        np.testing.assert_allclose(distances, 1 - np.take_along_axis(similarity, expected, axis=1), atol=1e-6)
+
+    def test_excludes_self_and_orders_nearest_first(self):
+        """Should never return a row as its own neighbour."""
+        embeddings = np.array([[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+
+        indices, distances = top_k_neighbors(embeddings, k=5)
+
+        assert indices.shape == (3, 2)
+        assert list(indices[0]) == [1, 2]
+        assert all(i not in row for i, row in enumerate(indices))
+        assert np.all(np.diff(distances, axis=1) >= 0)
+
+    def test_single_row(self):
+        """Should return no neighbours for a single property."""
+        indices, distances = top_k_neighbors(np.ones((1, 4)), k=3)
+
+        assert indices.shape == (1, 0)
+
+
+class TestRecallAtK:
+    """Tests for recall@k."""
+
+    def test_partial_overlap(self):
+        """Should count expected ids found in the first k results."""
+        assert recall_at_k(["a", "b", "c", "d"], ["b", "x", "a", "c"], k=2) == 0.5
+        assert recall_at_k(["a", "b"], ["b", "a"], k=2) == 1.0
+
+    def test_empty_expected(self):
+        """Should treat an empty ground truth as fully recalled."""
+        assert recall_at_k([], ["a"], k=10) == 1.0
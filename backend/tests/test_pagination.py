@@ -0,0 +1,94 @@
+"""Tests for search pagination cursors."""
+import pytest
+from unittest.mock import MagicMock
+from uuid import UUID
+
+from app.core.pagination import SearchCursor, next_search_cursor
+from app.core.query_parser import ParsedQuery
+from app.core.search_engine import SearchResult
+from app.core.exceptions import ValidationError
+
+
+def _cursor(**overrides):
+    fields = dict(
+        parsed_query=ParsedQuery(bhk=2, amenities=["gym"], raw_query="2BHK with gym"),
+        city="bangalore",
+        match_type="partial",
+        relaxed_filters=["amenities"],
+        after_id=UUID("12345678-1234-5678-1234-567812345678"),
+    )
+    fields.update(overrides)
+    return SearchCursor(**fields)
+
+
+class TestSearchCursor:
+    """Tests for cursor encoding."""
+
+    def test_roundtrip(self):
+        """Should decode what it encodes."""
+        cursor = SearchCursor.decode(_cursor().encode())
+
+        assert cursor.parsed_query.raw_query == "2BHK with gym"
+        assert cursor.city == "bangalore"
+        assert cursor.after_id == UUID("12345678-1234-5678-1234-567812345678")
+        assert cursor.tier.use_amenities is False
+        assert cursor.tier.use_bhk is True
+
+    def test_position_defaults_to_zero(self):
+        """Should decode cursors issued without a position."""
+        import base64
+        import json
+
+        payload = json.loads(base64.urlsafe_b64decode(_cursor(position=3).encode() + "=="))
+        del payload["p"]
+        token = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        assert SearchCursor.decode(_cursor(position=3).encode()).position == 3
+        assert SearchCursor.decode(token).position == 0
+
+    def test_url_safe(self):
+        """Should only contain URL-safe characters."""
+        token = _cursor().encode()
+
+        assert "=" not in token and "+" not in token and "/" not in token
+
+    @pytest.mark.parametrize("token", ["garbage!", "e30", ""])
+    def test_malformed(self, token):
+        """Should reject cursors that do not decode."""
+        with pytest.raises(ValidationError):
+            SearchCursor.decode(token)
+
+    def test_unknown_tier(self):
+        """Should reject cursors whose tier is not in the query's ladder."""
+        token = _cursor(relaxed_filters=["price"]).encode()
+
+        with pytest.raises(ValidationError):
+            SearchCursor.decode(token)
+
+
+class TestNextSearchCursor:
+    """Tests for next_search_cursor."""
+
+    def _result(self, count):
+        properties = []
+        for i in range(count):
+            prop = MagicMock()
+            prop.id = UUID(int=i + 1)
+            properties.append(prop)
+        return SearchResult(properties, "exact", [])
+
+    def test_full_page_has_cursor(self):
+        """Should point after the last property of a full page."""
+        token = next_search_cursor(ParsedQuery(bhk=2, raw_query="2BHK"), "", self._result(2), 2)
+
+        assert SearchCursor.decode(token).after_id == UUID(int=2)
+
+    def test_position_counts_returned_results(self):
+        """Should add the page to the results returned before it."""
+        token = next_search_cursor(ParsedQuery(bhk=2, raw_query="2BHK"), "", self._result(2), 2, position=4)
+
+        assert SearchCursor.decode(token).position == 6
+
+    def test_short_page_is_last(self):
+        """Should return None when fewer results than the limit came back."""
+        assert next_search_cursor(ParsedQuery(raw_query="flats"), "", self._result(1), 2) is None
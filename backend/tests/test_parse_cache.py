@@ -0,0 +1,138 @@
+"""Tests for the SQLite parse cache."""
+import asyncio
+import sqlite3
+import time
+
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from app.core.parse_cache import ParseCache, CachedParseFailure
+from app.core.query_parser import parse_query
+from app.core.exceptions import LLMError
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(str(tmp_path / "parse.sqlite3"), "ollama:llama3.2:abc", ttl=3600, negative_ttl=30)
+
+
+class TestParseCache:
+    """Tests for ParseCache storage."""
+
+    def test_roundtrip_with_normalized_key(self, cache):
+        """Should return stored fields for case/whitespace variants."""
+        cache.set("2BHK  in Whitefield", {"bhk": 2, "area": "Whitefield"})
+
+        assert cache.get("2bhk in whitefield") == {"bhk": 2, "area": "Whitefield"}
+        assert cache.stats()["hits"] == 1
+
+    def test_shared_across_instances(self, cache):
+        """Should be visible to other processes using the same file."""
+        cache.set("gym flats", {"amenities": ["gym"]})
+        other = ParseCache(cache.path, cache.namespace, ttl=3600, negative_ttl=30)
+
+        assert other.get("gym flats") == {"amenities": ["gym"]}
+
+    def test_namespace_isolates_entries(self, cache):
+        """Should not serve parses made with another model or prompt."""
+        cache.set("gym flats", {"amenities": ["gym"]})
+        other = ParseCache(cache.path, "groq:llama-3.1-8b-instant:abc", ttl=3600, negative_ttl=30)
+
+        assert other.get("gym flats") is None
+
+    def test_expired_entry_is_miss(self, cache):
+        """Should ignore entries past their TTL."""
+        cache.set("gym flats", {"amenities": ["gym"]})
+
+        with patch("app.core.parse_cache.time.time", return_value=10**12):
+            assert cache.get("gym flats") is None
+
+    def test_negative_entry(self, cache):
+        """Should return failures as CachedParseFailure."""
+        cache.set_failure("gym flats", "Rate limited")
+
+        cached = cache.get("gym flats")
+
+        assert isinstance(cached, CachedParseFailure)
+        assert cached.message == "Rate limited"
+        assert cache.stats()["negative_hits"] == 1
+
+    def test_unusable_file_treated_as_miss(self, tmp_path):
+        """Should degrade to misses when the database cannot be opened."""
+        broken = ParseCache(str(tmp_path / "missing" / "parse.sqlite3"), "ns", ttl=3600, negative_ttl=30)
+
+        broken.set("gym flats", {"bhk": 2})
+        assert broken.get("gym flats") is None
+
+    def test_locked_database_skips_write(self, cache):
+        """Should skip a write quickly instead of waiting on another worker's lock."""
+        cache.get("warm up")  # Creates the schema
+        other = sqlite3.connect(cache.path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        try:
+            started = time.perf_counter()
+            cache.set("gym flats", {"bhk": 2})
+            assert time.perf_counter() - started < 0.5
+        finally:
+            other.execute("ROLLBACK")
+            other.close()
+
+        assert cache.get("gym flats") is None
+
+    @pytest.mark.asyncio
+    async def test_async_wrappers_run_in_thread(self, cache):
+        """Should run SQLite calls off the event loop."""
+        with patch("app.core.parse_cache.asyncio.to_thread", wraps=asyncio.to_thread) as mock_thread:
+            await cache.aset("gym flats", {"amenities": ["gym"]})
+            assert await cache.aget("gym flats") == {"amenities": ["gym"]}
+
+        assert mock_thread.call_count == 2
+
+
+class TestParseQueryCaching:
+    """Tests for parse_query with the parse cache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_llm(self, cache):
+        """Should call the LLM once for repeated queries and keep the raw query."""
+        mock_provider = MagicMock()
+        mock_provider.chat = AsyncMock(return_value='{"bhk": 2, "area": "Whitefield"}')
+
+        with patch("app.core.query_parser.get_parse_cache", return_value=cache), \
+             patch("app.core.query_parser.get_llm_provider", return_value=mock_provider):
+            first = await parse_query("Spacious 2BHK in Whitefield")
+            second = await parse_query("spacious 2bhk  in whitefield")
+
+        mock_provider.chat.assert_awaited_once()
+        assert second.bhk == first.bhk == 2
+        assert second.inferred_city == "bangalore"
+        assert second.raw_query == "spacious 2bhk  in whitefield"
+
+    @pytest.mark.asyncio
+    async def test_llm_error_negative_cached(self, cache):
+        """Should re-raise a cached LLMError without calling the LLM again."""
+        mock_provider = MagicMock()
+        mock_provider.chat = AsyncMock(side_effect=LLMError("Rate limited"))
+
+        with patch("app.core.query_parser.get_parse_cache", return_value=cache), \
+             patch("app.core.query_parser.get_llm_provider", return_value=mock_provider):
+            for _ in range(2):
+                with pytest.raises(LLMError, match="Rate limited"):
+                    await parse_query("sea facing flats")
+
+        mock_provider.chat.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_fallback_negative_cached(self, cache):
+        """Should return the empty fallback for a cached unexpected failure."""
+        mock_provider = MagicMock()
+        mock_provider.chat = AsyncMock(side_effect=RuntimeError("bad response"))
+
+        with patch("app.core.query_parser.get_parse_cache", return_value=cache), \
+             patch("app.core.query_parser.get_llm_provider", return_value=mock_provider):
+            await parse_query("sea facing flats")
+            result = await parse_query("sea facing flats")
+
+        mock_provider.chat.assert_awaited_once()
+        assert result.raw_query == "sea facing flats"
+        assert result.amenities == []
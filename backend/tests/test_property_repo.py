@@ -10,6 +10,8 @@ from app.repositories.property_repo import (
     get_areas_by_city,
     create_property,
     update_property_embedding,
+    backfill_geohashes,
+    backfill_embedding_bits,
 )
 
 
@@ -202,3 +204,60 @@ class TestUpdatePropertyEmbedding:
         await update_property_embedding(mock_db, property_id, embedding)
 
         mock_db.commit.assert_not_called()
+
+
+class TestBackfillGeohashes:
+    """Tests for backfill_geohashes."""
+
+    @pytest.mark.asyncio
+    async def test_updates_missing_geohashes(self):
+        """Should compute and write geohashes in one executemany."""
+        row = MagicMock()
+        row.id = UUID("12345678-1234-5678-1234-567812345678")
+        row.latitude = 12.9716
+        row.longitude = 77.5946
+        mock_result = MagicMock()
+        mock_result.all.return_value = [row]
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = mock_result
+
+        assert await backfill_geohashes(mock_db) == 1
+
+        params = mock_db.execute.call_args_list[1][0][1]
+        assert params == [{"row_id": row.id, "row_geohash": "tdr1v9qtj"}]
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_backfill(self):
+        """Should not issue an update when every row has a geohash."""
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db = AsyncMock()
+        mock_db.execute.return_value = mock_result
+
+        assert await backfill_geohashes(mock_db) == 0
+        mock_db.execute.assert_called_once()
+
+
+class TestBackfillEmbeddingBits:
+    """Tests for backfill_embedding_bits."""
+
+    @pytest.mark.asyncio
+    async def test_updates_in_batches(self):
+        """Should quantize each batch of embeddings until none are missing a code."""
+        row = MagicMock()
+        row.id = UUID("12345678-1234-5678-1234-567812345678")
+        row.embedding = [0.5, -0.5] * 384
+        batch = MagicMock()
+        batch.all.return_value = [row]
+        done = MagicMock()
+        done.all.return_value = []
+        mock_db = AsyncMock()
+        mock_db.execute.side_effect = [batch, None, done]
+
+        assert await backfill_embedding_bits(mock_db, "bangalore") == 1
+
+        select_sql = str(mock_db.execute.call_args_list[0][0][0])
+        assert "embedding_bits IS NULL" in select_sql
+        assert "properties.city =" in select_sql
+        params = mock_db.execute.call_args_list[1][0][1]
+        assert params == [{"row_id": row.id, "row_bits": "10" * 384}]
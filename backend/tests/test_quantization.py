@@ -0,0 +1,17 @@
+"""Tests for binary quantization of embeddings."""
+from app.core.quantization import BINARY_CODE_BITS, binary_quantize
+
+
+class TestBinaryQuantize:
+    """Tests for binary_quantize."""
+
+    def test_sign_bits(self):
+        """Should set a bit for each strictly positive dimension."""
+        assert binary_quantize([0.5, -0.2, 0.0, 1e-9]) == "1001"
+
+    def test_embedding_length(self):
+        """Should produce one bit per embedding dimension."""
+        code = binary_quantize([0.1] * BINARY_CODE_BITS)
+
+        assert len(code) == BINARY_CODE_BITS
+        assert set(code) == {"1"}
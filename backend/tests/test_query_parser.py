@@ -6,6 +6,8 @@ from app.core.query_parser import (
     extract_json,
     infer_city_from_area,
     parse_query,
+    rule_based_parse,
+    parser_stats,
     ParsedQuery,
     AREA_CITY_MAP,
 )
@@ -204,6 +206,29 @@ class TestParseQuery:
         call_args = mock_ollama.call_args
         assert call_args[1]["options"]["temperature"] == 0
 
+    @pytest.mark.asyncio
+    async def test_parse_query_normalizes_amenities(self, mock_ollama):
+        """Should map amenity synonyms to the canonical vocabulary."""
+        mock_ollama.return_value = {
+            "message": {
+                "content": '{"bhk": 2, "amenities": ["Pool", "elevator", "gym", "gyms"]}'
+            }
+        }
+        result = await parse_query("2BHK with pool, elevator and gym")
+
+        assert result.amenities == ["swimming pool", "lift", "gym"]
+
+    @pytest.mark.asyncio
+    async def test_parse_query_null_amenities(self, mock_ollama):
+        """Should treat null amenities as an empty list."""
+        mock_ollama.return_value = {
+            "message": {"content": '{"bhk": 2, "amenities": null}'}
+        }
+        result = await parse_query("2BHK")
+
+        assert result.bhk == 2
+        assert result.amenities == []
+
     @pytest.mark.asyncio
     async def test_parse_empty_query(self):
         """Should return empty ParsedQuery for empty input."""
@@ -245,6 +270,138 @@ class TestParseQuery:
             assert result.bhk is None
 
 
+class TestRuleBasedParse:
+    """Tests for the rule-based parser fast path."""
+
+    def test_bhk_and_area(self):
+        """Should extract BHK and a mapped area with its city."""
+        parsed, complete = rule_based_parse("3BHK in Koramangala")
+
+        assert parsed.bhk == 3
+        assert parsed.area == "Koramangala"
+        assert parsed.inferred_city == "bangalore"
+        assert complete
+
+    @pytest.mark.parametrize("query,area", [
+        ("2bhk in hsr layout", "HSR Layout"),
+        ("flat near mg road", "MG Road"),
+        ("3bhk jp nagar", "JP Nagar"),
+        ("flats in whitefield", "Whitefield"),
+    ])
+    def test_area_display_spelling(self, query, area):
+        """Should report areas in their canonical spelling, not str.title()."""
+        parsed, complete = rule_based_parse(query)
+
+        assert parsed.area == area
+        assert complete
+
+    def test_longest_area_wins(self):
+        """Should prefer multi-word areas over their prefixes."""
+        parsed, _ = rule_based_parse("flat in bandra west")
+
+        assert parsed.area == "Bandra West"
+        assert parsed.inferred_city == "mumbai"
+
+    @pytest.mark.parametrize("query,min_price,max_price", [
+        ("under 80L", None, 80),
+        ("below 1.5 crore", None, 150),
+        ("above 50 lakhs", 50, None),
+        ("between 50L to 1.2Cr", 50, 120),
+        ("from 1cr to 2cr", 100, 200),
+        ("50 - 80 lacs", 50, 80),
+    ])
+    def test_price_units(self, query, min_price, max_price):
+        """Should convert Cr/L/lakh amounts to lakhs."""
+        parsed, complete = rule_based_parse(query)
+
+        assert parsed.min_price == min_price
+        assert parsed.max_price == max_price
+        assert complete
+
+    def test_sqft(self):
+        """Should read sqft ranges and treat a bare size as a minimum."""
+        assert rule_based_parse("1500 sqft")[0].min_sqft == 1500
+        parsed, _ = rule_based_parse("1,200 to 1,500 sq ft")
+        assert (parsed.min_sqft, parsed.max_sqft) == (1200, 1500)
+
+    def test_amenities_in_query_order(self):
+        """Should extract amenities through the synonym lexicon."""
+        parsed, _ = rule_based_parse("2BHK with pool, elevator and gym")
+
+        assert parsed.amenities == ["swimming pool", "lift", "gym"]
+
+    def test_loose_synonyms_not_amenities(self):
+        """Should not read generic words like "park" as amenity requirements."""
+        parsed, complete = rule_based_parse("2bhk not near park street")
+
+        assert parsed.amenities == []
+        assert not complete
+
+    def test_unknown_words_incomplete(self):
+        """Should not count a query as fully parsed when any word is left uninterpreted."""
+        parsed, complete = rule_based_parse("3bhk near metro in whitefield")
+
+        assert parsed.bhk == 3
+        assert not complete
+
+    @pytest.mark.parametrize("query", [
+        "2 bhk flat under 80 lakhs in whitefield without gym",
+        "2 bhk flat for sale under 80 lakhs in hsr",
+        "3bhk in koramangala no pool",
+    ])
+    def test_long_queries_with_leftovers_go_to_llm(self, query):
+        """Should not let many understood words outweigh a negation or an unknown word."""
+        assert rule_based_parse(query)[1] is False
+
+    def test_consumed_negation_is_fine(self):
+        """Should still fully parse a query whose "not" was part of a price phrase."""
+        parsed, complete = rule_based_parse("2bhk not more than 80 lakhs")
+
+        assert parsed.max_price == 80
+        assert complete
+
+    @pytest.mark.parametrize("query", [
+        "cheap spacious flat",
+        "above 2Cr under 1Cr",
+        "2BHK in Powai or Bandra",
+    ])
+    def test_ambiguous_queries_incomplete(self, query):
+        """Should not fully parse queries without filters, with conflicting ranges or several areas."""
+        assert rule_based_parse(query)[1] is False
+
+    @pytest.mark.asyncio
+    async def test_parse_query_skips_llm_when_complete(self):
+        """Should answer fully parsed queries without the LLM provider."""
+        before = parser_stats()["rules"]
+
+        with patch("app.core.query_parser.get_llm_provider") as mock_get_provider:
+            result = await parse_query("2BHK under 1Cr with gym")
+
+        mock_get_provider.assert_not_called()
+        assert result.bhk == 2
+        assert result.raw_query == "2BHK under 1Cr with gym"
+        assert parser_stats()["rules"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_parse_query_uses_llm_when_incomplete(self, mock_ollama):
+        """Should fall through to the LLM for partially parsed queries."""
+        before = parser_stats()["llm"]
+
+        await parse_query("3bhk near metro in whitefield")
+
+        mock_ollama.assert_called_once()
+        assert parser_stats()["llm"] == before + 1
+
+    @pytest.mark.asyncio
+    async def test_rule_parser_disabled(self, mock_ollama):
+        """Should always call the LLM when the rule parser is disabled."""
+        with patch("app.core.query_parser.settings") as mock_settings:
+            mock_settings.rule_parser_enabled = False
+            await parse_query("2BHK")
+
+        mock_ollama.assert_called_once()
+
+
 class TestAreaCityMap:
     """Tests for AREA_CITY_MAP completeness."""
 
@@ -1,9 +1,39 @@
 """Tests for search engine module."""
+import asyncio
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
-
-from app.core.search_engine import SearchResult, hybrid_search, _search_with_filters, filter_search
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.search_engine import (
+    SearchResult,
+    hybrid_search,
+    _search_with_filters,
+    _search_ladder_single_statement,
+    _search_ladder_parallel,
+    _search_ladder_candidates,
+    _relaxation_tiers,
+    filter_search,
+    _fetch_unique,
+    search_after,
+    find_relaxation_tier,
+    _search_params,
+)
+from app.core.similarity import vector_top_k_ids
 from app.core.query_parser import ParsedQuery
+from app.models.property import Property
+
+
+@pytest.fixture
+def mock_db():
+    """Mock session whose queries return no rows."""
+    mock_db = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = []
+    mock_db.execute.return_value = mock_result
+    return mock_db
 
 
 class TestSearchResult:
@@ -273,6 +303,656 @@ class TestHybridSearch:
             assert "area" not in result.relaxed_filters
 
 
+class TestPrecomputedEmbedding:
+    """Tests for passing a precomputed query embedding to hybrid_search."""
+
+    @pytest.mark.asyncio
+    async def test_skips_generation(self, mock_property, mock_embedding):
+        """Should not generate an embedding when one is supplied."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine._search_with_filters", new_callable=AsyncMock) as mock_search:
+            mock_search.return_value = [mock_property]
+
+            await hybrid_search(AsyncMock(), parsed, "bangalore", 10, query_embedding=[0.2] * 768)
+
+        mock_embedding.assert_not_called()
+        assert mock_search.call_args[0][1] == [0.2] * 768
+
+
+class TestSqlOnlySearch:
+    """Tests for the SQL-only path used with the no-op embedding provider."""
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_skips_embedding(self, mock_property, mock_embedding):
+        """Should not generate an embedding when vector search is disabled."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine.vector_search_enabled", return_value=False), \
+             patch("app.core.search_engine._search_with_filters", new_callable=AsyncMock) as mock_search:
+            mock_search.return_value = [mock_property]
+
+            result = await hybrid_search(AsyncMock(), parsed, "bangalore", 10)
+
+        mock_embedding.assert_not_called()
+        assert mock_search.call_args[0][1] is None
+        assert result.match_type == "exact"
+
+    @pytest.mark.asyncio
+    async def test_orders_by_price_without_embedding(self):
+        """Should order by the SQL sort instead of vector distance."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        await _search_with_filters(mock_db, None, parsed, city="bangalore", limit=10)
+
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "<=>" not in sql
+        assert "ORDER BY properties.price_lakhs, properties.id" in sql
+
+    @pytest.mark.asyncio
+    async def test_single_statement_without_embedding(self):
+        """Should evaluate the single-statement ladder without a vector."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+        tiers = _relaxation_tiers(parsed)
+
+        await _search_ladder_single_statement(mock_db, None, parsed, "bangalore", 10, tiers)
+
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "<=>" not in sql
+
+    @pytest.mark.asyncio
+    async def test_filter_search_price_per_sqft(self):
+        """Should order filter_search by price per sqft when requested."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        await filter_search(mock_db, city="bangalore", min_sqft=800, order_by="price_per_sqft")
+
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "ORDER BY properties.price_lakhs / CAST(nullif(properties.sqft, 0) AS NUMERIC)" in sql
+        assert "properties.sqft >=" in sql
+
+
+class TestVectorIndexParams:
+    """Tests for per-search ANN index parameters."""
+
+    @pytest.mark.asyncio
+    async def test_params_applied_once(self, mock_property, mock_embedding):
+        """Should set ef_search/probes once per search, not per tier."""
+        mock_db = AsyncMock()
+        parsed = ParsedQuery(bhk=5, area="Whitefield", raw_query="5BHK in Whitefield")
+
+        with patch("app.core.search_engine._search_with_filters", new_callable=AsyncMock) as mock_search:
+            mock_search.side_effect = [[], [], [mock_property]]
+
+            await hybrid_search(mock_db, parsed, "bangalore", 10, ef_search=100, probes=10)
+
+        mock_db.execute.assert_called_once()
+        params = mock_db.execute.call_args[0][0].compile().params
+        assert set(params.values()) == {
+            "hnsw.ef_search", "100", "hnsw.iterative_scan", "relaxed_order", "ivfflat.probes", "10", True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_iterative_scan_by_default(self, mock_property, mock_embedding):
+        """Should only enable the relaxed-order iterative scan when nothing else is configured."""
+        mock_db = AsyncMock()
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine._search_with_filters", new_callable=AsyncMock) as mock_search:
+            mock_search.return_value = [mock_property]
+
+            await hybrid_search(mock_db, parsed, "bangalore", 10)
+
+        params = mock_db.execute.call_args[0][0].compile().params
+        assert set(params.values()) == {"hnsw.iterative_scan", "relaxed_order", True}
+
+    @pytest.mark.asyncio
+    async def test_no_params_when_unset(self, mock_property, mock_embedding):
+        """Should not issue an extra statement when nothing is configured."""
+        mock_db = AsyncMock()
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine._search_with_filters", new_callable=AsyncMock) as mock_search, \
+             patch("app.core.search_engine.settings.hnsw_iterative_scan", ""):
+            mock_search.return_value = [mock_property]
+
+            await hybrid_search(mock_db, parsed, "bangalore", 10)
+
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_params_without_embedding(self, mock_property):
+        """Should skip ANN parameters on the SQL-only path."""
+        mock_db = AsyncMock()
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine.vector_search_enabled", return_value=False), \
+             patch("app.core.search_engine._search_with_filters", new_callable=AsyncMock) as mock_search:
+            mock_search.return_value = [mock_property]
+
+            await hybrid_search(mock_db, parsed, "bangalore", 10, ef_search=100)
+
+        mock_db.execute.assert_not_called()
+
+
+def _listing(title, price=50):
+    """Build a property-like object for deduplication tests."""
+    prop = MagicMock()
+    prop.title = title
+    prop.area = "Whitefield"
+    prop.bhk = 2
+    prop.price_lakhs = price
+    return prop
+
+
+class TestFetchUnique:
+    """Tests for deduplicated ranked fetching."""
+
+    @pytest.mark.asyncio
+    async def test_single_fetch_when_enough_unique(self):
+        """Should stop after one query when the over-fetch window fills the page."""
+        rows = [_listing("A"), _listing("A"), _listing("B"), _listing("C")]
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = rows
+        mock_db.execute.return_value = mock_result
+
+        unique = await _fetch_unique(mock_db, select(Property), 2)
+
+        assert [p.title for p in unique] == ["A", "B"]
+        mock_db.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_refetch_when_duplicates_shorten_page(self):
+        """Should widen the window when duplicates leave the page short."""
+        first = [_listing("A")] * 4
+        second = [_listing("A")] * 4 + [_listing("B"), _listing("C"), _listing("D")]
+        results = []
+        for rows in (first, second):
+            mock_result = MagicMock()
+            mock_result.scalars.return_value.all.return_value = rows
+            results.append(mock_result)
+        mock_db = AsyncMock()
+        mock_db.execute.side_effect = results
+
+        unique = await _fetch_unique(mock_db, select(Property), 2)
+
+        assert [p.title for p in unique] == ["A", "B"]
+        assert mock_db.execute.call_count == 2
+        limits = [call[0][0]._limit for call in mock_db.execute.call_args_list]
+        assert limits == [4, 8]
+
+    @pytest.mark.asyncio
+    async def test_no_refetch_when_exhausted(self):
+        """Should not refetch when fewer rows than the window exist."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [_listing("A"), _listing("A")]
+        mock_db.execute.return_value = mock_result
+
+        unique = await _fetch_unique(mock_db, select(Property), 5)
+
+        assert len(unique) == 1
+        mock_db.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_filter_search_returns_full_page(self):
+        """Should return limit unique rows from filter_search when enough exist."""
+        first = [_listing("A")] * 20
+        second = [_listing("A")] * 20 + [_listing(str(i)) for i in range(20)]
+        results = []
+        for rows in (first, second):
+            mock_result = MagicMock()
+            mock_result.scalars.return_value.all.return_value = rows
+            results.append(mock_result)
+        mock_db = AsyncMock()
+        mock_db.execute.side_effect = results
+
+        unique = await filter_search(mock_db, city="bangalore", limit=10)
+
+        assert len(unique) == 10
+
+
+class TestRelaxationTiers:
+    """Tests for the relaxation ladder builder."""
+
+    def test_amenities_relaxed_first(self):
+        """Should drop amenities before BHK or area."""
+        parsed = ParsedQuery(bhk=2, area="Whitefield", amenities=["gym"], raw_query="test")
+
+        tiers = _relaxation_tiers(parsed)
+
+        assert [t.relaxed_filters for t in tiers] == [
+            [],
+            ["amenities"],
+            ["amenities", "bhk"],
+            ["amenities", "area"],
+            ["amenities", "bhk", "area"],
+            ["amenities", "bhk", "area"],
+        ]
+        assert tiers[0].use_amenities is True
+        assert not any(t.use_amenities for t in tiers[1:])
+
+    def test_full_ladder(self):
+        """Should build all five tiers when BHK, area and price are set."""
+        parsed = ParsedQuery(bhk=2, area="Whitefield", max_price=100, raw_query="test")
+
+        tiers = _relaxation_tiers(parsed)
+
+        assert [t.match_type for t in tiers] == ["exact", "partial", "partial", "partial", "similar"]
+        assert [t.relaxed_filters for t in tiers] == [
+            [], ["bhk"], ["area"], ["bhk", "area"], ["bhk", "area", "price"]
+        ]
+
+    def test_duplicate_tiers_skipped(self):
+        """Should skip tiers identical to an earlier one but keep the final tier."""
+        parsed = ParsedQuery(raw_query="test")
+
+        tiers = _relaxation_tiers(parsed)
+
+        assert [t.match_type for t in tiers] == ["exact", "similar"]
+        assert tiers[-1].relaxed_filters == []
+
+    def test_no_area_skips_area_tiers(self):
+        """Should not evaluate area-keeping tiers twice when no area is given."""
+        parsed = ParsedQuery(bhk=3, max_price=80, raw_query="test")
+
+        tiers = _relaxation_tiers(parsed)
+
+        assert [t.relaxed_filters for t in tiers] == [[], ["bhk"], ["bhk", "price"]]
+
+
+class TestSingleStatementLadder:
+    """Tests for single-statement ladder execution."""
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_uses_single_statement(self, mock_property, mock_embedding):
+        """Should dispatch to the single-statement ladder when requested."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+        expected = SearchResult([mock_property], "exact", [])
+
+        with patch(
+            "app.core.search_engine._search_ladder_single_statement", new_callable=AsyncMock
+        ) as mock_single, patch(
+            "app.core.search_engine._search_with_filters", new_callable=AsyncMock
+        ) as mock_search:
+            mock_single.return_value = expected
+
+            result = await hybrid_search(AsyncMock(), parsed, "bangalore", 10, ladder_mode="single")
+
+            assert result is expected
+            mock_search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_winning_tier_labels(self, mock_property):
+        """Should label results with the tier the rows came from."""
+        mock_db = AsyncMock()
+        row = MagicMock()
+        row.tier = 1
+        row.__getitem__.side_effect = lambda i: mock_property
+        mock_result = MagicMock()
+        mock_result.all.return_value = [row]
+        mock_db.execute.return_value = mock_result
+
+        parsed = ParsedQuery(bhk=5, area="Whitefield", raw_query="5BHK in Whitefield")
+        tiers = _relaxation_tiers(parsed)
+
+        result = await _search_ladder_single_statement(
+            mock_db, [0.1] * 768, parsed, "bangalore", 10, tiers
+        )
+
+        assert result.match_type == "partial"
+        assert result.relaxed_filters == ["bhk"]
+        assert result.properties == [mock_property]
+        mock_db.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_no_rows_returns_similar(self):
+        """Should return an empty similar result when no tier has rows."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        parsed = ParsedQuery(bhk=2, max_price=50, raw_query="test")
+        tiers = _relaxation_tiers(parsed)
+
+        result = await _search_ladder_single_statement(
+            mock_db, [0.1] * 768, parsed, "bangalore", 10, tiers
+        )
+
+        assert result.properties == []
+        assert result.match_type == "similar"
+        assert result.relaxed_filters == ["bhk", "price"]
+
+    @pytest.mark.asyncio
+    async def test_embedding_bound_once(self):
+        """Should send the query embedding once for all tiers."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        parsed = ParsedQuery(bhk=2, area="Whitefield", max_price=100, raw_query="test")
+        tiers = _relaxation_tiers(parsed)
+
+        await _search_ladder_single_statement(mock_db, [0.1] * 768, parsed, "bangalore", 10, tiers)
+
+        stmt = mock_db.execute.call_args[0][0]
+        compiled = stmt.compile(dialect=asyncpg.dialect())
+        assert compiled.positiontup.count("query_embedding") == 1
+        assert str(compiled).count("UNION ALL") == len(tiers) - 1
+        # Branches order by distance alone so the ANN index can serve them
+        assert "properties.embedding <=> $1, properties.id" not in str(compiled)
+
+
+class TestCandidateLadder:
+    """Tests for single-fetch candidate retrieval with NumPy re-ranking."""
+
+    def _rows(self, specs):
+        from collections import namedtuple
+
+        Row = namedtuple("Row", ["prop", "rank", "area_match"])
+        rows = []
+        for i, (bhk, price, rank, area_match) in enumerate(specs):
+            prop = Property(
+                id=UUID(int=i + 1), city="bangalore", title=f"Flat {i}", area="Whitefield",
+                bhk=bhk, price_lakhs=price, amenities=[],
+            )
+            rows.append(Row(prop, rank, area_match))
+        return rows
+
+    def _db(self, rows):
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.all.return_value = rows
+        mock_db.execute.return_value = mock_result
+        return mock_db
+
+    @pytest.mark.asyncio
+    async def test_exact_tier_in_rank_order(self):
+        """Should return the matching candidates ordered by rank."""
+        rows = self._rows([(2, 80.0, 0.3, None), (3, 80.0, 0.1, None), (2, 90.0, 0.2, None)])
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        result = await _search_ladder_candidates(
+            self._db(rows), [0.1] * 768, parsed, "bangalore", 10, _relaxation_tiers(parsed), 500
+        )
+
+        assert result.match_type == "exact"
+        assert [p.title for p in result.properties] == ["Flat 2", "Flat 0"]
+
+    @pytest.mark.asyncio
+    async def test_relaxes_within_candidates(self):
+        """Should fall through to a relaxed tier when no candidate matches."""
+        rows = self._rows([(3, 80.0, 0.2, True), (2, 80.0, 0.1, False)])
+        parsed = ParsedQuery(bhk=2, area="Whitefield", raw_query="2BHK in Whitefield")
+
+        result = await _search_ladder_candidates(
+            self._db(rows), [0.1] * 768, parsed, "bangalore", 10, _relaxation_tiers(parsed), 500
+        )
+
+        # The SQL area predicate decides area matches, not the substring check
+        assert result.relaxed_filters == ["bhk"]
+        assert [p.title for p in result.properties] == ["Flat 0"]
+
+    @pytest.mark.asyncio
+    async def test_one_query_with_shared_filters_only(self):
+        """Should issue a single query filtered only by city and sqft."""
+        mock_db = self._db([])
+        parsed = ParsedQuery(bhk=2, max_price=100, min_sqft=900, raw_query="test")
+
+        result = await _search_ladder_candidates(
+            mock_db, [0.1] * 768, parsed, "bangalore", 10, _relaxation_tiers(parsed), 500
+        )
+
+        mock_db.execute.assert_called_once()
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "properties.sqft >=" in sql
+        assert "properties.bhk =" not in sql
+        assert "properties.price_lakhs <=" not in sql
+        assert result.properties == []
+        assert result.match_type == "similar"
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_raises_ef_search(self, mock_embedding):
+        """Should raise hnsw.ef_search to the pool size so the scan returns enough rows."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine._apply_search_params", new_callable=AsyncMock) as mock_params, \
+             patch("app.core.search_engine._search_ladder_candidates", new_callable=AsyncMock) as mock_candidates, \
+             patch("app.core.search_engine.settings") as mock_settings:
+            mock_settings.search_backend = "postgres"
+            mock_settings.search_candidate_pool = 500
+            mock_settings.hnsw_ef_search = 40
+            mock_settings.hnsw_iterative_scan = None
+            mock_settings.ivfflat_probes = None
+            mock_settings.area_match_mode = "ilike"
+            mock_candidates.return_value = SearchResult([], "similar", [])
+
+            await hybrid_search(AsyncMock(), parsed, "bangalore", 10, ladder_mode="candidates")
+
+        assert mock_params.call_args[0][1]["hnsw.ef_search"] == "500"
+        assert mock_candidates.call_args[0][-1] == 500
+
+
+class TestFilteredHnswScan:
+    """Tests that selective filters still fill a page under an HNSW index."""
+
+    class _HnswSession:
+        """Emulates pgvector post-filtering: without an iterative scan only the
+        ``ef_search`` nearest rows are checked against the filters."""
+
+        def __init__(self, rows):
+            self.rows = rows  # Nearest first
+            self.params = {}
+
+        async def execute(self, stmt):
+            compiled = stmt.compile(dialect=asyncpg.dialect())
+            result = MagicMock()
+            if "set_config" in str(compiled):
+                values = list(compiled.params.values())
+                self.params.update(zip(values[0::3], values[1::3]))
+                return result
+            scanned = self.rows
+            if "hnsw.iterative_scan" not in self.params:
+                scanned = self.rows[:int(self.params.get("hnsw.ef_search", 40))]
+            bhk = compiled.params.get("bhk_1")
+            result.scalars.return_value.all.return_value = [
+                row for row in scanned if bhk is None or row.bhk == bhk
+            ]
+            return result
+
+    @pytest.mark.asyncio
+    async def test_selective_filter_returns_limit_rows(self):
+        """Should fill the exact tier when matches rank beyond ef_search."""
+        # One in ten properties is a 3BHK; only four of them are among the 40 nearest
+        rows = [
+            Property(id=UUID(int=i), title=f"Flat {i}", area="Whitefield", bhk=3 if i % 10 == 9 else 2,
+                     price_lakhs=80)
+            for i in range(200)
+        ]
+        session = self._HnswSession(rows)
+        parsed = ParsedQuery(bhk=3, raw_query="3BHK")
+
+        result = await hybrid_search(session, parsed, "bangalore", 10, query_embedding=[0.1] * 768)
+
+        assert session.params["hnsw.iterative_scan"] == "relaxed_order"
+        assert result.match_type == "exact"
+        assert len(result.properties) == 10
+
+
+class TestParallelLadder:
+    """Tests for speculative parallel ladder execution."""
+
+    @pytest.fixture
+    def mock_sessions(self):
+        """Patch async_session with a factory yielding distinct mock sessions."""
+        with patch("app.core.search_engine.async_session") as mock_factory:
+            session_cm = MagicMock()
+            session_cm.__aenter__ = AsyncMock(side_effect=lambda: AsyncMock())
+            session_cm.__aexit__ = AsyncMock(return_value=False)
+            mock_factory.return_value = session_cm
+            yield mock_factory
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_tier_wins(self, mock_property, mock_sessions):
+        """Should wait for higher-priority tiers even if a later tier finishes first."""
+        parsed = ParsedQuery(bhk=5, area="Whitefield", raw_query="5BHK in Whitefield")
+        tiers = _relaxation_tiers(parsed)
+
+        async def fake_search(session, emb, pq, city, limit, use_bhk, use_area, use_price, **kwargs):
+            if use_bhk and use_area:
+                await asyncio.sleep(0.02)
+                return []
+            if not use_bhk and use_area:
+                await asyncio.sleep(0.01)
+                return [mock_property]
+            return [MagicMock()]
+
+        with patch("app.core.search_engine._search_with_filters", side_effect=fake_search):
+            result = await _search_ladder_parallel([0.1] * 768, parsed, "bangalore", 10, tiers, 5)
+
+        assert result.match_type == "partial"
+        assert result.relaxed_filters == ["bhk"]
+        assert result.properties == [mock_property]
+
+    @pytest.mark.asyncio
+    async def test_lower_priority_tiers_cancelled(self, mock_property, mock_sessions):
+        """Should cancel lower-priority tiers once a higher one returns rows."""
+        parsed = ParsedQuery(bhk=2, area="Whitefield", raw_query="2BHK in Whitefield")
+        tiers = _relaxation_tiers(parsed)
+        cancelled = []
+
+        async def fake_search(session, emb, pq, city, limit, use_bhk, use_area, use_price, **kwargs):
+            if use_bhk and use_area:
+                return [mock_property]
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append((use_bhk, use_area, use_price))
+                raise
+            return []
+
+        with patch("app.core.search_engine._search_with_filters", side_effect=fake_search):
+            result = await _search_ladder_parallel([0.1] * 768, parsed, "bangalore", 10, tiers, 5)
+            await asyncio.sleep(0)
+
+        assert result.match_type == "exact"
+        assert len(cancelled) == len(tiers) - 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_tiers_finish_before_return(self, mock_property, mock_sessions):
+        """Should wait for cancelled tiers to release their sessions before returning."""
+        parsed = ParsedQuery(bhk=2, area="Whitefield", raw_query="2BHK in Whitefield")
+        tiers = _relaxation_tiers(parsed)
+        cancelled = []
+
+        async def fake_search(session, emb, pq, city, limit, use_bhk, use_area, use_price, **kwargs):
+            if use_bhk and use_area:
+                return [mock_property]
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append((use_bhk, use_area, use_price))
+                raise
+            return []
+
+        with patch("app.core.search_engine._search_with_filters", side_effect=fake_search):
+            await _search_ladder_parallel([0.1] * 768, parsed, "bangalore", 10, tiers, 5)
+
+        assert len(cancelled) == len(tiers) - 1
+        session_cm = mock_sessions.return_value
+        assert session_cm.__aexit__.await_count == session_cm.__aenter__.await_count
+
+    @pytest.mark.asyncio
+    async def test_lower_tier_error_ignored_after_match(self, mock_property, mock_sessions):
+        """Should return a higher tier's rows even if a lower tier failed."""
+        from sqlalchemy.exc import SQLAlchemyError
+
+        parsed = ParsedQuery(bhk=2, area="Whitefield", raw_query="2BHK in Whitefield")
+        tiers = _relaxation_tiers(parsed)
+
+        async def fake_search(session, emb, pq, city, limit, use_bhk, use_area, use_price, **kwargs):
+            if use_bhk and use_area:
+                await asyncio.sleep(0.01)
+                return [mock_property]
+            raise SQLAlchemyError("connection lost")
+
+        with patch("app.core.search_engine._search_with_filters", side_effect=fake_search):
+            result = await _search_ladder_parallel([0.1] * 768, parsed, "bangalore", 10, tiers, 5)
+
+        assert result.match_type == "exact"
+        assert result.properties == [mock_property]
+
+    @pytest.mark.asyncio
+    async def test_needed_tier_error_raised(self, mock_sessions):
+        """Should raise a tier's error when every higher-priority tier came back empty."""
+        from sqlalchemy.exc import SQLAlchemyError
+
+        parsed = ParsedQuery(bhk=2, area="Whitefield", raw_query="2BHK in Whitefield")
+        tiers = _relaxation_tiers(parsed)
+
+        async def fake_search(session, emb, pq, city, limit, use_bhk, use_area, use_price, **kwargs):
+            if use_bhk and use_area:
+                return []
+            raise SQLAlchemyError("connection lost")
+
+        with patch("app.core.search_engine._search_with_filters", side_effect=fake_search):
+            with pytest.raises(SQLAlchemyError):
+                await _search_ladder_parallel([0.1] * 768, parsed, "bangalore", 10, tiers, 5)
+
+    @pytest.mark.asyncio
+    async def test_connection_cap(self, mock_sessions):
+        """Should never hold more sessions than max_connections."""
+        parsed = ParsedQuery(bhk=2, area="Whitefield", max_price=100, raw_query="test")
+        tiers = _relaxation_tiers(parsed)
+        active = [0]
+        peak = [0]
+
+        async def fake_search(*args, **kwargs):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+            return []
+
+        with patch("app.core.search_engine._search_with_filters", side_effect=fake_search):
+            result = await _search_ladder_parallel([0.1] * 768, parsed, "bangalore", 10, tiers, 2)
+
+        assert peak[0] == 2
+        assert result.properties == []
+        assert result.match_type == "similar"
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_uses_parallel(self, mock_property, mock_embedding):
+        """Should dispatch to the parallel ladder when requested."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+        expected = SearchResult([mock_property], "exact", [])
+
+        with patch(
+            "app.core.search_engine._search_ladder_parallel", new_callable=AsyncMock
+        ) as mock_parallel:
+            mock_parallel.return_value = expected
+
+            result = await hybrid_search(AsyncMock(), parsed, "bangalore", 10, ladder_mode="parallel")
+
+        assert result is expected
+
+
 class TestSearchWithFilters:
     """Tests for _search_with_filters function."""
 
@@ -504,6 +1184,134 @@ class TestSearchWithFilters:
         mock_db.execute.assert_called_once()
 
 
+class TestAmenityFilter:
+    """Tests for amenity containment filtering."""
+
+    @pytest.mark.asyncio
+    async def test_amenity_containment(self):
+        """Should filter with array containment when amenities are used."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        parsed = ParsedQuery(amenities=["gym", "swimming pool"], raw_query="test")
+
+        await _search_with_filters(mock_db, [0.1] * 768, parsed, city="bangalore", limit=10)
+
+        stmt = mock_db.execute.call_args[0][0]
+        assert "properties.amenities @>" in str(stmt.compile(dialect=asyncpg.dialect()))
+
+    @pytest.mark.asyncio
+    async def test_amenity_filter_skipped(self):
+        """Should not filter on amenities when relaxed."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        parsed = ParsedQuery(amenities=["gym"], raw_query="test")
+
+        await _search_with_filters(
+            mock_db, [0.1] * 768, parsed, city="bangalore", limit=10, use_amenities=False
+        )
+
+        stmt = mock_db.execute.call_args[0][0]
+        assert "@>" not in str(stmt.compile(dialect=asyncpg.dialect()))
+
+    @pytest.mark.asyncio
+    async def test_partial_match_relax_amenities(self, mock_property, mock_embedding):
+        """Should report amenities as relaxed when only that tier matches."""
+        parsed = ParsedQuery(bhk=2, amenities=["tennis court"], raw_query="2BHK with tennis court")
+
+        with patch("app.core.search_engine._search_with_filters", new_callable=AsyncMock) as mock_search:
+            mock_search.side_effect = [[], [mock_property]]
+
+            result = await hybrid_search(AsyncMock(), parsed, "bangalore", 10)
+
+        assert result.match_type == "partial"
+        assert result.relaxed_filters == ["amenities"]
+        second_call = mock_search.call_args_list[1]
+        assert second_call.kwargs["use_amenities"] is False
+        assert second_call.kwargs["use_bhk"] is True
+
+    @pytest.mark.asyncio
+    async def test_filter_search_normalizes_amenities(self):
+        """Should normalize amenity names in filter_search."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        await filter_search(mock_db, city="bangalore", amenities=["Pool"])
+
+        params = mock_db.execute.call_args[0][0].compile().params
+        assert ["swimming pool"] in params.values()
+
+
+class TestAreaMatching:
+    """Tests for substring and trigram area matching."""
+
+    @pytest.mark.asyncio
+    async def test_ilike_by_default(self):
+        """Should emit a plain ILIKE substring predicate by default."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        await filter_search(mock_db, city="bangalore", area="Koramangala")
+
+        mock_db.execute.assert_called_once()
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "properties.area ILIKE" in sql
+        assert "%>" not in sql
+
+    @pytest.mark.asyncio
+    async def test_trigram_mode(self):
+        """Should add a word-similarity predicate and set its threshold."""
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        with patch("app.core.search_engine.settings") as mock_settings:
+            mock_settings.area_match_mode = "trigram"
+            mock_settings.area_similarity_threshold = 0.4
+
+            await filter_search(mock_db, city="bangalore", area="koramangla")
+
+        set_params = mock_db.execute.call_args_list[0][0][0].compile().params
+        assert "pg_trgm.word_similarity_threshold" in set_params.values()
+        assert "0.4" in set_params.values()
+
+        sql = str(mock_db.execute.call_args_list[1][0][0].compile(dialect=asyncpg.dialect()))
+        assert "properties.area ILIKE" in sql
+        assert "properties.area %>" in sql
+
+    @pytest.mark.asyncio
+    async def test_trigram_threshold_in_hybrid_search(self, mock_property, mock_embedding):
+        """Should set the trigram threshold once for the ladder."""
+        mock_db = AsyncMock()
+        parsed = ParsedQuery(area="koramangla", raw_query="flat in koramangla")
+
+        with patch("app.core.search_engine.settings") as mock_settings, \
+             patch("app.core.search_engine._search_with_filters", new_callable=AsyncMock) as mock_search:
+            mock_settings.search_ladder_mode = "sequential"
+            mock_settings.area_match_mode = "trigram"
+            mock_settings.area_similarity_threshold = 0.5
+            mock_settings.hnsw_ef_search = None
+            mock_settings.hnsw_iterative_scan = None
+            mock_settings.ivfflat_probes = None
+            mock_search.return_value = [mock_property]
+
+            await hybrid_search(mock_db, parsed, "bangalore", 10)
+
+        mock_db.execute.assert_called_once()
+        params = mock_db.execute.call_args[0][0].compile().params
+        assert "pg_trgm.word_similarity_threshold" in params.values()
+
+
 class TestFilterSearch:
     """Tests for filter_search function (SQL-only search)."""
 
@@ -563,3 +1371,257 @@ class TestFilterSearch:
 
         assert results == []
         mock_db.execute.assert_called_once()
+
+
+class TestKeysetPagination:
+    """Tests for keyset continuation of searches."""
+
+    @pytest.mark.asyncio
+    async def test_keyset_predicate_on_vector_rank(self, mock_db):
+        """Should seek past the anchor's (distance, id) and bind the embedding once."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+        anchor = UUID("12345678-1234-5678-1234-567812345678")
+
+        await _search_with_filters(mock_db, [0.1] * 768, parsed, "bangalore", 10, after_id=anchor)
+
+        compiled = mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect())
+        sql = str(compiled)
+        assert "JOIN (SELECT properties.embedding <=>" in sql
+        assert "AS anchor ON true" in sql
+        assert "properties.id > " in sql
+        assert compiled.positiontup.count("query_embedding") == 1
+
+    @pytest.mark.asyncio
+    async def test_vector_window_orders_by_distance_only(self, mock_db):
+        """Should let the ANN index order the window and break ties by id outside it."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        await _search_with_filters(mock_db, [0.1] * 768, parsed, "bangalore", 10)
+
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "ORDER BY properties.embedding <=> $1 \n LIMIT" in sql
+        assert sql.rstrip().endswith("ORDER BY ranked.rank, ranked.id")
+
+    @pytest.mark.asyncio
+    async def test_no_keyset_without_cursor(self, mock_db):
+        """Should not add a keyset predicate for first pages."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        await _search_with_filters(mock_db, [0.1] * 768, parsed, "bangalore", 10)
+
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "properties.id >" not in sql
+
+    @pytest.mark.asyncio
+    async def test_filter_search_keyset_on_price(self, mock_db):
+        """Should continue filter_search on (price_lakhs, id)."""
+        anchor = UUID("12345678-1234-5678-1234-567812345678")
+
+        await filter_search(mock_db, city="bangalore", bhk=2, after_id=anchor)
+
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "(SELECT properties.price_lakhs AS rank" in sql
+        assert "properties.price_lakhs > anchor.rank" in sql
+
+    @pytest.mark.asyncio
+    async def test_search_after_continues_tier(self, mock_db):
+        """Should run one query for the given tier and keep its labels."""
+        parsed = ParsedQuery(bhk=2, area="Whitefield", raw_query="2BHK in Whitefield", inferred_city="bangalore")
+        tier = find_relaxation_tier(parsed, "partial", ["bhk"])
+        anchor = UUID("12345678-1234-5678-1234-567812345678")
+
+        result = await search_after(mock_db, parsed, "", tier, anchor, 10, query_embedding=None)
+
+        assert result.match_type == "partial"
+        assert result.relaxed_filters == ["bhk"]
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "properties.bhk =" not in sql
+        assert "properties.city =" in sql
+
+    def test_find_relaxation_tier(self):
+        """Should map result labels back to a ladder tier."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        assert find_relaxation_tier(parsed, "exact", []).use_bhk
+        assert find_relaxation_tier(parsed, "similar", ["bhk"]).use_bhk is False
+        assert find_relaxation_tier(parsed, "partial", ["area"]) is None
+
+
+class TestQuantizedRanking:
+    """Tests for halfvec/binary candidate stages and the full-precision re-rank."""
+
+    def _settings(self, mock_settings, precision="halfvec", candidates=0, binary_candidates=400):
+        mock_settings.vector_precision = precision
+        mock_settings.vector_rerank_candidates = candidates
+        mock_settings.vector_binary_candidates = binary_candidates
+        mock_settings.area_match_mode = "ilike"
+        mock_settings.hnsw_ef_search = None
+        mock_settings.hnsw_iterative_scan = None
+        mock_settings.ivfflat_probes = None
+
+    @pytest.mark.asyncio
+    async def test_halfvec_distance(self, mock_db):
+        """Should rank by the half-precision casts matching the halfvec index."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine.settings") as mock_settings:
+            self._settings(mock_settings)
+            await _search_with_filters(mock_db, [0.1] * 768, parsed, "bangalore", 10)
+
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "ORDER BY CAST(properties.embedding AS HALFVEC(768)) <=> CAST(" in sql
+        assert "properties.id IN (SELECT" not in sql
+
+    @pytest.mark.asyncio
+    async def test_rerank_candidates_at_full_precision(self, mock_db):
+        """Should pick candidates by halfvec distance and order them by float32 distance."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+        anchor = UUID("12345678-1234-5678-1234-567812345678")
+
+        with patch("app.core.search_engine.settings") as mock_settings:
+            self._settings(mock_settings, candidates=100)
+            await _search_with_filters(mock_db, [0.1] * 768, parsed, "bangalore", 10, after_id=anchor)
+
+        compiled = mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect())
+        sql = str(compiled)
+        assert "properties.id IN (SELECT properties.id" in sql
+        assert "ORDER BY CAST(properties.embedding AS HALFVEC(768)) <=> CAST(" in sql
+        assert "AS anchor ON true" in sql
+        assert "ORDER BY properties.embedding <=> $1 \n LIMIT" in sql
+        assert sql.rstrip().endswith("ORDER BY ranked.rank, ranked.id")
+        assert 100 in compiled.params.values()
+        assert compiled.positiontup.count("query_embedding") == 1
+
+    @pytest.mark.asyncio
+    async def test_continuation_widens_candidates(self, mock_db):
+        """Should extend the re-rank window past the results earlier pages returned."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+        tier = _relaxation_tiers(parsed)[0]
+
+        with patch("app.core.search_engine.settings") as mock_settings:
+            self._settings(mock_settings, candidates=100)
+            await search_after(mock_db, parsed, "bangalore", tier, UUID(int=1), 10,
+                               query_embedding=[0.1] * 768, position=150)
+
+        compiled = mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect())
+        assert "properties.id IN (SELECT properties.id" in str(compiled)
+        assert 250 in compiled.params.values()
+
+    @pytest.mark.asyncio
+    async def test_single_statement_reranks(self, mock_db):
+        """Should apply the halfvec candidate stage to every single-statement branch."""
+        mock_db.execute.return_value.all.return_value = []
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+        tiers = _relaxation_tiers(parsed)
+
+        with patch("app.core.search_engine.settings") as mock_settings:
+            self._settings(mock_settings, candidates=100)
+            await _search_ladder_single_statement(mock_db, [0.1] * 768, parsed, "bangalore", 10, tiers)
+
+        compiled = mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect())
+        sql = str(compiled)
+        assert sql.count("properties.id IN (SELECT properties.id") == len(tiers)
+        assert "ORDER BY CAST(properties.embedding AS HALFVEC(768)) <=> CAST(" in sql
+        assert "properties.embedding <=> $2 AS rank" in sql
+        assert compiled.positiontup.count("query_embedding") == 1
+
+    @pytest.mark.asyncio
+    async def test_candidates_mode_reranks_pool(self, mock_db):
+        """Should pick at least the candidate pool by halfvec distance in "candidates" mode."""
+        mock_db.execute.return_value.all.return_value = []
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine.settings") as mock_settings:
+            self._settings(mock_settings, candidates=100)
+            await _search_ladder_candidates(
+                mock_db, [0.1] * 768, parsed, "bangalore", 10, _relaxation_tiers(parsed), 500
+            )
+
+        compiled = mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect())
+        sql = str(compiled)
+        assert "properties.id IN (SELECT properties.id" in sql
+        assert "ORDER BY CAST(properties.embedding AS HALFVEC(768)) <=> CAST(" in sql
+        assert "properties.embedding <=> $1 AS rank" in sql
+        assert list(compiled.params.values()).count(500) == 2
+
+    @pytest.mark.asyncio
+    async def test_no_rerank_at_full_precision(self, mock_db):
+        """Should ignore the re-rank setting when ranking float32 vectors."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine.settings") as mock_settings:
+            self._settings(mock_settings, precision="vector", candidates=100)
+            await _search_with_filters(mock_db, [0.1] * 768, parsed, "bangalore", 10)
+
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "HALFVEC" not in sql
+        assert "properties.id IN (SELECT" not in sql
+
+    @pytest.mark.asyncio
+    async def test_binary_hamming_prefilter(self, mock_db):
+        """Should pick candidates by Hamming distance and re-rank them by cosine distance."""
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine.settings") as mock_settings:
+            self._settings(mock_settings, precision="binary", candidates=0, binary_candidates=300)
+            await _search_with_filters(mock_db, [0.1] * 768, parsed, "bangalore", 10)
+
+        compiled = mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect())
+        sql = str(compiled)
+        assert "properties.id IN (SELECT properties.id" in sql
+        assert "ORDER BY properties.embedding_bits <~> binary_quantize(" in sql
+        assert "ORDER BY properties.embedding <=> $1 \n LIMIT" in sql
+        assert sql.rstrip().endswith("ORDER BY ranked.rank, ranked.id")
+        assert "HALFVEC" not in sql
+        assert 300 in compiled.params.values()
+        assert compiled.positiontup.count("query_embedding") == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["sequential", "single", "parallel", "candidates"])
+    async def test_binary_prefilter_in_every_ladder_mode(self, mock_db, mode):
+        """Should pick candidates by Hamming distance whichever way the ladder runs."""
+        mock_db.execute.return_value.all.return_value = []
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=mock_db)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        parsed = ParsedQuery(bhk=2, raw_query="2BHK")
+
+        with patch("app.core.search_engine.settings") as mock_settings, \
+             patch("app.core.search_engine.async_session", return_value=session_cm):
+            self._settings(mock_settings, precision="binary", binary_candidates=300)
+            mock_settings.search_backend = "postgres"
+            mock_settings.search_candidate_pool = 200
+            mock_settings.search_max_connections = 2
+            await hybrid_search(mock_db, parsed, "bangalore", 10, ladder_mode=mode, query_embedding=[0.1] * 768)
+
+        statements = [str(call[0][0].compile(dialect=asyncpg.dialect())) for call in mock_db.execute.call_args_list]
+        ranked = [sql for sql in statements if "properties.embedding <=>" in sql]
+        assert ranked
+        for sql in ranked:
+            assert "ORDER BY properties.embedding_bits <~> binary_quantize(" in sql
+            assert "HALFVEC" not in sql
+
+    def test_rerank_raises_ef_search(self):
+        """Should let the HNSW scan return every re-rank candidate."""
+        with patch("app.core.search_engine.settings") as mock_settings:
+            self._settings(mock_settings, candidates=200)
+            mock_settings.hnsw_ef_search = 40
+
+            params = _search_params([0.1] * 768, None, None)
+
+        assert params["hnsw.ef_search"] == "200"
+
+    @pytest.mark.asyncio
+    async def test_vector_top_k_ids(self, mock_db):
+        """Should return ids ranked without filters or deduplication."""
+        mock_db.execute.return_value.scalars.return_value.all.return_value = [UUID(int=1)]
+
+        with patch("app.core.search_engine.settings") as mock_settings:
+            self._settings(mock_settings)
+            result = await vector_top_k_ids(mock_db, [0.1] * 768, "bangalore", k=5)
+
+        assert result == [UUID(int=1)]
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=asyncpg.dialect()))
+        assert "SELECT properties.id" in sql
+        assert "properties.city =" in sql
+        assert "HALFVEC(768)" in sql
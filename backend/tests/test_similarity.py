@@ -0,0 +1,79 @@
+"""Tests for similar-property search."""
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.similarity import similar_properties, precomputed_similar_properties
+from app.models.property import Property
+
+
+class TestSimilarProperties:
+    """Tests for similar-property search by stored embedding."""
+
+    def _source(self, embedding=(0.1,) * 768):
+        source = MagicMock()
+        source.id = UUID(int=1)
+        source.city = "bangalore"
+        source.bhk = 2
+        source.title, source.area, source.price_lakhs = "Flat", "Whitefield", 80
+        source.embedding = list(embedding) if embedding is not None else None
+        return source
+
+    @pytest.mark.asyncio
+    async def test_uses_stored_embedding(self):
+        """Should query by the stored vector, excluding the source and its duplicates."""
+        source = self._source()
+        copy = Property(id=UUID(int=2), title="Flat", area="Whitefield", bhk=2, price_lakhs=80)
+        other = Property(id=UUID(int=3), title="Villa", area="Whitefield", bhk=2, price_lakhs=90)
+
+        with patch("app.core.similarity._fetch_unique", new_callable=AsyncMock) as mock_fetch, \
+             patch("app.core.search_engine.generate_query_embedding", new_callable=AsyncMock) as mock_embed:
+            mock_fetch.return_value = [copy, other]
+
+            result = await similar_properties(AsyncMock(), source, limit=5, same_bhk=True)
+
+        assert result == [other]
+        mock_embed.assert_not_called()
+        stmt = mock_fetch.call_args[0][1]
+        compiled = stmt.compile(dialect=asyncpg.dialect())
+        sql = str(compiled)
+        assert "properties.id !=" in sql
+        assert "properties.city =" in sql
+        assert "properties.bhk =" in sql
+        rank = mock_fetch.call_args.kwargs["vector_rank"].compile(dialect=asyncpg.dialect())
+        assert "properties.embedding <=>" in str(rank)
+        assert rank.params["query_embedding"] == source.embedding
+
+    @pytest.mark.asyncio
+    async def test_precomputed_without_neighbors(self):
+        """Should not query when the build stored no neighbours."""
+        mock_db = AsyncMock()
+
+        assert await precomputed_similar_properties(mock_db, self._source(), [], limit=5) == []
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_precomputed_in_stored_order(self):
+        """Should keep the stored neighbour order and skip deleted neighbours."""
+        first = Property(id=UUID(int=2), title="A", area="Whitefield", bhk=2, price_lakhs=70)
+        second = Property(id=UUID(int=3), title="B", area="Whitefield", bhk=2, price_lakhs=90)
+        mock_db = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [second, first]
+        mock_db.execute.return_value = mock_result
+
+        result = await precomputed_similar_properties(
+            mock_db, self._source(), [first.id, UUID(int=9), second.id], limit=5
+        )
+
+        assert result == [first, second]
+
+    @pytest.mark.asyncio
+    async def test_without_embedding(self):
+        """Should return nothing when the source has no embedding."""
+        mock_db = AsyncMock()
+
+        assert await similar_properties(mock_db, self._source(embedding=None)) == []
+        mock_db.execute.assert_not_called()
@@ -0,0 +1,205 @@
+"""Tests for vector index management."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.vector_index import (
+    ivfflat_lists,
+    vector_index_name,
+    parse_vector_index_name,
+    vector_index_precision,
+    create_vector_index_sql,
+    create_vector_index,
+    drop_vector_index,
+    rebuild_vector_indexes,
+)
+
+
+class TestIvfflatLists:
+    """Tests for ivfflat_lists."""
+
+    def test_small_table(self):
+        """Should use at least one list."""
+        assert ivfflat_lists(0) == 1
+        assert ivfflat_lists(225) == 1
+
+    def test_rows_per_thousand(self):
+        """Should use rows / 1000 up to 1M rows."""
+        assert ivfflat_lists(150_000) == 150
+        assert ivfflat_lists(1_000_000) == 1000
+
+    def test_sqrt_above_million(self):
+        """Should use sqrt(rows) above 1M rows."""
+        assert ivfflat_lists(4_000_000) == 2000
+
+
+class TestIndexNames:
+    """Tests for managed index naming."""
+
+    def test_global_name(self):
+        """Should name unpartitioned indexes by method."""
+        assert vector_index_name("hnsw") == "idx_properties_embedding_hnsw"
+
+    def test_city_name(self):
+        """Should suffix partial indexes with the city."""
+        assert vector_index_name("ivfflat", "mumbai") == "idx_properties_embedding_ivfflat_mumbai"
+
+    def test_parse_round_trip(self):
+        """Should parse method and city back from the name."""
+        assert parse_vector_index_name("idx_properties_embedding_hnsw_delhi") == ("hnsw", "delhi")
+        assert parse_vector_index_name("idx_properties_embedding_ivfflat") == ("ivfflat", None)
+
+    def test_parse_unmanaged(self):
+        """Should ignore unmanaged and temporary indexes."""
+        assert parse_vector_index_name("idx_properties_city") is None
+        assert parse_vector_index_name("idx_properties_embedding_hnsw__rebuild") is None
+
+    def test_invalid_method(self):
+        """Should reject unknown methods."""
+        with pytest.raises(ValueError):
+            vector_index_name("flat")
+
+    def test_invalid_city(self):
+        """Should reject cities that are unsafe to inline."""
+        with pytest.raises(ValueError):
+            vector_index_name("hnsw", "x'; DROP TABLE properties; --")
+
+    def test_halfvec_name_round_trip(self):
+        """Should mark half-precision indexes in the name without confusing the city."""
+        name = vector_index_name("hnsw", "delhi", precision="halfvec")
+
+        assert name == "idx_properties_embedding_half_hnsw_delhi"
+        assert parse_vector_index_name(name) == ("hnsw", "delhi")
+        assert vector_index_precision(name) == "halfvec"
+        assert vector_index_precision(f"{name}__rebuild") == "halfvec"
+        assert vector_index_precision("idx_properties_embedding_hnsw") == "vector"
+
+    def test_invalid_precision(self):
+        """Should reject unknown precisions."""
+        with pytest.raises(ValueError):
+            vector_index_name("hnsw", precision="bf16")
+
+
+class TestCreateVectorIndexSql:
+    """Tests for create_vector_index_sql."""
+
+    def test_hnsw(self):
+        """Should build a concurrent HNSW cosine index."""
+        sql = create_vector_index_sql("hnsw", m=24, ef_construction=100)
+
+        assert sql.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_properties_embedding_hnsw")
+        assert "USING hnsw (embedding vector_cosine_ops)" in sql
+        assert "WITH (m = 24, ef_construction = 100)" in sql
+        assert "WHERE" not in sql
+
+    def test_ivfflat_partial(self):
+        """Should build a partial IVFFlat index for one city."""
+        sql = create_vector_index_sql("ivfflat", "bangalore", lists=50)
+
+        assert "USING ivfflat (embedding vector_cosine_ops)" in sql
+        assert "WITH (lists = 50)" in sql
+        assert sql.endswith("WHERE city = 'bangalore'")
+
+    def test_halfvec_expression(self):
+        """Should index the half-precision cast used by halfvec ranking."""
+        sql = create_vector_index_sql("hnsw", precision="halfvec")
+
+        assert "idx_properties_embedding_half_hnsw ON properties" in sql
+        assert "USING hnsw ((embedding::halfvec(768)) halfvec_cosine_ops)" in sql
+
+    def test_binary_codes(self):
+        """Should index the binary codes by Hamming distance."""
+        sql = create_vector_index_sql("hnsw", "pune", precision="binary")
+
+        assert "idx_properties_embedding_bits_hnsw_pune ON properties" in sql
+        assert "USING hnsw (embedding_bits bit_hamming_ops)" in sql
+        assert vector_index_precision("idx_properties_embedding_bits_hnsw_pune") == "binary"
+
+
+class TestIndexLifecycle:
+    """Tests for creating, dropping and rebuilding indexes."""
+
+    @pytest.mark.asyncio
+    async def test_ivfflat_lists_from_row_count(self):
+        """Should derive IVFFlat lists from the number of embedded rows."""
+        conn = AsyncMock()
+        count_result = MagicMock()
+        count_result.scalar.return_value = 250_000
+        conn.execute.return_value = count_result
+
+        name = await create_vector_index(conn, "ivfflat", "bangalore")
+
+        assert name == "idx_properties_embedding_ivfflat_bangalore"
+        create_sql = str(conn.execute.call_args_list[-1][0][0])
+        assert "lists = 250" in create_sql
+
+    @pytest.mark.asyncio
+    async def test_drop_rejects_unmanaged(self):
+        """Should refuse to drop indexes it does not manage."""
+        with pytest.raises(ValueError):
+            await drop_vector_index(AsyncMock(), "idx_properties_city")
+
+    @pytest.mark.asyncio
+    async def test_rebuild_swaps_in_new_index(self):
+        """Should build under a temporary name, then drop and rename."""
+        conn = AsyncMock()
+        listing = MagicMock()
+        row = MagicMock(indexname="idx_properties_embedding_hnsw", indexdef="...", size_bytes=0)
+        listing.all.return_value = [row]
+        conn.execute.return_value = listing
+
+        rebuilt = await rebuild_vector_indexes(conn)
+
+        assert rebuilt == ["idx_properties_embedding_hnsw"]
+        statements = [str(call[0][0]) for call in conn.execute.call_args_list[1:]]
+        assert statements[0] == "DROP INDEX CONCURRENTLY IF EXISTS idx_properties_embedding_hnsw__rebuild"
+        assert "idx_properties_embedding_hnsw__rebuild ON properties USING hnsw" in statements[1]
+        assert statements[2] == "DROP INDEX CONCURRENTLY IF EXISTS idx_properties_embedding_hnsw"
+        assert statements[3] == (
+            "ALTER INDEX idx_properties_embedding_hnsw__rebuild RENAME TO idx_properties_embedding_hnsw"
+        )
+
+    @pytest.mark.asyncio
+    async def test_rebuild_keeps_precision(self):
+        """Should rebuild a halfvec index as a halfvec index."""
+        conn = AsyncMock()
+        listing = MagicMock()
+        row = MagicMock(indexname="idx_properties_embedding_half_hnsw", indexdef="...", size_bytes=0)
+        listing.all.return_value = [row]
+        conn.execute.return_value = listing
+
+        rebuilt = await rebuild_vector_indexes(conn)
+
+        assert rebuilt == ["idx_properties_embedding_half_hnsw"]
+        create_sql = str(conn.execute.call_args_list[2][0][0])
+        assert "idx_properties_embedding_half_hnsw__rebuild ON properties" in create_sql
+        assert "halfvec_cosine_ops" in create_sql
+
+    @pytest.mark.asyncio
+    async def test_rebuild_limited_to_methods(self):
+        """Should only rebuild indexes of the requested methods."""
+        conn = AsyncMock()
+        listing = MagicMock()
+        listing.all.return_value = [
+            MagicMock(indexname="idx_properties_embedding_hnsw", indexdef="...", size_bytes=0),
+            MagicMock(indexname="idx_properties_embedding_ivfflat_pune", indexdef="...", size_bytes=0),
+        ]
+        listing.scalar.return_value = 5000  # Row count for the IVFFlat lists
+        conn.execute.return_value = listing
+
+        rebuilt = await rebuild_vector_indexes(conn, methods=("ivfflat",))
+
+        assert rebuilt == ["idx_properties_embedding_ivfflat_pune"]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_skips_other_cities(self):
+        """Should only rebuild indexes covering the given city."""
+        conn = AsyncMock()
+        listing = MagicMock()
+        listing.all.return_value = [
+            MagicMock(indexname="idx_properties_embedding_hnsw_mumbai", indexdef="...", size_bytes=0),
+        ]
+        conn.execute.return_value = listing
+
+        rebuilt = await rebuild_vector_indexes(conn, "delhi")
+
+        assert rebuilt == []